@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+import asyncio
+from contextlib import AsyncExitStack
+from aws_clients import CLIENT_RETRIES, pagination_spec, next_page_params
+from config import SCAN_CONFIG
+
+try:
+    from aiobotocore.config import AioConfig
+    from aiobotocore.session import AioSession
+except ImportError:  # Optional dependency, only needed for --backend async
+    AioSession = None
+
+class AsyncScanBackend:
+    """Run listers' collectors and enrichment as coroutines on one event loop (aiobotocore)
+
+    Listings, item handlers and enrichment details are the ones declared on AWSResourceLister,
+    so both backends produce the same inventory. Concurrency is bounded globally and per
+    (service, region) instead of by a number of OS threads. One backend (session, clients and
+    limits) is shared by every regional lister of a multi-region scan, so the global limit
+    holds for the whole scan; use it as an async context manager around the scans.
+    """
+
+    def __init__(self, profile=None, concurrency=None, service_concurrency=None, profiler=None):
+        if AioSession is None:
+            raise ImportError("aiobotocore não está instalado. Instale com: pip install aiobotocore")
+
+        self.concurrency = concurrency or SCAN_CONFIG['async_concurrency']
+        self.service_concurrency = service_concurrency or SCAN_CONFIG['async_service_concurrency']
+        self.profiler = profiler
+        self._session = AioSession(profile=profile)
+        self._clients = {}
+        self._service_limits = {}
+
+    async def __aenter__(self):
+        self._limit = asyncio.Semaphore(self.concurrency)
+        self._client_lock = asyncio.Lock()
+        self._stack = await AsyncExitStack().__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        return await self._stack.__aexit__(*exc)
+
+    async def scan(self, lister):
+        """Collect every enabled service of a lister, each followed by its queued enrichment details"""
+        await asyncio.gather(*(self._run_collector(lister, position, key)
+                               for position, key in lister.enabled_collectors()))
+
+    async def client(self, lister, service_name, regional=True):
+        """Return the aiobotocore client of a lister's region, creating it on first use"""
+        region = lister.region if regional else None
+        key = (region, service_name)
+
+        async with self._client_lock:
+            if key not in self._clients:
+                config = AioConfig(max_pool_connections=self.concurrency, retries=CLIENT_RETRIES)
+                self._clients[key] = await self._stack.enter_async_context(
+                    self._session.create_client(service_name, region_name=region, config=config)
+                )
+                if self.profiler is not None:
+                    self.profiler.instrument(self._clients[key])
+            return self._clients[key]
+
+    def _limits(self, client):
+        """Global limit plus the per-service limit of a client"""
+        key = (client.meta.service_model.service_name, client.meta.region_name)
+        if key not in self._service_limits:
+            self._service_limits[key] = asyncio.Semaphore(self.service_concurrency)
+        return self._limit, self._service_limits[key]
+
+    async def _call(self, lister, client, operation, **params):
+        """One API call under the lister's rate limiter; concurrency slots are held only while in flight"""
+        limit, service_limit = self._limits(client)
+
+        async def _request():
+            async with limit, service_limit:
+                return await getattr(client, operation)(**params)
+
+        key = (client.meta.service_model.service_name, client.meta.region_name)
+        return await lister.throttle.call_async(key, _request)
+
+    async def paginate_pages(self, lister, client, operation, result_key, checkpoint=None, **kwargs):
+        """Yield the items of each page as it arrives, one retried request per page"""
+        spec = pagination_spec(client, operation)
+        params = lister.first_page_params(client, operation, spec, kwargs)
+        while True:
+            response = await self._call(lister, client, operation, **params)
+            if lister.profiler is not None:
+                lister.profiler.record('pages')
+            items = response.get(result_key, [])
+
+            next_params = next_page_params(spec, response) if spec else None
+            if next_params and all(params.get(name) == value for name, value in next_params.items()):
+                next_params = None
+            if checkpoint is not None:
+                checkpoint(items, next_params)
+            yield items
+
+            if not next_params:
+                return
+            params.update(next_params)
+
+    async def _run_collector(self, lister, position, key):
+        with lister.collector_scope(position, key):
+            if lister.restore_collector(key):
+                return
+            collector = lister.COLLECTORS[key]
+            try:
+                for index, listing in enumerate(collector.listings):
+                    await self._run_listing(lister, key, index, listing)
+                lister.mark_collected(key)
+            except Exception as e:
+                lister.report_error(e, collector.name)
+
+        # Details run as soon as the collector's listings are done, so its resources are written during the scan
+        tasks = lister.take_enrichments(key)
+        await asyncio.gather(*(self._run_detail(lister, detail, apply, args, deferred, key)
+                               for _, detail, apply, args, deferred, key in tasks))
+        lister.checkpoint_enriched(key)
+
+    async def _run_listing(self, lister, key, index, listing):
+        client = await self.client(lister, listing.client, listing.regional)
+        params = lister.listing_params(client, listing)
+        handler = getattr(lister, listing.handler)
+        pages, resume_params, checkpoint = lister.resume_listing(key, index)
+        try:
+            for items in pages:
+                lister.feed_page(listing, handler, items)
+            if resume_params is None:
+                return
+            async for items in self.paginate_pages(lister, client, listing.operation, listing.result_key,
+                                                   checkpoint=checkpoint, **{**params, **resume_params}):
+                lister.feed_page(listing, handler, items)
+        except Exception:
+            if not listing.optional:
+                raise
+
+    async def _run_detail(self, lister, detail, apply, args, deferred, key):
+        try:
+            client = await self.client(lister, detail.client, detail.regional)
+            with lister.profile_scope(key, 'enrich'):
+                if detail.result_key:
+                    result = []
+                    async for items in self.paginate_pages(lister, client, detail.operation, detail.result_key,
+                                                           **detail.params):
+                        result.extend(items)
+                else:
+                    result = await self._call(lister, client, detail.operation, **detail.params)
+            apply(result, *args)
+        except Exception:
+            pass  # Keep the listing data when details are unavailable
+        finally:
+            lister.emit(deferred)
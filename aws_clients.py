@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+import threading
+from functools import lru_cache
+import boto3
+import botocore.session
+import jmespath
+from botocore.config import Config
+from botocore.credentials import CredentialProvider, CredentialResolver, DeferredRefreshableCredentials
+from config import SCAN_CONFIG
+
+# Retries are owned by throttling.AdaptiveThrottle, so botocore makes a single attempt per call
+CLIENT_RETRIES = {'mode': 'standard', 'max_attempts': 1}
+
+class ClientRegistry:
+    """Cache one boto3 session per profile and one client per (profile, region, service)
+
+    A registry built with a session (e.g. an assumed role's, see assume_role_session) uses it
+    for every profile.
+    """
+
+    def __init__(self, max_pool_connections=None, session=None):
+        self.max_pool_connections = max_pool_connections or SCAN_CONFIG['max_workers']
+        self._fixed_session = session
+        self._sessions = {}
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def session(self, profile=None):
+        """Return the cached session for a profile (None means the default credential chain)"""
+        with self._lock:
+            return self._get_session(profile)
+
+    def _get_session(self, profile):
+        if self._fixed_session is not None:
+            return self._fixed_session
+        if profile not in self._sessions:
+            self._sessions[profile] = boto3.session.Session(profile_name=profile)
+        return self._sessions[profile]
+
+    def client(self, service_name, region=None, profile=None):
+        """Return a cached client, building it once (sessions are not thread-safe, so creation is serialized)"""
+        key = (profile, region, service_name)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            if key not in self._clients:
+                config = Config(max_pool_connections=self.max_pool_connections, retries=CLIENT_RETRIES)
+                self._clients[key] = self._get_session(profile).client(
+                    service_name, region_name=region, config=config
+                )
+            return self._clients[key]
+
+    def clear(self):
+        """Drop every cached client and session"""
+        with self._lock:
+            self._clients.clear()
+            self._sessions.clear()
+
+def assume_role_session(source_session, role_arn, session_name, duration=3600, external_id=None):
+    """boto3 session acting as a role: assumed on first use, then refreshed by botocore before the credentials expire"""
+    sts = source_session.client('sts')
+    params = {'RoleArn': role_arn, 'RoleSessionName': session_name, 'DurationSeconds': duration}
+    if external_id:
+        params['ExternalId'] = external_id
+
+    def _refresh():
+        credentials = sts.assume_role(**params)['Credentials']
+        return {
+            'access_key': credentials['AccessKeyId'],
+            'secret_key': credentials['SecretAccessKey'],
+            'token': credentials['SessionToken'],
+            'expiry_time': credentials['Expiration'].isoformat(),
+        }
+
+    # The role is the session's only credential source, so the default chain is never consulted
+    botocore_session = botocore.session.Session()
+    botocore_session.register_component('credential_provider', CredentialResolver([_AssumeRoleProvider(_refresh)]))
+    return boto3.session.Session(botocore_session=botocore_session, region_name=source_session.region_name)
+
+class _AssumeRoleProvider(CredentialProvider):
+    METHOD = 'sts-assume-role'
+
+    def __init__(self, refresh):
+        super().__init__()
+        self._refresh = refresh
+
+    def load(self):
+        return DeferredRefreshableCredentials(refresh_using=self._refresh, method=self.METHOD)
+
+@lru_cache(maxsize=None)
+def _paginator_model(service_name, api_version):
+    return botocore.session.get_session().get_paginator_model(service_name, api_version)
+
+def pagination_spec(client, operation):
+    """Paginator definition (input/output tokens, limit key...) of a client method, or None"""
+    if not client.can_paginate(operation):
+        return None
+    service_model = client.meta.service_model
+    model = _paginator_model(service_model.service_name, service_model.api_version)
+    return model.get_paginator(client.meta.method_to_api_mapping[operation])
+
+def filter_parameter(client, operation):
+    """Name of the native Filters list parameter of a client method ('Filters', or 'Filter' on a few EC2 calls)"""
+    operation_model = client.meta.service_model.operation_model(client.meta.method_to_api_mapping[operation])
+    members = operation_model.input_shape.members if operation_model.input_shape else {}
+    return next((name for name in ('Filters', 'Filter') if name in members), None)
+
+def next_page_params(spec, response):
+    """Request parameters for the page after `response`, or None on the last page"""
+    more_results = spec.get('more_results')
+    if more_results and not jmespath.search(more_results, response):
+        return None
+
+    input_tokens = spec['input_token'] if isinstance(spec['input_token'], list) else [spec['input_token']]
+    output_tokens = spec['output_token'] if isinstance(spec['output_token'], list) else [spec['output_token']]
+    values = [jmespath.search(expression, response) for expression in output_tokens]
+    if not any(values):
+        return None
+    return {name: value for name, value in zip(input_tokens, values) if value is not None}
@@ -7,9 +7,89 @@ Version: 2.0.0
 
 import argparse
 import sys
-from listar_recursos import AWSResourceLister
-from utils import AWSResourceExporter, AWSResourceAnalyzer, create_directory_structure, load_previous_scan, compare_scans, print_changes_report
-from config import DEFAULT_REGION, SERVICES_CONFIG, OUTPUT_CONFIG
+import os
+from datetime import datetime
+from config import DEFAULT_REGION, SERVICES_CONFIG, OUTPUT_CONFIG, SCAN_CONFIG, REGIONS_TO_SCAN, INCREMENTAL_CONFIG, STORE_CONFIG, METRICS_CONFIG, ORG_CONFIG, CHECKPOINT_CONFIG, DAEMON_CONFIG
+
+# boto3, the exporters and the analyzers are imported by the code paths that use them, so
+# --list-services, --version and an offline --compare start without loading them
+
+def load_comparison_source(filename):
+    """A previous scan for compare_scans: NDJSON exports are streamed by the diff, JSON exports are loaded"""
+    from utils import load_previous_scan
+    
+    if filename.endswith(('.ndjson', '.ndjson.gz')):
+        if os.path.exists(filename):
+            return filename
+        print(f"⚠️  Arquivo não encontrado: {filename}")
+        return None
+    return load_previous_scan(filename)
+
+def print_resume_hint(journal):
+    """Tell how to continue a scan that stopped after its checkpoint journal was started"""
+    if journal is None:
+        return
+    journal.close()
+    print(f"💡 Para continuar de onde parou: python aws_inventory_scanner.py --resume {journal.scan_id}")
+
+def run_query(query, source):
+    """Index a scan (resources dict or export file) and print the resources matching a parsed query"""
+    import time
+    from inventory import Inventory, print_query_results
+    
+    try:
+        inventory = Inventory.from_scan(source)
+    except (OSError, ValueError) as e:
+        print(f"❌ Erro ao ler {source}: {e}")
+        sys.exit(1)
+    start = time.perf_counter()
+    results = inventory.select(query)
+    print_query_results(results, (time.perf_counter() - start) * 1000)
+
+def run_graph_queries(args, source):
+    """Build the relationship graph of a scan and print the --in-vpc, --orphans and --blast-radius results"""
+    from resource_graph import ResourceGraph, print_graph_results
+    
+    try:
+        graph = ResourceGraph.from_scan(source)
+    except (OSError, ValueError) as e:
+        print(f"❌ Erro ao ler {source}: {e}")
+        sys.exit(1)
+    if args.in_vpc:
+        print_graph_results(f"RECURSOS NA VPC {args.in_vpc}", graph.in_vpc(args.in_vpc))
+    if args.orphans:
+        print_graph_results("RECURSOS ÓRFÃOS (sem uso pelos recursos escaneados)", [(service, resource) for service, resources in graph.orphans().items()
+                                                for resource in resources])
+    if args.blast_radius:
+        if not graph.find(args.blast_radius):
+            print(f"⚠️  Recurso não encontrado: {args.blast_radius}")
+        else:
+            print_graph_results(f"IMPACTO DA REMOÇÃO DE {args.blast_radius}", graph.blast_radius(args.blast_radius))
+
+def run_daemon(args, scan_filter):
+    """Serve the inventory from memory, refreshing each service on its schedule, until interrupted"""
+    from listar_recursos import AWSResourceLister, MultiRegionResourceLister
+    from scan_daemon import InventoryDaemon
+    
+    regions = REGIONS_TO_SCAN if args.all_regions else args.regions
+    
+    def make_lister(services, clients, throttle):
+        if regions:
+            return MultiRegionResourceLister(regions, max_workers=args.workers, profile=args.profile,
+                                             shallow=args.shallow, backend=args.backend, scan_filter=scan_filter,
+                                             services=services, clients=clients, throttle=throttle)
+        return AWSResourceLister(region=args.region, max_workers=args.workers, profile=args.profile,
+                                 shallow=args.shallow, backend=args.backend, scan_filter=scan_filter,
+                                 services=services, clients=clients, throttle=throttle)
+    
+    print("🚀 AWS Inventory Scanner v2.0.0 (daemon)")
+    print("=" * 50)
+    print(f"🌍 Regiões: {', '.join(regions or [args.region])}")
+    daemon = InventoryDaemon(make_lister, max_workers=args.workers)
+    try:
+        daemon.serve(args.daemon_host, args.daemon_port)
+    except KeyboardInterrupt:
+        print("\n👋 Daemon encerrado.")
 
 def main():
     parser = argparse.ArgumentParser(
@@ -19,10 +99,29 @@ def main():
 Examples:
   %(prog)s                          # Scan with default settings
   %(prog)s --region us-west-2       # Scan specific region
+  %(prog)s --regions us-east-1 eu-west-1  # Scan several regions in parallel
+  %(prog)s --all-regions            # Scan every region in REGIONS_TO_SCAN
+  %(prog)s --workers 16             # Scan 16 services in parallel
+  %(prog)s --organization --all-regions  # Every account of the AWS Organization, through an assumed role
+  %(prog)s --fast                   # Skip per-resource detail lookups
+  %(prog)s --backend async          # Use the asyncio/aiobotocore engine
+  %(prog)s --incremental            # Reuse unchanged results of the previous scan
+  %(prog)s --resume 20240101_120000-a1b2  # Continue an interrupted scan from its checkpoint journal
+  %(prog)s --filter tag:env=prod state=running vpc=vpc-123  # Targeted scan, filtered by the AWS APIs
   %(prog)s --export-json            # Export results to JSON
   %(prog)s --export-all             # Export to all formats
+  %(prog)s --export-ndjson --gzip   # Stream resources to .ndjson.gz while scanning
+  %(prog)s --export-parquet         # Typed Parquet file per service (requires pyarrow)
   %(prog)s --analyze                # Include resource analysis
   %(prog)s --compare previous.json  # Compare with previous scan
+  %(prog)s --compare old.json new.ndjson  # Compare two exports without scanning
+  %(prog)s --profile-scan --profile-trace trace.json  # Where the scan time goes
+  %(prog)s --metrics-file /var/lib/node_exporter/aws_inventory.prom  # Metrics for scheduled scans
+  %(prog)s --store --compare-stored  # Save to the SQLite history and compare with the last stored scan
+  %(prog)s --daemon --all-regions  # Keep the inventory warm and serve it on http://127.0.0.1:8787
+  %(prog)s --query 'service=EC2 and status=stopped and tag:team=data'  # Indexed query over a fresh scan
+  %(prog)s --query 'vpc=vpc-123' --query-source scan.ndjson  # Query an existing export without scanning
+  %(prog)s --orphans --blast-radius vpc-123 --query-source scan.json  # Relationship graph of an export
   %(prog)s --summary-only           # Show only executive summary
         """
     )
@@ -32,9 +131,89 @@ Examples:
                        default=DEFAULT_REGION,
                        help=f'AWS region to scan (default: {DEFAULT_REGION})')
     
+    region_group = parser.add_mutually_exclusive_group()
+    region_group.add_argument('--regions',
+                       nargs='+',
+                       help='Scan several regions in parallel and merge the results')
+    
+    region_group.add_argument('--all-regions',
+                       action='store_true',
+                       help=f"Scan every region in REGIONS_TO_SCAN ({', '.join(REGIONS_TO_SCAN)})")
+    
     parser.add_argument('--profile', '-p',
                        help='AWS profile to use')
     
+    parser.add_argument('--organization',
+                       action='store_true',
+                       help='Scan every active account of the AWS Organization (or --accounts) through an assumed role')
+    
+    parser.add_argument('--accounts',
+                       nargs='+',
+                       metavar='ACCOUNT_ID',
+                       help='Accounts to scan with --organization instead of listing the organization')
+    
+    parser.add_argument('--org-role',
+                       default=ORG_CONFIG['role_name'],
+                       help=f"Role assumed in each member account (default: {ORG_CONFIG['role_name']})")
+    
+    parser.add_argument('--org-workers',
+                       type=int,
+                       default=ORG_CONFIG['scan_workers'],
+                       help=f"(account, region) scans run in parallel with --organization (default: {ORG_CONFIG['scan_workers']})")
+    
+    parser.add_argument('--workers', '-w',
+                       type=int,
+                       default=SCAN_CONFIG['max_workers'],
+                       help=f"Number of services scanned in parallel (default: {SCAN_CONFIG['max_workers']})")
+    
+    parser.add_argument('--backend',
+                       choices=['threads', 'async'],
+                       default='threads',
+                       help='Scan engine: thread pool or asyncio/aiobotocore (default: threads)')
+    
+    parser.add_argument('--fast', '--shallow',
+                       dest='shallow',
+                       action='store_true',
+                       help='Skip per-resource detail lookups (bucket region, queue/topic attributes, table and image counts)')
+    
+    parser.add_argument('--incremental',
+                       action='store_true',
+                       help='Reuse the previous scan state: skip recently listed slow-changing services '
+                            'and only look up details of new or changed resources')
+    
+    parser.add_argument('--state-file',
+                       default=INCREMENTAL_CONFIG['state_file'],
+                       help=f"State file used by --incremental (default: {INCREMENTAL_CONFIG['state_file']})")
+    
+    parser.add_argument('--resume',
+                       metavar='SCAN_ID',
+                       help='Continue an interrupted scan from its checkpoint journal, with the arguments it was started with')
+    
+    parser.add_argument('--no-checkpoint',
+                       action='store_true',
+                       help=f"Do not write the checkpoint journal ({CHECKPOINT_CONFIG['directory']}) that --resume reads")
+    
+    parser.add_argument('--profile-scan',
+                       action='store_true',
+                       help='Print time, API calls, pages, bytes, retries and resources per collector and region')
+    
+    parser.add_argument('--profile-trace',
+                       metavar='FILE',
+                       help='Write the per-collector profile as a JSON trace (implies --profile-scan)')
+    
+    parser.add_argument('--metrics-file',
+                       nargs='?',
+                       const=METRICS_CONFIG['textfile'],
+                       metavar='FILE',
+                       help=f"Write scan metrics for the Prometheus textfile collector (default: {METRICS_CONFIG['textfile']})")
+    
+    parser.add_argument('--otlp-endpoint',
+                       nargs='?',
+                       const=METRICS_CONFIG['otlp_endpoint'],
+                       metavar='URL',
+                       help=f"Send scan metrics and spans over OTLP/HTTP (default: {METRICS_CONFIG['otlp_endpoint']}; "
+                            "requires opentelemetry-sdk)")
+    
     # Output options
     parser.add_argument('--summary-only', '-s',
                        action='store_true',
@@ -57,6 +236,22 @@ Examples:
                        action='store_true',
                        help='Export results to HTML report')
     
+    parser.add_argument('--export-ndjson',
+                       action='store_true',
+                       help='Stream resources to an NDJSON file as they are discovered')
+    
+    parser.add_argument('--gzip',
+                       action='store_true',
+                       help='Gzip-compress the NDJSON stream (.ndjson.gz)')
+    
+    parser.add_argument('--export-parquet',
+                       action='store_true',
+                       help='Stream resources to typed Parquet files, one per service (requires pyarrow)')
+    
+    parser.add_argument('--export-arrow',
+                       action='store_true',
+                       help='Stream resources to typed Arrow IPC files, one per service (requires pyarrow)')
+    
     parser.add_argument('--export-all',
                        action='store_true',
                        help='Export to all formats (JSON, CSV, HTML)')
@@ -71,18 +266,76 @@ Examples:
                        help='Include resource analysis (costs, unused resources)')
     
     parser.add_argument('--compare',
-                       help='Compare with previous scan results (JSON file)')
+                       nargs='+',
+                       metavar='FILE',
+                       help='Compare with previous scan results (JSON or NDJSON export); '
+                            'with two files (PREVIOUS CURRENT) compare them without scanning')
+    
+    parser.add_argument('--store',
+                       action='store_true',
+                       help='Save the scan into the SQLite inventory history')
+    
+    parser.add_argument('--store-path',
+                       default=STORE_CONFIG['path'],
+                       help=f"SQLite inventory history file (default: {STORE_CONFIG['path']})")
+    
+    parser.add_argument('--compare-stored',
+                       nargs='?',
+                       const='last',
+                       metavar='SCAN_ID',
+                       help='Compare with a scan of the SQLite history (default: the previous one; implies --store)')
     
     # Service filtering
     parser.add_argument('--services',
                        nargs='+',
-                       help='Specific services to scan (e.g., ec2 s3 lambda)')
+                       help='Specific services to scan: keys, display names or prefixes (e.g., ec2_instances s3 lambda)')
     
     parser.add_argument('--exclude-services',
                        nargs='+',
                        help='Services to exclude from scan')
     
+    parser.add_argument('--filter',
+                       nargs='+',
+                       metavar='EXPR',
+                       help='Only resources matching every condition: tag:KEY=VALUE, tag:KEY, state=VALUE, vpc=VALUE '
+                            '(comma-separated values are alternatives); sent as native API filters where supported')
+    
     # Utility options
+    parser.add_argument('--query',
+                       metavar='EXPR',
+                       help="Print only the resources matching a query, e.g. 'service=EC2 and status=stopped "
+                            "and tag:team=data' (fields: id, service, region, status, vpc, account, tag:KEY)")
+    
+    parser.add_argument('--query-source',
+                       metavar='FILE',
+                       help='Run --query and the graph queries on a JSON/NDJSON export instead of a new scan')
+    
+    parser.add_argument('--in-vpc',
+                       metavar='VPC_ID',
+                       help='Print everything inside a VPC, including volumes, IPs and load balancers of its instances')
+    
+    parser.add_argument('--orphans',
+                       action='store_true',
+                       help='Print resources nothing uses: unattached volumes and gateways, free Elastic IPs, unused security groups')
+    
+    parser.add_argument('--blast-radius',
+                       metavar='RESOURCE_ID',
+                       help='Print every resource that depends on a resource (affected by deleting it)')
+    
+    parser.add_argument('--daemon',
+                       action='store_true',
+                       help='Keep running: refresh services on their DAEMON_CONFIG schedules and serve the inventory '
+                            'over a local HTTP/JSON API')
+    
+    parser.add_argument('--daemon-host',
+                       default=DAEMON_CONFIG['host'],
+                       help=f"Address the daemon API listens on (default: {DAEMON_CONFIG['host']})")
+    
+    parser.add_argument('--daemon-port',
+                       type=int,
+                       default=DAEMON_CONFIG['port'],
+                       help=f"Port of the daemon API (default: {DAEMON_CONFIG['port']})")
+    
     parser.add_argument('--list-services',
                        action='store_true',
                        help='List all available services and exit')
@@ -93,14 +346,98 @@ Examples:
     
     args = parser.parse_args()
     
+    # A resumed scan runs with the arguments of the scan it continues
+    journal = None
+    resuming = bool(args.resume)  # The re-parsed arguments of the original scan never hold --resume
+    if resuming:
+        from scan_journal import ScanJournal
+        try:
+            journal = ScanJournal.resume(args.resume)
+        except FileNotFoundError:
+            parser.error(f"no checkpoint journal for scan '{args.resume}' in {CHECKPOINT_CONFIG['directory']}")
+        args = parser.parse_args(journal.argv)
+    
     # Handle list services
     if args.list_services:
+        from collectors import COLLECTORS
+        
         print("Available services:")
-        for service in sorted(SERVICES_CONFIG.keys()):
-            status = "✅" if SERVICES_CONFIG[service] else "❌"
-            print(f"  {status} {service}")
+        for service in sorted(COLLECTORS):
+            collector = COLLECTORS[service]
+            status = "✅" if SERVICES_CONFIG.get(service) else "❌"
+            scope = 'regional' if collector.regional else 'global'
+            print(f"  {status} {service:<24} {collector.name:<24} {scope:<9} cost {collector.cost}")
         return
     
+    query = None
+    graph_queries = bool(args.in_vpc or args.orphans or args.blast_radius)
+    if args.query_source and not (args.query or graph_queries):
+        parser.error('--query-source requires --query, --in-vpc, --orphans or --blast-radius')
+    if args.query:
+        from inventory import parse_query
+        try:
+            query = parse_query(args.query)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    # Query an existing export: no scan, no AWS
+    if args.query_source:
+        if query is not None:
+            run_query(query, args.query_source)
+        if graph_queries:
+            run_graph_queries(args, args.query_source)
+        return
+    
+    if args.compare and len(args.compare) > 2:
+        parser.error('--compare takes one file (PREVIOUS) or two (PREVIOUS CURRENT)')
+    
+    # Compare two existing exports: no scan, no AWS
+    if args.compare and len(args.compare) == 2:
+        from utils import compare_scans, print_changes_report
+        
+        previous_resources, current_resources = (load_comparison_source(f) for f in args.compare)
+        if not previous_resources or not current_resources:
+            sys.exit(1)
+        print_changes_report(compare_scans(current_resources, previous_resources))
+        return
+    
+    if args.accounts and not args.organization:
+        parser.error('--accounts requires --organization')
+    if args.organization and args.backend != 'threads':
+        parser.error('--organization supports only the threads backend')
+    if args.daemon and (args.organization or resuming):
+        parser.error('--daemon cannot be combined with --organization or --resume')
+    
+    scan_filter = None
+    if args.filter:
+        from scan_filter import ScanFilter
+        try:
+            scan_filter = ScanFilter.parse(args.filter)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    # Service filtering: the scan runs only the collectors enabled in SERVICES_CONFIG
+    if args.services or args.exclude_services:
+        from collectors import resolve_services
+        try:
+            included = resolve_services(args.services) if args.services else None
+            excluded = resolve_services(args.exclude_services or [])
+        except ValueError as e:
+            parser.error(str(e))
+        for service in SERVICES_CONFIG:
+            if included is not None:
+                SERVICES_CONFIG[service] = service in included
+            if service in excluded:
+                SERVICES_CONFIG[service] = False
+    
+    from listar_recursos import AWSResourceLister, MultiRegionResourceLister
+    
+    if args.daemon:
+        run_daemon(args, scan_filter)
+        return
+    
+    from utils import AWSResourceExporter, NDJSONSink, create_directory_structure, compare_scans, print_changes_report
+    
     # Create directory structure
     create_directory_structure()
     
@@ -109,37 +446,115 @@ Examples:
         print("🚀 AWS Inventory Scanner v2.0.0")
         print("=" * 50)
         
-        lister = AWSResourceLister(region=args.region)
+        if journal is not None:
+            print(f"♻️  Retomando o scan {journal.scan_id}")
+        elif not args.no_checkpoint:
+            from scan_journal import ScanJournal
+            journal = ScanJournal.create(sys.argv[1:])
+            print(f"📓 Checkpoint: {journal.scan_id}")
+        
+        state = None
+        if args.incremental:
+            from scan_state import ScanState
+            state = ScanState.load(args.state_file)
         
-        # Apply service filtering if specified
-        if args.services:
-            # Enable only specified services
-            for service in SERVICES_CONFIG:
-                SERVICES_CONFIG[service] = service in args.services
+        profiler = None
+        if args.profile_scan or args.profile_trace or args.metrics_file or args.otlp_endpoint:
+            from scan_profiler import ScanProfiler
+            profiler = ScanProfiler()
         
-        if args.exclude_services:
-            # Disable specified services
-            for service in args.exclude_services:
-                if service in SERVICES_CONFIG:
-                    SERVICES_CONFIG[service] = False
+        sinks = []
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        if args.export_ndjson:
+            extension = 'ndjson.gz' if args.gzip else 'ndjson'
+            sinks.append(NDJSONSink(f"{args.output_dir}/aws_resources_{timestamp}.{extension}", compress=args.gzip))
+        for file_format in ('parquet', 'arrow'):
+            if getattr(args, f"export_{file_format}"):
+                from columnar_export import ColumnarSink
+                sinks.append(ColumnarSink(f"{args.output_dir}/aws_resources_{timestamp}_{file_format}", file_format))
+        
+        regions = REGIONS_TO_SCAN if args.all_regions else args.regions
+        if args.organization:
+            from organization import OrganizationResourceLister
+            regions = regions or [args.region]
+            lister = OrganizationResourceLister(regions, accounts=args.accounts, role_name=args.org_role,
+                                                scan_workers=args.org_workers, max_workers=args.workers,
+                                                profile=args.profile, shallow=args.shallow, state=state, sinks=sinks,
+                                                profiler=profiler, scan_filter=scan_filter, journal=journal)
+        elif regions:
+            lister = MultiRegionResourceLister(regions, max_workers=args.workers, profile=args.profile,
+                                               shallow=args.shallow, backend=args.backend, state=state, sinks=sinks,
+                                               profiler=profiler, scan_filter=scan_filter, journal=journal)
+        else:
+            lister = AWSResourceLister(region=args.region, max_workers=args.workers, profile=args.profile,
+                                       shallow=args.shallow, backend=args.backend, state=state, sinks=sinks,
+                                       profiler=profiler, scan_filter=scan_filter, journal=journal)
         
         # Run the scan
-        lister.run_all_checks()
+        try:
+            lister.run_all_checks()
+        finally:
+            for sink in sinks:
+                sink.close()
+                print(f"✅ {sink.count} recursos transmitidos para: {getattr(sink, 'filename', None) or sink.directory}")
+        
+        if resuming:
+            print(f"♻️  {journal.stats['units_restored']} unidades restauradas e "
+                  f"{journal.stats['pages_replayed']} páginas reaproveitadas do checkpoint")
         
         # Display results
-        if args.summary_only:
+        if query is not None or graph_queries:
+            if query is not None:
+                run_query(query, lister.all_resources)
+            if graph_queries:
+                run_graph_queries(args, lister.all_resources)
+        elif args.summary_only:
             lister.print_executive_summary()
         else:
             lister.print_results()
         
+        # Scan profile
+        if args.profile_scan or args.profile_trace:
+            profiler.print_report()
+            if args.profile_trace:
+                profiler.write_trace(args.profile_trace)
+        
+        # Metrics for scheduled scans
+        if args.metrics_file or args.otlp_endpoint:
+            from metrics_export import write_prometheus_textfile, export_otlp
+            metric_labels = {'profile': args.profile or 'default'}
+            if args.metrics_file:
+                write_prometheus_textfile(profiler, args.metrics_file, labels=metric_labels)
+            if args.otlp_endpoint:
+                export_otlp(profiler, args.otlp_endpoint, labels=metric_labels)
+        
         # Analysis
         if args.analyze:
+            from utils import AWSResourceAnalyzer
             analyzer = AWSResourceAnalyzer(lister.all_resources)
             analyzer.print_analysis()
         
+        # SQLite inventory history
+        if args.store or args.compare_stored:
+            from inventory_store import InventoryStore
+            with InventoryStore(args.store_path) as store:
+                scan_regions = lister.regions if regions else [args.region]
+                scan_id = store.save_scan(lister.all_resources, profile=args.profile, regions=scan_regions)
+                print(f"\n🗄️  Scan #{scan_id} salvo em: {args.store_path}")
+                
+                if args.compare_stored:
+                    if args.compare_stored == 'last':
+                        previous_id = store.latest_scan_id(profile=args.profile or 'default', before_id=scan_id)
+                    else:
+                        previous_id = int(args.compare_stored)
+                    if previous_id is None:
+                        print("⚠️  Nenhum scan anterior no histórico para comparar.")
+                    else:
+                        print_changes_report(store.compare(scan_id, previous_id))
+        
         # Comparison with previous scan
         if args.compare:
-            previous_resources = load_previous_scan(args.compare)
+            previous_resources = load_comparison_source(args.compare[0])
             if previous_resources:
                 changes = compare_scans(lister.all_resources, previous_resources)
                 print_changes_report(changes)
@@ -163,13 +578,30 @@ Examples:
         
         # Summary
         total_resources = sum(len(resources) for resources in lister.all_resources.values())
-        print(f"\n🎯 Scan concluído! {total_resources} recursos encontrados na região {args.region}")
+        if args.organization:
+            print(f"\n🎯 Scan concluído! {total_resources} recursos encontrados em {len(lister.accounts)} contas "
+                  f"e {len(lister.regions)} regiões")
+        elif regions:
+            print(f"\n🎯 Scan concluído! {total_resources} recursos encontrados em {len(lister.regions)} regiões")
+        else:
+            print(f"\n🎯 Scan concluído! {total_resources} recursos encontrados na região {args.region}")
+        
+        if journal is not None:
+            # A collector that failed was reported and skipped; keep its journal so --resume can list it again
+            incomplete = lister.incomplete_collectors()
+            if incomplete:
+                print(f"⚠️  {len(incomplete)} coletores não concluídos: {', '.join(incomplete)}")
+                print_resume_hint(journal)
+            else:
+                journal.finish()
         
     except KeyboardInterrupt:
         print("\n⚠️  Scan interrompido pelo usuário.")
+        print_resume_hint(journal)
         sys.exit(1)
     except Exception as e:
         print(f"\n❌ Erro durante o scan: {str(e)}")
+        print_resume_hint(journal)
         sys.exit(1)
 
 if __name__ == "__main__":
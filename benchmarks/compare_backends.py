@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Compare the threaded and async scan backends offline.
+
+Starts a local moto server (pip install "moto[server]" aiobotocore), seeds it with
+synthetic resources and runs each backend in its own process, reporting wall-clock
+time and peak RSS so thread stacks and connection pools are accounted for.
+
+Usage:
+  python3 benchmarks/compare_backends.py --resources 200 --regions us-east-1 eu-west-1
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def seed(endpoint, regions, count):
+    """Create queues, topics, tables, buckets and clusters in every region"""
+    import boto3
+    
+    session = boto3.session.Session(aws_access_key_id='testing', aws_secret_access_key='testing')
+    s3 = session.client('s3', region_name='us-east-1', endpoint_url=endpoint)
+    for i in range(count):
+        s3.create_bucket(Bucket=f'bench-bucket-{i}')
+    
+    for region in regions:
+        sqs = session.client('sqs', region_name=region, endpoint_url=endpoint)
+        sns = session.client('sns', region_name=region, endpoint_url=endpoint)
+        dynamodb = session.client('dynamodb', region_name=region, endpoint_url=endpoint)
+        ecs = session.client('ecs', region_name=region, endpoint_url=endpoint)
+        for i in range(count):
+            sqs.create_queue(QueueName=f'bench-queue-{i}')
+            sns.create_topic(Name=f'bench-topic-{i}')
+            dynamodb.create_table(
+                TableName=f'bench-table-{i}',
+                KeySchema=[{'AttributeName': 'pk', 'KeyType': 'HASH'}],
+                AttributeDefinitions=[{'AttributeName': 'pk', 'AttributeType': 'S'}],
+                BillingMode='PAY_PER_REQUEST',
+            )
+            ecs.create_cluster(clusterName=f'bench-cluster-{i}')
+
+def run_child(backend, regions):
+    """Scan with one backend and print timing/memory as JSON"""
+    from listar_recursos import AWSResourceLister, MultiRegionResourceLister
+    
+    if len(regions) > 1:
+        lister = MultiRegionResourceLister(regions, backend=backend)
+    else:
+        lister = AWSResourceLister(region=regions[0], backend=backend)
+    
+    start = time.perf_counter()
+    lister.scan()
+    elapsed = time.perf_counter() - start
+    
+    print(json.dumps({
+        'backend': backend,
+        'seconds': round(elapsed, 3),
+        'resources': sum(len(resources) for resources in lister.all_resources.values()),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare threaded and async scan backends against moto')
+    parser.add_argument('--resources', type=int, default=100, help='Resources of each type per region')
+    parser.add_argument('--regions', nargs='+', default=['us-east-1'])
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--child', choices=['threads', 'async'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        run_child(args.child, args.regions)
+        return
+    
+    from moto.server import ThreadedMotoServer
+    
+    endpoint = f'http://127.0.0.1:{args.port}'
+    server = ThreadedMotoServer(port=args.port, verbose=False)
+    server.start()
+    try:
+        seed(endpoint, args.regions, args.resources)
+        
+        env = dict(os.environ, AWS_ENDPOINT_URL=endpoint,
+                   AWS_ACCESS_KEY_ID='testing', AWS_SECRET_ACCESS_KEY='testing')
+        results = []
+        for backend in ('threads', 'async'):
+            output = subprocess.run(
+                [sys.executable, __file__, '--child', backend, '--regions', *args.regions],
+                env=env, capture_output=True, text=True, check=True,
+            ).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+    finally:
+        server.stop()
+    
+    print(f"{'Backend':<10} {'Tempo (s)':>10} {'Recursos':>10} {'Pico RSS (MB)':>14}")
+    for result in results:
+        print(f"{result['backend']:<10} {result['seconds']:>10} {result['resources']:>10} {result['peak_rss_mb']:>14}")
+
+if __name__ == '__main__':
+    main()
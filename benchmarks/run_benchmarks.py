@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Benchmark the scanner end to end against a simulated AWS account, offline.
+
+Seeds a synthetic account (benchmarks/simulated_aws.py) at the chosen scale, then times
+run_all_checks, every exporter, compare_scans and AWSResourceAnalyzer, reporting wall time,
+throughput and peak Python memory (tracemalloc, in a second run of each stage). Results can
+be saved as a baseline and later runs checked against it, failing on regressions (CI).
+
+Usage:
+  python3 benchmarks/run_benchmarks.py --scale ci --output benchmarks/baseline.json
+  python3 benchmarks/run_benchmarks.py --scale ci --baseline benchmarks/baseline.json --max-regression 0.3
+  python3 benchmarks/run_benchmarks.py --scale large --regions 8 --set instances=20000 queues=40000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Offline: calls are answered before signing, these only keep credential lookups quiet
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+from simulated_aws import SCALES, LatencyModel, SimulatedAccount
+
+REGIONS = ['us-east-1', 'us-west-2', 'eu-west-1', 'ap-southeast-1',
+           'eu-central-1', 'ap-northeast-1', 'sa-east-1', 'ca-central-1']
+
+# Differences below these are noise, whatever the relative change
+MIN_SECONDS_DELTA = 0.05
+MIN_MEMORY_DELTA_MB = 1.0
+
+def build_lister(account, regions, workers):
+    from listar_recursos import AWSResourceLister, MultiRegionResourceLister
+
+    if len(regions) > 1:
+        lister = MultiRegionResourceLister(regions, max_workers=workers)
+    else:
+        lister = AWSResourceLister(region=regions[0], max_workers=workers)
+    account.install(lister.clients.session())
+    return lister
+
+def previous_scan(resources_data, change_every=100):
+    """A copy of a scan with one resource in `change_every` removed, changed or renamed"""
+    from resource_model import Resource
+
+    previous = {}
+    for service, resources in resources_data.items():
+        copies = []
+        for index, resource in enumerate(resources):
+            copy = Resource.from_record(service, resource.to_record())
+            if index % change_every == 1:
+                continue
+            if index % change_every == 2:
+                copy.update(status='modified')
+            if index % change_every == 3:
+                copy.id = f"{copy.id}-old"
+            copies.append(copy)
+        previous[service] = copies
+    return previous
+
+class BenchmarkRunner:
+    def __init__(self, account, regions, workers, measure_memory=True):
+        self.account = account
+        self.regions = regions
+        self.workers = workers
+        self.measure_memory = measure_memory
+        self.results = {}
+        self.directory = tempfile.mkdtemp(prefix='aws-inventory-bench-')
+
+    def measure(self, name, func, items=None):
+        """Time func() (and its peak memory in a second run); returns the result of the timed run"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func()
+            seconds = time.perf_counter() - start
+
+            peak_mb = None
+            if self.measure_memory:
+                tracemalloc.start()
+                func()
+                peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+                tracemalloc.stop()
+
+        items = items(result) if callable(items) else items
+        self.results[name] = {
+            'seconds': round(seconds, 4),
+            'items': items,
+            'throughput': round(items / seconds, 1) if items and seconds else None,
+            'peak_mb': round(peak_mb, 2) if peak_mb is not None else None,
+        }
+        return result
+
+    def run(self):
+        from utils import AWSResourceExporter, AWSResourceAnalyzer, compare_scans
+
+        def scan():
+            lister = build_lister(self.account, self.regions, self.workers)
+            lister.run_all_checks()
+            return lister
+
+        lister = self.measure('scan', scan, items=lambda lister: sum(map(len, lister.all_resources.values())))
+        self.results['scan']['api_calls'] = lister.throttle.stats['calls']
+        self.results['scan']['throttles'] = lister.throttle.stats['throttles']
+        resources_data = lister.all_resources
+        total = sum(map(len, resources_data.values()))
+        exporter = AWSResourceExporter(resources_data)
+        path = os.path.join(self.directory, 'aws_resources')
+
+        self.measure('export_json', lambda: exporter.export_to_json(f"{path}.json"), total)
+        self.measure('export_csv', lambda: exporter.export_to_csv(f"{path}.csv"), total)
+        self.measure('export_html', lambda: exporter.export_to_html(f"{path}.html"), total)
+        self.measure('export_ndjson', lambda: exporter.export_to_ndjson(f"{path}.ndjson"), total)
+        try:
+            import pyarrow  # noqa: F401  (optional, like the Parquet exporter itself)
+            self.measure('export_parquet', lambda: exporter.export_to_columnar(f"{path}_parquet"), total)
+        except ImportError:
+            pass
+
+        previous = previous_scan(resources_data)
+        self.measure('compare_scans', lambda: compare_scans(resources_data, previous), total)
+        with contextlib.redirect_stdout(io.StringIO()):
+            AWSResourceExporter(previous).export_to_ndjson(f"{path}_previous.ndjson")
+        self.measure('compare_ndjson_files',
+                     lambda: compare_scans(f"{path}.ndjson", f"{path}_previous.ndjson"), total)
+
+        analyzer = AWSResourceAnalyzer(resources_data)
+        self.measure('analyzer', analyzer.print_analysis, total)
+        return self.results
+
+def check_regressions(results, baseline, max_regression):
+    """Stages slower or bigger than the baseline by more than max_regression (and the noise floor)"""
+    regressions = []
+    for stage, result in results.items():
+        base = baseline.get('stages', {}).get(stage)
+        if not base:
+            continue
+        for metric, floor in (('seconds', MIN_SECONDS_DELTA), ('peak_mb', MIN_MEMORY_DELTA_MB)):
+            value, reference = result.get(metric), base.get(metric)
+            if value is None or not reference:
+                continue
+            if value > reference * (1 + max_regression) and value - reference > floor:
+                regressions.append((stage, metric, reference, value))
+    return regressions
+
+def print_results(results, account):
+    print(f"\n📦 Conta simulada: {account.total_resources()} recursos em {len(account.regions)} regiões "
+          f"| {results['scan']['api_calls']} chamadas de API por scan ({results['scan']['throttles']} com throttling)")
+    print(f"{'Etapa':<22} {'Tempo (s)':>10} {'Itens':>9} {'Itens/s':>11} {'Pico (MB)':>10}")
+    for stage, result in results.items():
+        throughput = result['throughput'] if result['throughput'] is not None else '-'
+        peak = result['peak_mb'] if result['peak_mb'] is not None else '-'
+        print(f"{stage:<22} {result['seconds']:>10} {result['items'] or '-':>9} {throughput:>11} {peak:>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the scanner against a simulated AWS account')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='ci', help='Resource counts preset (default: ci)')
+    parser.add_argument('--set', nargs='+', default=[], metavar='TYPE=COUNT',
+                        help='Override resource counts, e.g. instances=10000 queues=20000')
+    parser.add_argument('--regions', type=int, help='Number of simulated regions (default: 2 for ci, 8 for large)')
+    parser.add_argument('--workers', type=int, help='Collectors scanned in parallel per region')
+    parser.add_argument('--latency-ms', type=float, default=30.0, help='Base latency of a simulated call (default: 30)')
+    parser.add_argument('--per-item-us', type=float, default=50.0, help='Extra latency per returned item (default: 50)')
+    parser.add_argument('--rate-limit', type=float,
+                        help='Calls per second allowed per service and region; faster calls are throttled')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc runs (halves the run time)')
+    parser.add_argument('--output', help='Write the results as JSON (usable as a baseline)')
+    parser.add_argument('--baseline', help='Results JSON to compare with; exits with 1 on regressions')
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help='Allowed slowdown/growth over the baseline (default: 0.25 = 25%%)')
+    args = parser.parse_args()
+
+    counts = dict(SCALES[args.scale])
+    for override in args.set:
+        kind, _, count = override.partition('=')
+        if kind not in counts or not count.isdigit():
+            parser.error(f"override inválido: {override} (tipos: {', '.join(sorted(counts))})")
+        counts[kind] = int(count)
+
+    regions = REGIONS[:args.regions or (8 if args.scale == 'large' else 2)]
+    latency = LatencyModel(base=args.latency_ms / 1000, per_item=args.per_item_us / 1e6, seed=args.seed)
+    account = SimulatedAccount(counts, regions, latency=latency, rate_limit=args.rate_limit, seed=args.seed)
+
+    results = BenchmarkRunner(account, regions, args.workers, measure_memory=not args.no_memory).run()
+    print_results(results, account)
+
+    report = {'scale': args.scale, 'counts': counts, 'regions': regions, 'latency_ms': args.latency_ms,
+              'python': sys.version.split()[0], 'stages': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Resultados salvos em: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = check_regressions(results, baseline, args.max_regression)
+        if regressions:
+            print(f"\n❌ Regressões acima de {args.max_regression:.0%}:")
+            for stage, metric, reference, value in regressions:
+                print(f"  • {stage} {metric}: {reference} → {value}")
+            sys.exit(1)
+        print(f"\n✅ Nenhuma regressão acima de {args.max_regression:.0%} em relação a {args.baseline}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Simulated AWS account for offline benchmarks.
+
+Answers botocore calls from a 'before-call' event handler (the hook botocore's Stubber uses),
+so no network, credentials or moto server are involved. Listings are generated on demand
+from per-type resource counts and paginated with the real paginator definitions, and every
+call sleeps according to a latency model (base latency plus a per-item cost, with jitter).
+Optionally each (service, region) enforces a request rate, answering calls above it with
+throttling errors as AWS does.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+import botocore.session
+
+CREATED = datetime(2024, 1, 1, tzinfo=timezone.utc)
+ACCOUNT_ID = '123456789012'
+
+# Resource counts of the whole account (regional types are spread over the regions)
+SCALES = {
+    'ci': {
+        'instances': 500, 'buckets': 200, 'queues': 1000, 'topics': 200, 'tables': 200, 'functions': 200,
+        'volumes': 500, 'security_groups': 100, 'vpcs': 8, 'key_pairs': 50, 'db_instances': 50, 'stacks': 50,
+        'alarms': 200, 'zones': 20, 'load_balancers': 40, 'target_load_balancers': 40, 'auto_scaling_groups': 50,
+        'elastic_ips': 50, 'nat_gateways': 8, 'internet_gateways': 8, 'repositories': 50, 'clusters': 20,
+        'secrets': 100, 'users': 50, 'roles': 100, 'rest_apis': 20, 'http_apis': 20,
+    },
+    'large': {
+        'instances': 10000, 'buckets': 5000, 'queues': 20000, 'topics': 2000, 'tables': 2000, 'functions': 3000,
+        'volumes': 12000, 'security_groups': 2000, 'vpcs': 40, 'key_pairs': 400, 'db_instances': 400,
+        'stacks': 800, 'alarms': 4000, 'zones': 200, 'load_balancers': 300, 'target_load_balancers': 600,
+        'auto_scaling_groups': 500, 'elastic_ips': 600, 'nat_gateways': 80, 'internet_gateways': 40,
+        'repositories': 600, 'clusters': 200, 'secrets': 1500, 'users': 800, 'roles': 3000, 'rest_apis': 200,
+        'http_apis': 200,
+    },
+}
+
+# Types listed once per account rather than per region
+GLOBAL_TYPES = {'buckets', 'users', 'roles', 'zones'}
+
+class LatencyModel:
+    """Delay of a simulated call: base + per_item * items, scaled by +/- jitter"""
+
+    def __init__(self, base=0.03, per_item=0.00005, jitter=0.25, seed=0):
+        self.base = base
+        self.per_item = per_item
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self, items=0):
+        with self._lock:
+            factor = 1 + self._random.uniform(-self.jitter, self.jitter)
+        return max(0.0, (self.base + self.per_item * items) * factor)
+
+class _Response:
+    """Minimal HTTP response as seen by botocore after a short-circuited call"""
+
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.headers = {}
+        self.raw = None
+        self._content = b''
+
+@lru_cache(maxsize=None)
+def _paginator(service_name, operation):
+    try:
+        return botocore.session.get_session().get_paginator_model(service_name).get_paginator(operation)
+    except Exception:
+        return None
+
+def _instance(region, i):
+    return {'Instances': [{
+        'InstanceId': f'i-{region}-{i:07d}', 'InstanceType': ('t3.micro', 'm5.large', 'c5.xlarge')[i % 3],
+        'State': {'Name': ('running', 'stopped', 'terminated')[i % 7 % 3]}, 'LaunchTime': CREATED,
+        'Tags': [{'Key': 'Name', 'Value': f'web-{i}'}, {'Key': 'env', 'Value': ('prod', 'dev')[i % 2]}],
+        'VpcId': f'vpc-{region}-{i % 4}', 'SubnetId': f'subnet-{region}-{i % 16}',
+        'SecurityGroups': [{'GroupId': f'sg-{region}-{i % 8}'}],
+    }]}
+
+def _volume(region, i):
+    attachments = [{'InstanceId': f'i-{region}-{i:07d}'}] if i % 3 else []
+    return {'VolumeId': f'vol-{region}-{i:07d}', 'Size': 8 * (1 + i % 8), 'VolumeType': ('gp3', 'gp2', 'io1')[i % 3],
+            'State': 'in-use' if attachments else 'available', 'Attachments': attachments, 'CreateTime': CREATED}
+
+def _elastic_ip(region, i):
+    return {'PublicIp': f'10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}', 'AllocationId': f'eipalloc-{region}-{i}',
+            'Domain': 'vpc', **({'InstanceId': f'i-{region}-{i:07d}'} if i % 2 else {})}
+
+# (service, operation) -> (result key, resource type, item factory)
+LISTINGS = {
+    ('ec2', 'DescribeInstances'): ('Reservations', 'instances', _instance),
+    ('s3', 'ListBuckets'): ('Buckets', 'buckets', lambda r, i: {'Name': f'bucket-{i:06d}', 'CreationDate': CREATED}),
+    ('lambda', 'ListFunctions'): ('Functions', 'functions', lambda r, i: {
+        'FunctionName': f'fn-{r}-{i}', 'Runtime': 'python3.12', 'MemorySize': 128 * (1 + i % 8),
+        'LastModified': '2024-01-01T00:00:00.000+0000'}),
+    ('rds', 'DescribeDBInstances'): ('DBInstances', 'db_instances', lambda r, i: {
+        'DBInstanceIdentifier': f'db-{r}-{i}', 'Engine': ('postgres', 'mysql')[i % 2],
+        'DBInstanceClass': 'db.t3.medium', 'DBInstanceStatus': 'available'}),
+    ('dynamodb', 'ListTables'): ('TableNames', 'tables', lambda r, i: f'table-{r}-{i}'),
+    ('apigateway', 'GetRestApis'): ('items', 'rest_apis', lambda r, i: {
+        'id': f'rest{i}', 'name': f'api-{i}', 'createdDate': CREATED}),
+    ('apigatewayv2', 'GetApis'): ('Items', 'http_apis', lambda r, i: {
+        'ApiId': f'http{i}', 'Name': f'http-api-{i}', 'ProtocolType': 'HTTP', 'CreatedDate': CREATED}),
+    ('ec2', 'DescribeVpcs'): ('Vpcs', 'vpcs', lambda r, i: {
+        'VpcId': f'vpc-{r}-{i}', 'CidrBlock': f'10.{i % 256}.0.0/16', 'IsDefault': i == 0, 'State': 'available'}),
+    ('ec2', 'DescribeSecurityGroups'): ('SecurityGroups', 'security_groups', lambda r, i: {
+        'GroupId': f'sg-{r}-{i}', 'GroupName': f'sg-{i}', 'VpcId': f'vpc-{r}-{i % 4}'}),
+    ('ec2', 'DescribeKeyPairs'): ('KeyPairs', 'key_pairs', lambda r, i: {
+        'KeyName': f'key-{i}', 'KeyPairId': f'key-{r}-{i}', 'KeyType': 'rsa', 'CreateTime': CREATED}),
+    ('ec2', 'DescribeVolumes'): ('Volumes', 'volumes', _volume),
+    ('iam', 'ListUsers'): ('Users', 'users', lambda r, i: {
+        'UserName': f'user-{i}', 'UserId': f'AIDA{i:016d}', 'Arn': f'arn:aws:iam::{ACCOUNT_ID}:user/user-{i}',
+        'Path': '/', 'CreateDate': CREATED}),
+    ('iam', 'ListRoles'): ('Roles', 'roles', lambda r, i: {
+        'RoleName': f'role-{i}', 'RoleId': f'AROA{i:016d}', 'Arn': f'arn:aws:iam::{ACCOUNT_ID}:role/role-{i}',
+        'Path': '/', 'CreateDate': CREATED}),
+    ('cloudformation', 'DescribeStacks'): ('Stacks', 'stacks', lambda r, i: {
+        'StackName': f'stack-{i}', 'StackStatus': 'CREATE_COMPLETE', 'CreationTime': CREATED}),
+    ('sns', 'ListTopics'): ('Topics', 'topics', lambda r, i: {'TopicArn': f'arn:aws:sns:{r}:{ACCOUNT_ID}:topic-{i}'}),
+    ('sqs', 'ListQueues'): ('QueueUrls', 'queues', lambda r, i: f'https://sqs.{r}.amazonaws.com/{ACCOUNT_ID}/queue-{i}'),
+    ('cloudwatch', 'DescribeAlarms'): ('MetricAlarms', 'alarms', lambda r, i: {
+        'AlarmName': f'alarm-{i}', 'StateValue': ('OK', 'ALARM')[i % 2], 'MetricName': 'CPUUtilization',
+        'Namespace': 'AWS/EC2'}),
+    ('route53', 'ListHostedZones'): ('HostedZones', 'zones', lambda r, i: {
+        'Id': f'/hostedzone/Z{i:08d}', 'Name': f'zone{i}.example.com.', 'CallerReference': str(i),
+        'Config': {'PrivateZone': bool(i % 2)}, 'ResourceRecordSetCount': 10}),
+    ('elb', 'DescribeLoadBalancers'): ('LoadBalancerDescriptions', 'load_balancers', lambda r, i: {
+        'LoadBalancerName': f'clb-{i}', 'Scheme': 'internet-facing', 'CreatedTime': CREATED,
+        'Instances': [{'InstanceId': f'i-{r}-{i:07d}'}]}),
+    ('elbv2', 'DescribeLoadBalancers'): ('LoadBalancers', 'target_load_balancers', lambda r, i: {
+        'LoadBalancerName': f'alb-{i}', 'LoadBalancerArn': f'arn:aws:elasticloadbalancing:{r}:{ACCOUNT_ID}:lb/alb-{i}',
+        'Type': 'application', 'Scheme': 'internal', 'State': {'Code': 'active'}, 'CreatedTime': CREATED}),
+    ('autoscaling', 'DescribeAutoScalingGroups'): ('AutoScalingGroups', 'auto_scaling_groups', lambda r, i: {
+        'AutoScalingGroupName': f'asg-{i}', 'MinSize': 1, 'MaxSize': 4, 'DesiredCapacity': 2,
+        'Instances': [], 'CreatedTime': CREATED}),
+    ('ec2', 'DescribeAddresses'): ('Addresses', 'elastic_ips', _elastic_ip),
+    ('ec2', 'DescribeNatGateways'): ('NatGateways', 'nat_gateways', lambda r, i: {
+        'NatGatewayId': f'nat-{r}-{i}', 'State': 'available', 'VpcId': f'vpc-{r}-{i % 4}', 'SubnetId': f'subnet-{r}-{i}',
+        'CreateTime': CREATED, 'NatGatewayAddresses': [{'PublicIp': '203.0.113.1'}]}),
+    ('ec2', 'DescribeInternetGateways'): ('InternetGateways', 'internet_gateways', lambda r, i: {
+        'InternetGatewayId': f'igw-{r}-{i}', 'Attachments': [{'VpcId': f'vpc-{r}-{i}', 'State': 'available'}]}),
+    ('ecr', 'DescribeRepositories'): ('repositories', 'repositories', lambda r, i: {
+        'repositoryName': f'repo-{i}', 'repositoryUri': f'{ACCOUNT_ID}.dkr.ecr.{r}.amazonaws.com/repo-{i}',
+        'createdAt': CREATED}),
+    ('ecs', 'ListClusters'): ('clusterArns', 'clusters', lambda r, i: f'arn:aws:ecs:{r}:{ACCOUNT_ID}:cluster/cluster-{i}'),
+    ('secretsmanager', 'ListSecrets'): ('SecretList', 'secrets', lambda r, i: {
+        'Name': f'secret-{i}', 'CreatedDate': CREATED, **({'LastAccessedDate': CREATED} if i % 2 else {})}),
+}
+
+def _detail(operation, params):
+    """Response of a per-resource detail call"""
+    if operation == 'GetBucketLocation':
+        return {'LocationConstraint': 'eu-west-1'}
+    if operation == 'DescribeTable':
+        return {'Table': {'TableName': params.get('TableName'), 'TableStatus': 'ACTIVE', 'ItemCount': 1000}}
+    if operation == 'GetTopicAttributes':
+        return {'Attributes': {'SubscriptionsConfirmed': '2', 'SubscriptionsPending': '0'}}
+    if operation == 'GetQueueAttributes':
+        return {'Attributes': {'ApproximateNumberOfMessages': '5', 'CreatedTimestamp': '1704067200'}}
+    if operation == 'DescribeClusters':
+        return {'clusters': [{'clusterArn': arn, 'clusterName': arn.split('/')[-1], 'status': 'ACTIVE',
+                              'activeServicesCount': 3, 'runningTasksCount': 6, 'pendingTasksCount': 0}
+                             for arn in params.get('clusters', [])]}
+    if operation == 'DescribeImages':
+        return {'imageDetails': [{'imageDigest': f'sha256:{i:064d}'} for i in range(5)]}
+    return {}
+
+class SimulatedAccount:
+    """A synthetic account answering botocore calls for every collector and detail lookup"""
+
+    def __init__(self, counts, regions, latency=None, rate_limit=None, seed=0):
+        self.counts = dict(counts)
+        self.regions = list(regions)
+        self.latency = latency or LatencyModel(seed=seed)
+        self.rate_limit = rate_limit
+        self.calls = 0
+        self.throttled = 0
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def count(self, kind, region):
+        """Resources of a type in one region (global types are the same seen from any region)"""
+        total = self.counts.get(kind, 0)
+        if kind in GLOBAL_TYPES:
+            return total
+        index = self.regions.index(region) if region in self.regions else 0
+        share, extra = divmod(total, len(self.regions))
+        return share + (1 if index < extra else 0)
+
+    def total_resources(self):
+        return sum(self.counts.values())
+
+    def _over_rate_limit(self, key):
+        """Token bucket of one (service, region): rate_limit calls per second, bursts up to rate_limit"""
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (self.rate_limit, now))
+        tokens = min(self.rate_limit, tokens + (now - updated) * self.rate_limit)
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            return True
+        self._buckets[key] = (tokens - 1, now)
+        return False
+
+    def install(self, session):
+        """Answer every call of the clients created from a boto3 session from now on"""
+        session.events.register('before-parameter-build', self._remember_params, unique_id='simulated-aws-params')
+        session.events.register('before-call', self._respond, unique_id='simulated-aws-respond')
+
+    def _remember_params(self, params, context, **kwargs):
+        context['simulated_params'] = dict(params)
+
+    def _respond(self, model, context, **kwargs):
+        params = context.get('simulated_params', {})
+        service_name = model.service_model.service_name
+        region = context.get('client_region') or self.regions[0]
+        with self._lock:
+            self.calls += 1
+            throttled = self._over_rate_limit((service_name, region))
+            self.throttled += throttled
+
+        if throttled:
+            time.sleep(self.latency.delay())
+            return _Response(400), {'Error': {'Code': 'Throttling', 'Message': 'Rate exceeded'}}
+
+        listing = LISTINGS.get((service_name, model.name))
+        if listing is None:
+            time.sleep(self.latency.delay())
+            return _Response(), _detail(model.name, params)
+
+        result_key, kind, factory = listing
+        total = self.count(kind, region)
+        response = {}
+        start, end = 0, total
+
+        spec = _paginator(service_name, model.name)
+        if spec:
+            token_name = spec['input_token'] if isinstance(spec['input_token'], str) else spec['input_token'][0]
+            limit = params.get(spec.get('limit_key')) or 1000
+            start = int(params.get(token_name) or 0)
+            end = min(total, start + int(limit))
+            output_tokens = spec['output_token'] if isinstance(spec['output_token'], list) else [spec['output_token']]
+            if end < total:
+                response[output_tokens[0].split('.')[-1]] = str(end)
+            if spec.get('more_results'):
+                response[spec['more_results']] = end < total
+
+        response[result_key] = [factory(region, i) for i in range(start, end)]
+        time.sleep(self.latency.delay(end - start))
+        return _Response(), response
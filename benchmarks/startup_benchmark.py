@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Measure the cold start of the CLI's offline subcommands.
+
+Runs --version, --list-services, a two-file --compare and --query / --orphans on an export
+in fresh interpreters, reports the median wall time of each and fails (exit 1) when one
+exceeds its budget or imports a module that only scans need (boto3, botocore, the scanner itself). Imports are read from
+`python -X importtime`, so the check also holds where boto3 is not installed.
+
+Usage:
+  python3 benchmarks/startup_benchmark.py
+  python3 benchmarks/startup_benchmark.py --runs 20 --budget-ms 80
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(ROOT, 'aws_inventory_scanner.py')
+
+# Median cold start allowed per subcommand, interpreter startup included
+DEFAULT_BUDGET_MS = 150
+# Modules an offline subcommand must not import
+SCAN_ONLY_MODULES = ('boto3', 'botocore', 'aiobotocore', 'listar_recursos', 'pyarrow')
+
+def write_exports(directory):
+    """Two small JSON exports with one added, one removed and one modified resource"""
+    previous = {'ec2': [{'id': 'i-1', 'extra': 't3.micro', 'status': 'running', 'region': 'us-east-1'},
+                        {'id': 'i-2', 'extra': 't3.micro', 'status': 'running', 'region': 'us-east-1'}]}
+    current = {'ec2': [{'id': 'i-1', 'extra': 't3.micro', 'status': 'stopped', 'region': 'us-east-1'},
+                       {'id': 'i-3', 'extra': 'm5.large', 'status': 'running', 'region': 'us-east-1'}]}
+    paths = []
+    for name, resources in (('previous', previous), ('current', current)):
+        path = os.path.join(directory, f"{name}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'resources': resources}, f)
+        paths.append(path)
+    return paths
+
+def imported_modules(args, cwd):
+    """Top-level packages imported by one CLI run"""
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', CLI, *args], cwd=cwd,
+                            capture_output=True, text=True).stderr
+    modules = set()
+    for line in stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            modules.add(line.rsplit('|', 1)[1].strip().split('.')[0])
+    return modules
+
+def cold_start(args, cwd, runs):
+    """Median wall time in ms of `runs` fresh CLI processes"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, CLI, *args], cwd=cwd, capture_output=True, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the cold start of the offline CLI subcommands')
+    parser.add_argument('--runs', type=int, default=10, help='Processes per subcommand (default: 10)')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f'Median cold start allowed per subcommand (default: {DEFAULT_BUDGET_MS})')
+    args = parser.parse_args()
+
+    # A scratch working directory also shows that no exports/ directory gets created
+    with tempfile.TemporaryDirectory(prefix='aws-inventory-startup-') as directory:
+        previous, current = write_exports(directory)
+        subcommands = {
+            '--version': ['--version'],
+            '--list-services': ['--list-services'],
+            '--compare A B': ['--compare', previous, current],
+            '--query --query-source': ['--query', 'status=running', '--query-source', current],
+            '--orphans --query-source': ['--orphans', '--query-source', current],
+        }
+
+        failures = []
+        print(f"{'Subcomando':<24} {'Mediana (ms)':>13} {'Orçamento':>10}")
+        for name, cli_args in subcommands.items():
+            median = cold_start(cli_args, directory, args.runs)
+            heavy = sorted(imported_modules(cli_args, directory) & set(SCAN_ONLY_MODULES))
+            print(f"{name:<24} {median:>13.1f} {args.budget_ms:>10.0f}")
+            if median > args.budget_ms:
+                failures.append(f"{name}: {median:.1f} ms > {args.budget_ms:.0f} ms")
+            if heavy:
+                failures.append(f"{name}: importa {', '.join(heavy)}")
+
+        created = sorted(entry for entry in os.listdir(directory) if not entry.endswith('.json'))
+        if created:
+            failures.append(f"diretórios criados sem scan: {', '.join(created)}")
+
+    if failures:
+        print("\n❌ Orçamento de inicialização excedido:")
+        for failure in failures:
+            print(f"  • {failure}")
+        sys.exit(1)
+    print(f"\n✅ Todos os subcomandos offline dentro de {args.budget_ms:.0f} ms, sem importar boto3")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+from collections import namedtuple
+from config import SERVICES_CONFIG
+
+# A paginated listing call: every item (or every page when batch=True) is passed to the handler method.
+# The same listings drive the threaded scan and the async backend.
+Listing = namedtuple('Listing', 'client operation result_key handler regional optional batch',
+                     defaults=(True, False, False))
+
+# A service collector: display name used in messages, the listings it runs, whether it is regional or listed once per account (global) and its relative API cost (listing
+# plus per-resource detail calls; costlier collectors are started first). Collectors are independent
+# of each other: a collector's details are looked up once its own listings are done
+Collector = namedtuple('Collector', 'name listings regional cost', defaults=(True, 1))
+
+# Collector registry in display order (keys match SERVICES_CONFIG, lister methods are list_<key>)
+COLLECTORS = {
+    'ec2_instances': Collector('EC2 Instances', [
+        Listing('ec2', 'describe_instances', 'Reservations', '_add_ec2_reservation'),
+    ], cost=3),
+    's3_buckets': Collector('S3 Buckets', [
+        Listing('s3', 'list_buckets', 'Buckets', '_add_s3_bucket', regional=False),
+    ], regional=False, cost=3),  # list_buckets returns buckets from every region
+    'lambda_functions': Collector('Lambda Functions', [
+        Listing('lambda', 'list_functions', 'Functions', '_add_lambda_function'),
+    ]),
+    'rds_instances': Collector('RDS Instances', [
+        Listing('rds', 'describe_db_instances', 'DBInstances', '_add_rds_instance'),
+    ]),
+    'dynamodb_tables': Collector('DynamoDB Tables', [
+        Listing('dynamodb', 'list_tables', 'TableNames', '_add_dynamodb_table'),
+    ], cost=3),
+    'api_gateway': Collector('API Gateway', [
+        Listing('apigateway', 'get_rest_apis', 'items', '_add_rest_api'),
+        # HTTP APIs might not be available in all regions
+        Listing('apigatewayv2', 'get_apis', 'Items', '_add_http_api', optional=True),
+    ], cost=2),
+    'vpc_resources': Collector('VPC Resources', [
+        Listing('ec2', 'describe_vpcs', 'Vpcs', '_add_vpc'),
+        Listing('ec2', 'describe_security_groups', 'SecurityGroups', '_add_security_group'),
+    ], cost=2),
+    'key_pairs': Collector('Key Pairs', [
+        Listing('ec2', 'describe_key_pairs', 'KeyPairs', '_add_key_pair'),
+    ]),
+    'ebs_volumes': Collector('EBS Volumes', [
+        Listing('ec2', 'describe_volumes', 'Volumes', '_add_ebs_volume'),
+    ]),
+    'iam_resources': Collector('IAM Resources', [
+        Listing('iam', 'list_users', 'Users', '_add_iam_user', regional=False),
+        Listing('iam', 'list_roles', 'Roles', '_add_iam_role', regional=False),
+    ], regional=False, cost=2),
+    'cloudformation_stacks': Collector('CloudFormation Stacks', [
+        Listing('cloudformation', 'describe_stacks', 'Stacks', '_add_cloudformation_stack'),
+    ]),
+    'sns_topics': Collector('SNS Topics', [
+        Listing('sns', 'list_topics', 'Topics', '_add_sns_topic'),
+    ], cost=3),
+    'sqs_queues': Collector('SQS Queues', [
+        Listing('sqs', 'list_queues', 'QueueUrls', '_add_sqs_queue'),
+    ], cost=3),
+    'cloudwatch_alarms': Collector('CloudWatch Alarms', [
+        Listing('cloudwatch', 'describe_alarms', 'MetricAlarms', '_add_cloudwatch_alarm'),
+    ]),
+    'route53_zones': Collector('Route53 Hosted Zones', [
+        Listing('route53', 'list_hosted_zones', 'HostedZones', '_add_route53_zone', regional=False),
+    ], regional=False),
+    'elastic_load_balancers': Collector('Load Balancers', [
+        Listing('elb', 'describe_load_balancers', 'LoadBalancerDescriptions', '_add_classic_load_balancer'),
+        Listing('elbv2', 'describe_load_balancers', 'LoadBalancers', '_add_load_balancer'),
+    ], cost=2),
+    'auto_scaling_groups': Collector('Auto Scaling Groups', [
+        Listing('autoscaling', 'describe_auto_scaling_groups', 'AutoScalingGroups', '_add_auto_scaling_group'),
+    ]),
+    'elastic_ips': Collector('Elastic IPs', [
+        Listing('ec2', 'describe_addresses', 'Addresses', '_add_elastic_ip'),
+    ]),
+    'nat_gateways': Collector('NAT Gateways', [
+        Listing('ec2', 'describe_nat_gateways', 'NatGateways', '_add_nat_gateway'),
+    ]),
+    'internet_gateways': Collector('Internet Gateways', [
+        Listing('ec2', 'describe_internet_gateways', 'InternetGateways', '_add_internet_gateway'),
+    ]),
+    'ecr_repositories': Collector('ECR Repositories', [
+        Listing('ecr', 'describe_repositories', 'repositories', '_add_ecr_repository'),
+    ], cost=3),
+    'ecs_clusters': Collector('ECS Clusters', [
+        # Pages of cluster ARNs match the 100-cluster limit of DescribeClusters
+        Listing('ecs', 'list_clusters', 'clusterArns', '_add_ecs_clusters', batch=True),
+    ], cost=2),
+    'secrets_manager': Collector('Secrets Manager', [
+        Listing('secretsmanager', 'list_secrets', 'SecretList', '_add_secret'),
+    ]),
+}
+
+def enabled_services(services=None):
+    """Keys of the collectors to run: the given ones, or those enabled in SERVICES_CONFIG"""
+    if services is None:
+        services = [key for key, enabled in SERVICES_CONFIG.items() if enabled]
+    return [key for key in COLLECTORS if key in services]
+
+def resolve_services(names):
+    """Collector keys for CLI names: keys (ec2_instances), display names ('EC2 Instances') or prefixes (ec2)"""
+    by_name = {collector.name.lower(): key for key, collector in COLLECTORS.items()}
+    keys = []
+    for name in names:
+        name = name.lower()
+        matches = ([name] if name in COLLECTORS else
+                   [by_name[name]] if name in by_name else
+                   [key for key in COLLECTORS if key.split('_')[0] == name])
+        if not matches:
+            raise ValueError(f"unknown service '{name}' (see --list-services)")
+        keys.extend(matches)
+    return list(dict.fromkeys(keys))
+
+def schedule(keys):
+    """Collector keys in start order: costliest first, registry order among equal costs"""
+    return sorted(keys, key=lambda key: -COLLECTORS[key].cost)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from config import OUTPUT_CONFIG
+from resource_model import Resource
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:  # Optional dependency, only needed for --export-parquet/--export-arrow
+    pa = None
+
+# Service-specific attributes and their column types ('string', 'int', 'bool' or 'timestamp')
+SERVICE_COLUMNS = {
+    'EC2 Instances': {'vpc': 'string', 'subnet': 'string'},
+    'S3 Buckets': {'location': 'string'},
+    'Lambda Functions': {'modified': 'string'},
+    'RDS Instances': {'engine': 'string'},
+    'DynamoDB Tables': {'items': 'int'},
+    'VPCs': {'cidr': 'string', 'default': 'bool'},
+    'Security Groups': {'vpc': 'string'},
+    'CloudFormation Stacks': {'description': 'string'},
+    'SNS Topics': {'confirmed': 'int', 'pending': 'int'},
+    'SQS Queues': {'messages': 'int'},
+    'CloudWatch Alarms': {'metric': 'string', 'namespace': 'string'},
+    'Route53 Hosted Zones': {'records': 'int', 'zone_id': 'string'},
+    'Load Balancers': {'scheme': 'string', 'instances': 'int'},
+    'Auto Scaling Groups': {'min': 'int', 'max': 'int', 'desired': 'int', 'instances': 'int'},
+    'Elastic IPs': {'domain': 'string', 'allocation_id': 'string', 'association_id': 'string'},
+    'NAT Gateways': {'vpc': 'string', 'subnet': 'string', 'public_ip': 'string'},
+    'ECR Repositories': {'uri': 'string', 'images': 'int'},
+    'ECS Clusters': {'services': 'int', 'running_tasks': 'int', 'pending_tasks': 'int'},
+    'Secrets Manager': {'last_accessed': 'timestamp'},
+}
+
+FORMATS = ('parquet', 'arrow')
+
+def _arrow_type(kind):
+    return {
+        'string': pa.string(),
+        'int': pa.int64(),
+        'bool': pa.bool_(),
+        'timestamp': pa.timestamp('us', tz='UTC'),
+    }[kind]
+
+def _timestamp(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    # Naive datetimes (e.g. SQS creation times) are local time
+    return value.astimezone(timezone.utc)
+
+def _convert(kind, value):
+    if value is None:
+        return None
+    if kind == 'int':
+        return int(value)
+    if kind == 'bool':
+        return bool(value)
+    if kind == 'timestamp':
+        return _timestamp(value)
+    return str(value)
+
+def service_schema(service):
+    """Arrow schema of a service: the common Resource fields plus its typed attributes"""
+    fields = [
+        ('id', pa.string()),
+        ('status', pa.string()),
+        ('region', pa.string()),
+        ('account', pa.string()),
+        ('name', pa.string()),
+        ('type', pa.string()),
+        ('size', pa.int64()),
+        ('created', pa.timestamp('us', tz='UTC')),
+        ('attachment', pa.string()),
+        ('tags', pa.map_(pa.string(), pa.string())),
+    ]
+    fields += [(name, _arrow_type(kind)) for name, kind in SERVICE_COLUMNS.get(service, {}).items()]
+    return pa.schema(fields, metadata={'service': service})
+
+def file_slug(service):
+    return re.sub(r'[^a-z0-9]+', '_', service.lower()).strip('_')
+
+class ColumnarSink:
+    """Resource sink writing one Parquet (or Arrow IPC) file per service, row group by row group
+
+    Each service gets its own typed schema (service_schema). Rows are buffered per service
+    and written as a row group (record batch for Arrow) every `row_group_size` resources, so
+    memory stays bounded by the buffers while the files grow during the scan.
+    """
+
+    def __init__(self, directory, file_format='parquet', row_group_size=None, compression=None):
+        if pa is None:
+            raise ImportError("pyarrow não está instalado. Instale com: pip install pyarrow")
+        if file_format not in FORMATS:
+            raise ValueError(f"Formato colunar desconhecido: {file_format}")
+
+        self.directory = directory
+        self.file_format = file_format
+        self.row_group_size = row_group_size or OUTPUT_CONFIG['columnar_row_group_size']
+        self.compression = compression or OUTPUT_CONFIG['columnar_compression']
+        self.count = 0
+        self.files = {}
+        self._buffers = {}
+        self._writers = {}
+        self._schemas = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, service, resource):
+        row = self._row(service, resource)
+        with self._lock:
+            buffer = self._buffers.setdefault(service, [])
+            buffer.append(row)
+            self.count += 1
+            if len(buffer) >= self.row_group_size:
+                self._flush(service)
+
+    def _row(self, service, resource):
+        if not isinstance(resource, Resource):
+            resource = Resource.from_record(service, resource)
+
+        row = {
+            'id': str(resource.id),
+            'status': resource.status or None,
+            'region': resource.region,
+            'account': resource.account,
+            'name': resource.name,
+            'type': resource.type,
+            'size': _convert('int', resource.size),
+            'created': _timestamp(resource.created),
+            'attachment': resource.attachment,
+            'tags': list(resource.tags.items()) if resource.tags else None,
+        }
+        for name, kind in SERVICE_COLUMNS.get(service, {}).items():
+            try:
+                row[name] = _convert(kind, resource.attr(name))
+            except (TypeError, ValueError):
+                row[name] = None
+        return row
+
+    def _flush(self, service):
+        rows = self._buffers.get(service)
+        if not rows:
+            return
+
+        writer = self._writers.get(service) or self._open(service)
+        writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=self._schemas[service]))
+        rows.clear()
+
+    def _open(self, service):
+        schema = service_schema(service)
+        filename = os.path.join(self.directory, f"{file_slug(service)}.{self.file_format}")
+        if self.file_format == 'parquet':
+            writer = pq.ParquetWriter(filename, schema, compression=self.compression)
+        else:
+            options = ipc.IpcWriteOptions(compression=self.compression)
+            writer = ipc.new_file(filename, schema, options=options)
+        self._writers[service] = writer
+        self._schemas[service] = schema
+        self.files[service] = filename
+        return writer
+
+    def close(self):
+        with self._lock:
+            for service in list(self._buffers):
+                self._flush(service)
+            for writer in self._writers.values():
+                writer.close()
+            self._writers.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -45,12 +45,142 @@ SERVICES_CONFIG = {
     'route53_zones': True,
 }
 
+# Scan engine configuration
+SCAN_CONFIG = {
+    'max_workers': 8,  # Collectors running in parallel
+    'enrichment_workers': 16,  # Concurrent per-resource detail lookups
+    'async_concurrency': 64,  # In-flight API calls on the async backend, across every region of the scan
+    'async_service_concurrency': 16,  # In-flight API calls per service and region on the async backend
+}
+
+# Adaptive rate limiting and retries, per (service, region)
+THROTTLE_CONFIG = {
+    'max_rate': None,  # Optional requests-per-second ceiling; None runs unlimited until AWS throttles
+    'min_rate': 1.0,  # Floor after repeated throttling
+    'decrease_factor': 0.5,  # Rate multiplier on each throttling error
+    'increase_step': 0.5,  # Requests per second added back on each success
+    'max_attempts': 8,  # Attempts per call before the error is reported
+    'base_delay': 0.2,  # Seconds, doubled on every retry (with full jitter)
+    'max_delay': 20.0,  # Cap for a single backoff sleep
+}
+
+# Organization scans (--organization): member accounts scanned through an assumed role
+ORG_CONFIG = {
+    'role_name': 'OrganizationAccountAccessRole',  # Role assumed in every member account
+    'session_name': 'aws-inventory-scanner',
+    'session_duration': 3600,  # Seconds; credentials are refreshed before they expire
+    'external_id': None,
+    'scan_workers': 16,  # (account, region) scans running in parallel
+}
+
+# Incremental scans (--incremental): state kept between runs
+INCREMENTAL_CONFIG = {
+    'state_file': 'exports/scan_state.json',
+    'detail_ttl': 6 * 3600,  # Seconds a cacheable detail lookup (Detail.cached) is reused while its listing item is unchanged
+    # Seconds between listings of slow-changing services; inside the interval they are restored from state
+    'refresh_intervals': {
+        'iam_resources': 6 * 3600,
+        'route53_zones': 6 * 3600,
+        'key_pairs': 3 * 3600,
+    },
+}
+
+# Checkpoint journal of running scans (--resume)
+CHECKPOINT_CONFIG = {
+    'directory': 'exports/journal',
+    'keep_finished': False,  # Keep the journal of scans that completed
+}
+
+# Scan daemon (--daemon): inventory kept in memory and served over a local HTTP/JSON API
+DAEMON_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8787,
+    'refresh_interval': 900,  # Seconds between listings of a service
+    # Per-service overrides: fast-moving compute more often, slow-changing services less
+    'refresh_intervals': {
+        'ec2_instances': 300,
+        'auto_scaling_groups': 300,
+        'ecs_clusters': 300,
+        'iam_resources': 6 * 3600,
+        'route53_zones': 6 * 3600,
+        'key_pairs': 3 * 3600,
+    },
+    'tick': 5,  # Seconds between checks for services due for a refresh
+    'cache_entries': 256,  # Encoded responses kept until the next refresh
+}
+
+# Largest page size each listing API accepts, keyed by "<service>.<operation>"
+# (fewer round trips on big accounts; operations without a limit parameter are omitted)
+PAGE_SIZES = {
+    'ec2.describe_instances': 1000,
+    'ec2.describe_vpcs': 1000,
+    'ec2.describe_security_groups': 1000,
+    'ec2.describe_volumes': 500,
+    'ec2.describe_nat_gateways': 1000,
+    'ec2.describe_internet_gateways': 1000,
+    's3.list_buckets': 10000,
+    'lambda.list_functions': 50,
+    'rds.describe_db_instances': 100,
+    'dynamodb.list_tables': 100,
+    'apigateway.get_rest_apis': 500,
+    'apigatewayv2.get_apis': '500',  # Modeled as a string by the API
+    'iam.list_users': 1000,
+    'iam.list_roles': 1000,
+    'sqs.list_queues': 1000,
+    'cloudwatch.describe_alarms': 100,
+    'route53.list_hosted_zones': '100',  # Modeled as a string by the API
+    'elb.describe_load_balancers': 400,
+    'elbv2.describe_load_balancers': 400,
+    'autoscaling.describe_auto_scaling_groups': 100,
+    'ecr.describe_repositories': 1000,
+    'ecr.describe_images': 1000,
+    'ecs.list_clusters': 100,
+    'secretsmanager.list_secrets': 100,
+}
+
+# Native API filters used by --filter, keyed by "<service>.<operation>": condition -> API filter name
+# ('tag' conditions become tag:<key> / tag-key filters). Conditions a listing cannot push down (all of
+# them for listings without an entry) are checked client-side by ScanFilter.matches on the typed
+# fields of its resources (status, tags, vpc).
+FILTER_PUSHDOWN = {
+    'ec2.describe_instances': {'tag': 'tag', 'state': 'instance-state-name', 'vpc': 'vpc-id'},
+    'ec2.describe_vpcs': {'tag': 'tag', 'state': 'state', 'vpc': 'vpc-id'},
+    'ec2.describe_security_groups': {'tag': 'tag', 'vpc': 'vpc-id'},
+    'ec2.describe_key_pairs': {'tag': 'tag'},
+    'ec2.describe_volumes': {'tag': 'tag', 'state': 'status'},
+    'ec2.describe_addresses': {'tag': 'tag'},
+    'ec2.describe_nat_gateways': {'tag': 'tag', 'state': 'state', 'vpc': 'vpc-id'},
+    'ec2.describe_internet_gateways': {'tag': 'tag', 'state': 'attachment.state', 'vpc': 'attachment.vpc-id'},
+}
+
 # Output configuration
 OUTPUT_CONFIG = {
     'show_executive_summary': True,
     'show_detailed_results': True,
     'use_emojis': True,
     'show_timestamps': True,
+    'columnar_row_group_size': 50000,  # Resources per Parquet row group / Arrow record batch
+    'columnar_compression': 'zstd',
+    'html_inline_limit': 200,  # Bigger services are shown as a virtualized table in the HTML report
+    'profile_rows': 25,  # Collectors listed in the --profile-scan table
+}
+
+# SQLite inventory history (--store)
+STORE_CONFIG = {
+    'path': 'exports/inventory.db',
+}
+
+# Metrics of scheduled scans (--metrics-file / --otlp-endpoint)
+METRICS_CONFIG = {
+    'textfile': 'exports/aws_inventory.prom',  # Read by the node_exporter textfile collector
+    'otlp_endpoint': 'http://localhost:4318',  # OTLP/HTTP collector
+    'service_name': 'aws-inventory-scanner',
+    'latency_buckets': [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30],  # API call latency, seconds
+}
+
+# Scan comparison (--compare / --compare-stored)
+DIFF_CONFIG = {
+    'ignore_fields': ['messages', 'items'],  # Counters that change between any two scans (SQS messages, DynamoDB items)
 }
 
 # Regions to scan (for multi-region scanning)
@@ -61,8 +191,3 @@ REGIONS_TO_SCAN = [
     'ap-southeast-1', # Singapore
 ]
 
-# Services that are global (not region-specific)
-GLOBAL_SERVICES = [
-    'route53_zones',
-    'iam_resources',
-]
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+import json
+from datetime import datetime
+from html import escape
+from config import OUTPUT_CONFIG
+
+PAGE_HEAD = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AWS Resources Report - {generated}</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
+        .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
+        h1 {{ color: #232f3e; text-align: center; }}
+        h2 {{ color: #ff9900; border-bottom: 2px solid #ff9900; padding-bottom: 5px; }}
+        .summary {{ background: #e8f4fd; padding: 15px; border-radius: 5px; margin-bottom: 20px; }}
+        .resource-group {{ margin-bottom: 30px; }}
+        .resource-group > summary {{ cursor: pointer; font-size: 1.17em; font-weight: bold; margin: 1em 0; }}
+        .resource-item {{ background: #f9f9f9; margin: 5px 0; padding: 10px; border-left: 4px solid #ff9900; }}
+        .status-active {{ border-left-color: #28a745; }}
+        .status-terminated {{ border-left-color: #dc3545; }}
+        .status-stopped {{ border-left-color: #ffc107; }}
+        .resource-id {{ font-weight: bold; color: #232f3e; }}
+        .resource-details {{ color: #666; font-size: 0.9em; margin-top: 5px; }}
+        .timestamp {{ text-align: center; color: #666; margin-top: 20px; }}
+        table {{ width: 100%; border-collapse: collapse; margin-top: 10px; }}
+        th, td {{ padding: 8px; text-align: left; border-bottom: 1px solid #ddd; }}
+        th {{ background-color: #f2f2f2; }}
+        .vtable-filter {{ width: 100%; padding: 6px; margin-top: 5px; box-sizing: border-box; }}
+        .vtable-viewport {{ height: {viewport_height}px; overflow-y: auto; position: relative; border: 1px solid #ddd; margin-top: 5px; }}
+        .vtable-rows {{ position: absolute; left: 0; right: 0; }}
+        .vtable-row {{ display: grid; grid-template-columns: 25% 45% 15% 15%; height: {row_height}px; line-height: {row_height}px; border-bottom: 1px solid #eee; font-size: 0.9em; }}
+        .vtable-row span {{ overflow: hidden; white-space: nowrap; text-overflow: ellipsis; padding: 0 6px; }}
+        .vtable-header {{ font-weight: bold; background-color: #f2f2f2; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>🔍 AWS Resources Report</h1>
+"""
+
+PAGE_TAIL = """
+        <div class="timestamp">
+            <p>Relatório gerado em: {generated}</p>
+        </div>
+    </div>
+    <script>
+    // Large services: rows come from an embedded JSON blob, parsed when the section is first
+    // opened, and only the rows inside the viewport are turned into DOM nodes.
+    (function () {{
+        var ROW_HEIGHT = {row_height};
+        function esc(value) {{
+            return String(value).replace(/[&<>"]/g, function (c) {{
+                return {{'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}}[c];
+            }});
+        }}
+        function setup(section) {{
+            var rows = JSON.parse(document.getElementById(section.dataset.source).textContent);
+            var viewport = section.querySelector('.vtable-viewport');
+            var spacer = section.querySelector('.vtable-spacer');
+            var body = section.querySelector('.vtable-rows');
+            var visible = rows;
+            function render() {{
+                var first = Math.floor(viewport.scrollTop / ROW_HEIGHT);
+                var count = Math.ceil(viewport.clientHeight / ROW_HEIGHT) + 1;
+                var html = '';
+                for (var i = first; i < Math.min(first + count, visible.length); i++) {{
+                    var r = visible[i];
+                    html += '<div class="vtable-row"><span title="' + esc(r[0]) + '">' + esc(r[0]) + '</span><span title="' +
+                        esc(r[1]) + '">' + esc(r[1]) + '</span><span>' + esc(r[2]) + '</span><span>' + esc(r[3]) + '</span></div>';
+                }}
+                body.style.top = (first * ROW_HEIGHT) + 'px';
+                body.innerHTML = html;
+            }}
+            function resize() {{
+                spacer.style.height = (visible.length * ROW_HEIGHT) + 'px';
+                render();
+            }}
+            section.querySelector('.vtable-filter').addEventListener('input', function (event) {{
+                var needle = event.target.value.toLowerCase();
+                visible = needle ? rows.filter(function (r) {{ return r.join(' ').toLowerCase().indexOf(needle) >= 0; }}) : rows;
+                viewport.scrollTop = 0;
+                resize();
+            }});
+            viewport.addEventListener('scroll', render);
+            resize();
+        }}
+        document.querySelectorAll('details.vtable').forEach(function (section) {{
+            section.addEventListener('toggle', function () {{
+                if (section.open && !section.dataset.ready) {{
+                    section.dataset.ready = '1';
+                    setup(section);
+                }}
+            }});
+        }});
+    }})();
+    </script>
+</body>
+</html>
+"""
+
+RESOURCE_ITEM = """
+            <div class="resource-item {status_class}">
+                <div class="resource-id">{id}</div>
+                <div class="resource-details">{extra}</div>
+                {status}
+            </div>
+"""
+
+VIRTUAL_SECTION = """
+        <details class="resource-group vtable" data-source="{source}">
+            <summary>🔹 {service} ({count} recursos)</summary>
+            <input class="vtable-filter" type="search" placeholder="Filtrar {service}...">
+            <div class="vtable-row vtable-header"><span>ID</span><span>Detalhes</span><span>Status</span><span>Região</span></div>
+            <div class="vtable-viewport">
+                <div class="vtable-spacer"></div>
+                <div class="vtable-rows"></div>
+            </div>
+        </details>
+"""
+
+def _json_script(rows):
+    """JSON text that is safe inside a <script> element"""
+    return json.dumps(rows, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+class HTMLReportWriter:
+    """Write the HTML report straight to a file handle, chunk by chunk
+
+    Services up to `inline_limit` resources are rendered as before, one card per resource.
+    Bigger services become a collapsed section with a filterable, virtualized table whose rows
+    are embedded as one compact JSON array, so the page stays light however big the inventory.
+    """
+
+    def __init__(self, resources_data, inline_limit=None, row_height=28, viewport_height=480):
+        self.resources_data = resources_data
+        self.inline_limit = OUTPUT_CONFIG['html_inline_limit'] if inline_limit is None else inline_limit
+        self.row_height = row_height
+        self.viewport_height = viewport_height
+
+    def write(self, f):
+        generated = datetime.now()
+        total_resources = sum(len(resources) for resources in self.resources_data.values())
+
+        f.write(PAGE_HEAD.format(generated=generated.strftime('%Y-%m-%d %H:%M'), row_height=self.row_height,
+                                 viewport_height=self.viewport_height))
+        f.write(f"""
+        <div class="summary">
+            <h2>📊 Resumo Executivo</h2>
+            <p><strong>Total de recursos encontrados:</strong> {total_resources}</p>
+            <ul>
+""")
+        for service, resources in self.resources_data.items():
+            if resources:
+                f.write(f"                <li><strong>{escape(service)}:</strong> {len(resources)} recursos</li>\n")
+        f.write("""
+            </ul>
+        </div>
+
+        <h2>📋 Detalhamento por Serviço</h2>
+""")
+
+        large = []
+        for service, resources in self.resources_data.items():
+            if not resources:
+                continue
+            if len(resources) > self.inline_limit:
+                source = f"resources-{len(large)}"
+                large.append((source, resources))
+                f.write(VIRTUAL_SECTION.format(source=source, service=escape(service), count=len(resources)))
+            else:
+                self._write_inline(f, service, resources)
+
+        # Data blobs go after the visible content so the page renders before they are parsed
+        for source, resources in large:
+            f.write(f'\n        <script type="application/json" id="{source}">[')
+            for index, resource in enumerate(resources):
+                row = [str(resource['id']), resource['extra'] or '', resource['status'] or '', resource.get('region') or '']
+                f.write(('' if index == 0 else ',') + _json_script(row))
+            f.write(']</script>\n')
+
+        f.write(PAGE_TAIL.format(generated=generated.strftime('%Y-%m-%d %H:%M:%S'), row_height=self.row_height))
+
+    def _write_inline(self, f, service, resources):
+        f.write(f"""
+        <div class="resource-group">
+            <h3>🔹 {escape(service)} ({len(resources)} recursos)</h3>
+""")
+        for resource in resources:
+            status = resource['status']
+            status_line = ''
+            if status and status != 'active':
+                status_line = f'<div class="resource-details"><strong>Status:</strong> {escape(status)}</div>'
+            f.write(RESOURCE_ITEM.format(
+                status_class=f"status-{escape(status.lower())}" if status else "",
+                id=escape(str(resource['id'])),
+                extra=escape(resource['extra']),
+                status=status_line,
+            ))
+        f.write("        </div>\n")
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+from resource_model import Resource
+
+# Fields a query can hold; each has a hash index
+QUERY_FIELDS = ('id', 'service', 'region', 'status', 'vpc', 'account', 'tag')
+
+def parse_query(expression):
+    """[(field, tag key or None, values)] of 'service=EC2 and status=stopped,running and tag:team=data'
+
+    Conditions joined by 'and' must all match; comma-separated values are alternatives and
+    'tag:KEY' alone requires the tag to be present.
+    """
+    conditions = []
+    for part in expression.replace(' AND ', ' and ').split(' and '):
+        part = part.strip()
+        if not part:
+            continue
+        name, has_value, value = part.partition('=')
+        field, _, tag_key = name.strip().partition(':')
+        values = [v.strip() for v in value.split(',') if v.strip()]
+        if field not in QUERY_FIELDS or (field == 'tag') != bool(tag_key) or (has_value and not values):
+            raise ValueError(f"invalid condition '{part}' (fields: {', '.join(QUERY_FIELDS)}; use FIELD=VALUE or tag:KEY=VALUE)")
+        if not values and field != 'tag':
+            raise ValueError(f"condition '{part}' needs a value")
+        conditions.append((field, tag_key or None, values))
+    if not conditions:
+        raise ValueError('empty query')
+    return conditions
+
+# Fields with a value index, in the order Inventory.add reads them
+_INDEXED = ('id', 'service', 'region', 'status', 'vpc', 'account')
+
+def _norm(value):
+    return str(value).lower()
+
+def _numbers(index, value):
+    numbers = index.get(value, ())
+    return {numbers} if type(numbers) is int else set(numbers) if not numbers else numbers
+
+class Inventory:
+    """Scan results with hash indexes on id, service, region, status, VPC, account and tags
+
+    Resources are numbered once and every index maps a (lower-cased) value to the set of
+    resource numbers holding it, so a query intersects the sets of its conditions, smallest
+    first, instead of walking every resource. A value held by a single resource (most ids)
+    maps to the bare number, which keeps hundreds of thousands of one-element sets away from
+    the garbage collector. Works on Resource objects and on the plain dicts of loaded exports.
+    """
+
+    def __init__(self, resources=None):
+        self.resources = {}
+        self._items = []
+        self._index = {field: {} for field in _INDEXED}
+        self._indexes = tuple(self._index.values())
+        self._tags = {}  # tag key -> {value: numbers}
+        self._tag_keys = {}  # tag key -> numbers
+        for service, items in (resources or {}).items():
+            for resource in items:
+                self.add(service, resource)
+
+    @classmethod
+    def from_scan(cls, source):
+        """Inventory of a scan: a service -> resources dict or a JSON/NDJSON(.gz) export"""
+        from scan_diff import iter_scan
+
+        inventory = cls()
+        for service, resource in iter_scan(source):
+            inventory.add(service, resource)
+        return inventory
+
+    def add(self, service, resource):
+        number = len(self._items)
+        self._items.append((service, resource))
+        self.resources.setdefault(service, []).append(resource)
+
+        if isinstance(resource, Resource):
+            # Slots are read directly: item access renders and searches attributes
+            values = (resource.id, service, resource.region, resource.status, resource.attr('vpc'), resource.account)
+            tags = resource.tags
+        else:
+            get = resource.get
+            values = (get('id'), service, get('region'), get('status'), get('vpc'), get('account'))
+            tags = get('tags')
+        for index, value in zip(self._indexes, values):
+            if value:
+                value = str(value).lower()
+                numbers = index.get(value)
+                if numbers is None:
+                    index[value] = number  # Promoted to a set on the second resource
+                elif type(numbers) is int:
+                    index[value] = {numbers, number}
+                else:
+                    numbers.add(number)
+        if tags:
+            for key, value in tags.items():
+                self._tag_keys.setdefault(key, set()).add(number)
+                self._tags.setdefault(key, {}).setdefault(str(value).lower(), set()).add(number)
+
+    def __len__(self):
+        return len(self._items)
+
+    # ========== QUERIES ==========
+
+    def get(self, resource_id):
+        """(service, resource) pairs with this id (ids can repeat across regions and accounts)"""
+        return [self._items[number] for number in sorted(_numbers(self._index['id'], _norm(resource_id)))]
+
+    def service_names(self, value):
+        """Services a service condition refers to: the exact name, otherwise every name starting with it"""
+        value = _norm(value)
+        names = self._index['service']
+        if value in names:
+            return [value]
+        return [name for name in names if name.startswith(value)]
+
+    def _matches(self, field, tag_key, values):
+        """Numbers of the resources satisfying one condition"""
+        if field == 'tag':
+            if not values:
+                return self._tag_keys.get(tag_key, set())
+            index = self._tags.get(tag_key, {})
+        else:
+            index = self._index[field]
+        if field == 'service':
+            values = [name for value in values for name in self.service_names(value)]
+        sets = [_numbers(index, _norm(value)) for value in values]
+        return sets[0] if len(sets) == 1 else set().union(*sets)
+
+    def select(self, conditions):
+        """(service, resource) pairs matching every condition, in scan order"""
+        sets = sorted((self._matches(*condition) for condition in conditions), key=len)
+        if not sets:
+            return list(self._items)
+        numbers = sets[0].intersection(*sets[1:]) if len(sets) > 1 else sets[0]
+        return [self._items[number] for number in sorted(numbers)]
+
+    def query(self, expression):
+        """select() for a query expression (see parse_query)"""
+        return self.select(parse_query(expression))
+
+    def count_by(self, field):
+        """Lower-cased value -> number of resources, for an indexed field"""
+        return {value: 1 if type(numbers) is int else len(numbers) for value, numbers in self._index[field].items()}
+
+def print_query_results(results, elapsed_ms=None):
+    """Print the resources a query matched"""
+    print("\n" + "="*60)
+    print("🔎 RESULTADO DA CONSULTA")
+    print("="*60)
+    for service, resource in results:
+        extra = resource.extra if isinstance(resource, Resource) else resource.get('extra', '')
+        location = '/'.join(filter(None, (resource.get('account'), resource.get('region'))))
+        print(f"  {service:<24} {resource['id']:<40} {resource.get('status', ''):<12} {location}")
+        if extra:
+            print(f"     └─ {extra}")
+    timing = f" em {elapsed_ms:.2f} ms" if elapsed_ms is not None else ""
+    print(f"\n📈 {len(results)} recursos encontrados{timing}")
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+import json
+import os
+import sqlite3
+from datetime import datetime
+from config import STORE_CONFIG
+from resource_model import Resource, json_default
+from scan_diff import comparable_fields, content_hash, field_deltas, is_text_only
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scanned_at TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    regions TEXT NOT NULL,
+    total_resources INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_scans_profile_time ON scans (profile, scanned_at);
+
+CREATE TABLE IF NOT EXISTS resources (
+    scan_id INTEGER NOT NULL REFERENCES scans (id) ON DELETE CASCADE,
+    service TEXT NOT NULL,
+    region TEXT NOT NULL,
+    resource_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    extra TEXT NOT NULL,
+    account TEXT NOT NULL DEFAULT '',
+    record TEXT  -- Typed fields (Resource.to_record() JSON); NULL for rows stored before them
+);
+-- Scan lookups and scan-to-scan comparisons join on (scan_id, service, region, resource_id) and the account
+CREATE INDEX IF NOT EXISTS idx_resources_scan ON resources (scan_id, service, region, resource_id);
+CREATE INDEX IF NOT EXISTS idx_resources_service_region ON resources (service, region);
+CREATE INDEX IF NOT EXISTS idx_resources_resource_id ON resources (resource_id);
+"""
+
+class InventoryStore:
+    """SQLite inventory history: one row per resource per scan
+
+    Scans are appended in a single transaction and every query (a scan's inventory, what
+    existed at a date, the history of a resource, the changes between two scans) runs as
+    indexed SQL and streams rows, so large histories never have to be loaded in memory.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or STORE_CONFIG['path']
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Add the account and record columns to histories created before multi-account scans and typed records"""
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(resources)")}
+        with self.conn:
+            if 'account' not in columns:
+                self.conn.execute("ALTER TABLE resources ADD COLUMN account TEXT NOT NULL DEFAULT ''")
+            if 'record' not in columns:
+                self.conn.execute("ALTER TABLE resources ADD COLUMN record TEXT")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ========== WRITING ==========
+
+    def save_scan(self, resources_data, profile=None, regions=(), scanned_at=None):
+        """Store a scan (service -> list of resources) and return its id"""
+        scanned_at = (scanned_at or datetime.now()).isoformat(timespec='seconds')
+        default_region = regions[0] if len(regions) == 1 else ''
+        rows = (
+            (service, resource.get('region') or default_region, str(resource['id']),
+             resource.get('status') or '', resource.get('extra') or '', resource.get('account') or '',
+             _record_json(resource))
+            for service, resources in resources_data.items()
+            for resource in resources
+        )
+
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO scans (scanned_at, profile, regions) VALUES (?, ?, ?)",
+                (scanned_at, profile or 'default', ','.join(regions)),
+            )
+            scan_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO resources (scan_id, service, region, resource_id, status, extra, account, record) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((scan_id, *row) for row in rows),
+            )
+            self.conn.execute(
+                "UPDATE scans SET total_resources = (SELECT COUNT(*) FROM resources WHERE scan_id = ?) WHERE id = ?",
+                (scan_id, scan_id),
+            )
+        return scan_id
+
+    def delete_scans_before(self, date):
+        """Drop scans older than a date (datetime or ISO string); returns how many were removed"""
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM scans WHERE scanned_at < ?", (_iso(date),))
+        return cursor.rowcount
+
+    # ========== SCANS ==========
+
+    def list_scans(self, profile=None):
+        """Stored scans, oldest first"""
+        query = "SELECT * FROM scans"
+        params = ()
+        if profile is not None:
+            query += " WHERE profile = ?"
+            params = (profile,)
+        return [dict(row) for row in self.conn.execute(query + " ORDER BY id", params)]
+
+    def latest_scan_id(self, profile=None, before_id=None):
+        """Id of the newest scan (of a profile, older than before_id), or None"""
+        query = "SELECT MAX(id) FROM scans WHERE 1=1"
+        params = []
+        if profile is not None:
+            query += " AND profile = ?"
+            params.append(profile)
+        if before_id is not None:
+            query += " AND id < ?"
+            params.append(before_id)
+        return self.conn.execute(query, params).fetchone()[0]
+
+    def scan_at(self, date, profile=None):
+        """Id of the last scan taken at or before a date (datetime or ISO string), or None"""
+        query = "SELECT id FROM scans WHERE scanned_at <= ?"
+        params = [_iso(date)]
+        if profile is not None:
+            query += " AND profile = ?"
+            params.append(profile)
+        row = self.conn.execute(query + " ORDER BY scanned_at DESC, id DESC LIMIT 1", params).fetchone()
+        return row[0] if row else None
+
+    # ========== RESOURCES ==========
+
+    def iter_resources(self, scan_id, service=None, region=None):
+        """Stream the resources of a scan as dicts, optionally for one service and/or region"""
+        query = "SELECT service, region, resource_id, status, extra, account, record FROM resources WHERE scan_id = ?"
+        params = [scan_id]
+        if service is not None:
+            query += " AND service = ?"
+            params.append(service)
+        if region is not None:
+            query += " AND region = ?"
+            params.append(region)
+
+        for row in self.conn.execute(query + " ORDER BY rowid", params):
+            yield row['service'], _resource(row)
+
+    def load_scan(self, scan_id):
+        """A stored scan in the lister's service -> list of resources format"""
+        resources_data = {}
+        for service, resource in self.iter_resources(scan_id):
+            resources_data.setdefault(service, []).append(resource)
+        return resources_data
+
+    def as_of(self, date, profile=None):
+        """Inventory as it was recorded by the last scan at or before a date"""
+        scan_id = self.scan_at(date, profile)
+        return self.load_scan(scan_id) if scan_id is not None else {}
+
+    def history(self, resource_id, service=None):
+        """Every recorded state of a resource, oldest scan first"""
+        query = """
+            SELECT s.id AS scan_id, s.scanned_at, r.service, r.account, r.region, r.resource_id, r.status, r.extra
+            FROM resources r JOIN scans s ON s.id = r.scan_id
+            WHERE r.resource_id = ?
+        """
+        params = [resource_id]
+        if service is not None:
+            query += " AND r.service = ?"
+            params.append(service)
+        return [dict(row) for row in self.conn.execute(query + " ORDER BY s.id", params)]
+
+    # ========== COMPARISON ==========
+
+    def compare(self, scan_id, previous_id, ignore_fields=None):
+        """Changes between two stored scans, in the same format as scan_diff.diff_scans
+
+        Added and removed resources are found in SQL; the resources present in both scans are
+        compared on the same fields as --compare (scan_diff.comparable_fields, honouring
+        DIFF_CONFIG['ignore_fields']), using the typed records stored with them.
+        """
+        changes = {'added': {}, 'removed': {}, 'modified': {}}
+        for bucket, newer, older in (('added', scan_id, previous_id), ('removed', previous_id, scan_id)):
+            for row in self.conn.execute(_MISSING_QUERY, (newer, older)):
+                changes[bucket].setdefault(row['service'], []).append(_resource(row))
+        for row in self.conn.execute(_COMMON_QUERY, (previous_id, scan_id)):
+            if row['record'] == row['old_record'] and row['extra'] == row['old_extra'] \
+                    and row['status'] == row['old_status']:
+                continue
+            current, previous = _resource(row), _resource(row, prefix='old_')
+            text_only = is_text_only(previous)
+            current_fields = comparable_fields(current, ignore_fields, text_only=text_only)
+            previous_fields = comparable_fields(previous, ignore_fields, text_only=text_only)
+            if content_hash(current_fields) != content_hash(previous_fields):
+                deltas = field_deltas(previous_fields, current_fields)
+                changes['modified'].setdefault(row['service'], []).append({**current, 'changes': deltas})
+        return changes
+
+# Resources of one scan without a resource of the same service, account, region and id in another scan
+_MISSING_QUERY = """
+    SELECT a.service, a.region, a.resource_id, a.status, a.extra, a.account, a.record
+    FROM resources a
+    WHERE a.scan_id = ?
+      AND NOT EXISTS (
+          SELECT 1 FROM resources b
+          WHERE b.scan_id = ? AND b.service = a.service AND b.region = a.region AND b.resource_id = a.resource_id
+            AND b.account = a.account
+      )
+    ORDER BY a.rowid
+"""
+
+# Resources present in both scans, with both versions (identical rows are skipped before comparing fields)
+_COMMON_QUERY = """
+    SELECT a.service, a.region, a.resource_id, a.status, a.extra, a.account, a.record,
+           b.status AS old_status, b.extra AS old_extra, b.record AS old_record
+    FROM resources a
+    JOIN resources b
+      ON b.scan_id = ? AND b.service = a.service AND b.region = a.region AND b.resource_id = a.resource_id
+     AND b.account = a.account
+    WHERE a.scan_id = ?
+    ORDER BY a.rowid
+"""
+
+def _record_json(resource):
+    if isinstance(resource, Resource):
+        return json.dumps(resource.to_record(), ensure_ascii=False, default=json_default)
+    return None  # Plain dicts of older exports only carry the text columns
+
+def _resource(row, prefix=''):
+    """Resource dict of a row: the typed record's export view, or the text columns of older rows"""
+    record = row[prefix + 'record']
+    if record:
+        resource = Resource.from_record(row['service'], json.loads(record))
+        resource.region = resource.region or row['region']
+        return resource.to_dict()
+    resource = {'id': row['resource_id'], 'extra': row[prefix + 'extra'], 'status': row[prefix + 'status'],
+                'region': row['region']}
+    if row['account']:
+        resource['account'] = row['account']
+    return resource
+
+def _iso(date):
+    return date.isoformat(timespec='seconds') if isinstance(date, datetime) else str(date)
@@ -1,561 +1,852 @@
 #!/usr/bin/env python3
-import boto3
+import asyncio
 import json
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
 from datetime import datetime
 from botocore.exceptions import ClientError, NoCredentialsError
+from config import SCAN_CONFIG, PAGE_SIZES
+from aws_clients import ClientRegistry, filter_parameter, pagination_spec, next_page_params
+from throttling import AdaptiveThrottle
+from scan_state import fingerprint
+from resource_model import Resource
+from collectors import COLLECTORS, enabled_services, schedule
+
+# A per-resource detail call looked up once its collector's listings are done (result_key paginates and returns the items)
+# cached names the result fields an incremental scan may reuse while the listing item is unchanged; only
+# lookups whose answer cannot change without the item changing set it (counts and statuses never do)
+Detail = namedtuple('Detail', 'client operation params result_key regional cached', defaults=(None, True, ()))
+
+# Collector being run in the current thread/task (position for ordering, region tag for resources)
+_collector_position = ContextVar('collector_position', default=None)
+_collector_region = ContextVar('collector_region', default=None)
+# Key of that collector, so the details it queues are profiled with it
+_collector_key = ContextVar('collector_key', default=None)
+
+# Fingerprint of the listing item being handled, so incremental scans can reuse its detail results
+_item_fingerprint = ContextVar('item_fingerprint', default=None)
+
+# (service, resource) added by the item being handled and not yet written to the sinks
+_pending_resources = ContextVar('pending_resources', default=None)
+
+# Scan filter conditions the listing being handled could not push down, checked on each resource it adds
+_listing_conditions = ContextVar('listing_conditions', default=None)
 
 class AWSResourceLister:
-    def __init__(self, region='us-east-1'):
+    # Collector registry (collectors.py): keys match SERVICES_CONFIG, methods are list_<key>
+    COLLECTORS = COLLECTORS
+
+    # Whether resources are tagged with more than one region in the output
+    multi_region = False
+
+    def __init__(self, region='us-east-1', max_workers=None, include_global=True, profile=None, clients=None,
+                 shallow=False, enrichment_workers=None, backend='threads', throttle=None, state=None, sinks=(),
+                 profiler=None, scan_filter=None, services=None, account=None, journal=None):
         self.region = region
+        self.max_workers = max_workers or SCAN_CONFIG['max_workers']
+        self.include_global = include_global
+        self.shallow = shallow
+        self.enrichment_workers = enrichment_workers or SCAN_CONFIG['enrichment_workers']
+        self.backend = backend
+        self.profile = profile
+        # Account id the resources are tagged with (organization scans)
+        self.account = account
+        # Collector and enrichment threads run at the same time and share the clients
+        self.clients = clients or ClientRegistry(max_pool_connections=self.max_workers + self.enrichment_workers)
+        self.throttle = throttle or AdaptiveThrottle()
+        self.state = state
+        self.journal = journal
+        self.sinks = list(sinks)
+        self.profiler = profiler
+        if profiler is not None:
+            self.throttle.listener = profiler.record
+        self.scan_filter = scan_filter
+        # Collector keys to run; None follows SERVICES_CONFIG at scan time
+        self.services = services
         self.all_resources = {}
+        self._lock = threading.Lock()
+        self._service_rank = {}
+        self._enrichments = []
+        self._collected = set()
+        # Collectors whose resources came from the resumed journal or the incremental state
+        self._restored = set()
+        # Collectors with queued detail lookups, journaled once their details have been looked up
+        self._enriching = set()
+        # Enrichment pool the collectors of a threaded scan share
+        self._enrichment_pool = None
         
-    def add_resource(self, service, resource_id, extra="", status=""):
-        if service not in self.all_resources:
-            self.all_resources[service] = []
+    def add_resource(self, service, resource_id, status="", **fields):
+        """Record a resource; fields are Resource fields (type, size, created...) or service-specific attributes"""
+        resource_info = Resource(service, resource_id, status, _collector_region.get() or self.region,
+                                 account=self.account, **fields)
+        return self._add(service, resource_info)
+
+    def _add(self, service, resource_info):
+        conditions = _listing_conditions.get()
+        if conditions:
+            # 'unknown' statuses are filled in by the collector's details and checked once they are applied
+            if resource_info.status == 'unknown':
+                conditions = [condition for condition in conditions if condition[0] != 'state']
+            if not self.scan_filter.matches(resource_info, conditions):
+                return None
         
-        resource_info = {
-            'id': resource_id,
-            'extra': extra,
-            'status': status
-        }
-        self.all_resources[service].append(resource_info)
+        with self._lock:
+            if service not in self.all_resources:
+                self.all_resources[service] = []
+                # Rank services by the collector that produced them so parallel scans keep a stable order
+                position = _collector_position.get()
+                if position is None:
+                    position = len(self.COLLECTORS)
+                siblings = sum(1 for rank in self._service_rank.values() if rank[0] == position)
+                self._service_rank[service] = (position, siblings)
+            self.all_resources[service].append(resource_info)
+        
+        if self.profiler is not None:
+            self.profiler.record('resources')
+        
+        if self.sinks:
+            pending = _pending_resources.get()
+            if pending is None:
+                self.emit([(service, resource_info)])
+            else:
+                pending.append((service, resource_info))
+        
+        return resource_info
 
-    def safe_call(self, func, service_name):
-        """Safely call AWS API with error handling"""
+    def emit(self, resources):
+        """Write finished resources to every sink"""
+        for service, resource in resources:
+            if self.scan_filter and not self.scan_filter.matches(resource, self.scan_filter.state_conditions):
+                continue
+            for sink in self.sinks:
+                sink.write(service, resource)
+
+    def enrich(self, service_name, detail, apply, *args):
+        """Queue a detail call, run when the collector's listings are done; apply(result, *args) updates the resource"""
+        if self.shallow or any(arg is None for arg in args):
+            return  # No details wanted, or the resource was dropped by the scan filter
+        
+        if self.state is not None and detail.cached:
+            scope = self.state_scope(detail.regional)
+            item_fingerprint = _item_fingerprint.get()
+            cached = self.state.cached_detail(scope, detail, item_fingerprint)
+            if cached is not None:
+                try:
+                    apply(cached, *args)
+                    return
+                except Exception:
+                    pass  # Unusable cached result, look it up again
+            apply = self._recording_apply(scope, detail, item_fingerprint, apply)
+        
+        # Resources of the current item reach the sinks once their details are applied
+        pending = _pending_resources.get()
+        deferred = list(pending or ())
+        if pending:
+            pending.clear()
+        
+        with self._lock:
+            self._enrichments.append((service_name, detail, apply, args, deferred, _collector_key.get()))
+            self._enriching.add(_collector_key.get())
+
+    def _recording_apply(self, scope, detail, item_fingerprint, apply):
+        """Wrap apply() so the fetched result is also stored in the incremental state"""
+        def _apply(result, *args):
+            apply(result, *args)
+            self.state.record_detail(scope, detail, item_fingerprint, result)
+        return _apply
+
+    def take_enrichments(self, key=None):
+        """Return and clear the queued enrichment tasks of a collector (of every collector when key
+        is None), interleaved across services
+
+        Round-robin order keeps the pool busy on every service at once, so one service
+        waiting on its rate limit does not hold all the workers.
+        """
+        with self._lock:
+            tasks = [task for task in self._enrichments if key is None or task[5] == key]
+            self._enrichments = [task for task in self._enrichments if key is not None and task[5] != key]
+        
+        by_service = {}
+        for task in tasks:
+            by_service.setdefault(task[0], []).append(task)
+        queues = list(by_service.values())
+        return [queue[i] for i in range(max(map(len, queues), default=0)) for queue in queues if i < len(queue)]
+
+    def run_enrichment(self, key=None):
+        """Run the queued detail lookups of a collector (of every collector when key is None) through
+        a bounded pool instead of one by one
+
+        A threaded scan shares one pool between its collectors; otherwise a pool is made for the call.
+        """
+        tasks = self.take_enrichments(key)
+        if not tasks:
+            return
+        
+        executor = self._enrichment_pool or ThreadPoolExecutor(max_workers=self.enrichment_workers,
+                                                               thread_name_prefix='enrich')
         try:
-            func()
-        except ClientError as e:
-            error_code = e.response['Error']['Code']
+            futures = [executor.submit(self._run_detail, detail, apply, args, deferred, key)
+                       for _, detail, apply, args, deferred, key in tasks]
+            for future in futures:
+                future.result()
+        finally:
+            if executor is not self._enrichment_pool:
+                executor.shutdown()
+
+    def _run_detail(self, detail, apply, args, deferred, key):
+        client = self.client(detail.client, detail.regional)
+        try:
+            with self.profile_scope(key, 'enrich'):
+                if detail.result_key:
+                    result = list(self.paginate(client, detail.operation, detail.result_key, **detail.params))
+                else:
+                    result = self.call(client, detail.operation, **detail.params)
+            apply(result, *args)
+        except Exception:
+            pass  # Keep the listing data when details are unavailable
+        finally:
+            self.emit(deferred)
+
+    def feed(self, handler, item):
+        """Pass a listing item (or page) to its handler, tagging the details it queues with the item's fingerprint"""
+        pending = [] if self.sinks else None
+        fingerprint_token = _item_fingerprint.set(fingerprint(item) if self.state is not None else None)
+        pending_token = _pending_resources.set(pending)
+        try:
+            handler(item)
+        finally:
+            _item_fingerprint.reset(fingerprint_token)
+            _pending_resources.reset(pending_token)
+            if pending:
+                self.emit(pending)
+
+    def client(self, service_name, regional=True):
+        """Return the shared boto3 client for this scan's profile and region"""
+        region = self.region if regional else None
+        client = self.clients.client(service_name, region=region, profile=self.profile)
+        if self.profiler is not None:
+            self.profiler.instrument(client)
+        return client
+
+    def call(self, client, operation, **params):
+        """Make one API call under the (service, region) rate limit, retrying throttling errors"""
+        key = (client.meta.service_model.service_name, client.meta.region_name)
+        return self.throttle.call(key, lambda: getattr(client, operation)(**params))
+
+    def listing_params(self, client, listing):
+        """Native filter parameters of a listing under the scan filter"""
+        if not self.scan_filter:
+            return {}
+        
+        api_filters, _ = self.scan_filter.pushdown(listing.client, listing.operation)
+        return {filter_parameter(client, listing.operation): api_filters} if api_filters else {}
+
+    def first_page_params(self, client, operation, spec, params):
+        """Request parameters of the first page, using the largest page size the API allows"""
+        params = dict(params)
+        page_size = PAGE_SIZES.get(f"{client.meta.service_model.service_name}.{operation}")
+        if spec and page_size and spec.get('limit_key'):
+            params.setdefault(spec['limit_key'], page_size)
+        return params
+
+    def paginate_pages(self, client, operation, result_key, checkpoint=None, **kwargs):
+        """Yield the items of each page of a listing as it arrives
+
+        Pages are requested one by one through call(), so a throttled page is retried
+        on its own instead of restarting (or losing) the whole listing. checkpoint(items,
+        next_params) is called with every page before it is yielded (next_params is None
+        on the last page).
+        """
+        spec = pagination_spec(client, operation)
+        params = self.first_page_params(client, operation, spec, kwargs)
+        while True:
+            response = self.call(client, operation, **params)
+            if self.profiler is not None:
+                self.profiler.record('pages')
+            items = response.get(result_key, [])
+            
+            next_params = next_page_params(spec, response) if spec else None
+            if next_params and all(params.get(name) == value for name, value in next_params.items()):
+                next_params = None  # Same token again: the listing is over
+            if checkpoint is not None:
+                checkpoint(items, next_params)
+            yield items
+            
+            if not next_params:
+                return
+            params.update(next_params)
+
+    def paginate(self, client, operation, result_key, **kwargs):
+        """Yield every item of a listing, page by page"""
+        for items in self.paginate_pages(client, operation, result_key, **kwargs):
+            yield from items
+
+    def report_error(self, error, service_name):
+        """Print a collector failure the same way for every backend"""
+        if isinstance(error, ClientError):
+            error_code = error.response['Error']['Code']
             if error_code in ['AccessDenied', 'UnauthorizedOperation']:
                 print(f"⚠️  Sem permissão para acessar {service_name}")
             else:
                 print(f"❌ Erro ao acessar {service_name}: {error_code}")
+        else:
+            print(f"❌ Erro inesperado em {service_name}: {str(error)}")
+
+    def safe_call(self, func, service_name):
+        """Safely call AWS API with error handling"""
+        try:
+            func()
         except Exception as e:
-            print(f"❌ Erro inesperado em {service_name}: {str(e)}")
+            self.report_error(e, service_name)
 
-    def list_ec2_instances(self):
-        def _list():
-            ec2 = boto3.client('ec2', region_name=self.region)
-            instances = ec2.describe_instances()
-            
-            for res in instances['Reservations']:
-                for inst in res['Instances']:
-                    instance_id = inst['InstanceId']
-                    instance_type = inst['InstanceType']
-                    state = inst['State']['Name']
-                    
-                    # Get tags
-                    tags = inst.get('Tags', [])
-                    name_tag = next((t['Value'] for t in tags if t['Key'] == 'Name'), 'Sem nome')
-                    
-                    # Launch time
-                    launch_time = inst.get('LaunchTime', '').strftime('%Y-%m-%d %H:%M') if inst.get('LaunchTime') else ''
-                    
-                    extra = f"{instance_type} | {name_tag} | {launch_time}"
-                    self.add_resource('EC2 Instances', instance_id, extra, state)
+    def collect(self, key):
+        """Run every listing of a collector and feed the items to its handlers"""
+        collector = self.COLLECTORS[key]
         
-        self.safe_call(_list, 'EC2 Instances')
-
-    def list_s3_buckets(self):
         def _list():
-            s3 = boto3.client('s3')
-            buckets = s3.list_buckets()
-            
-            for bucket in buckets['Buckets']:
-                bucket_name = bucket['Name']
-                creation_date = bucket['CreationDate'].strftime('%Y-%m-%d %H:%M')
-                
-                # Try to get bucket region
+            for index, listing in enumerate(collector.listings):
+                client = self.client(listing.client, listing.regional)
+                params = self.listing_params(client, listing)
+                handler = getattr(self, listing.handler)
+                pages, resume_params, checkpoint = self.resume_listing(key, index)
                 try:
-                    location = s3.get_bucket_location(Bucket=bucket_name)
-                    region = location['LocationConstraint'] or 'us-east-1'
-                except:
-                    region = 'unknown'
-                
-                extra = f"Criado: {creation_date} | Região: {region}"
-                self.add_resource('S3 Buckets', bucket_name, extra, 'active')
+                    for items in pages:
+                        self.feed_page(listing, handler, items)
+                    if resume_params is None:
+                        continue
+                    for items in self.paginate_pages(client, listing.operation, listing.result_key,
+                                                     checkpoint=checkpoint, **{**params, **resume_params}):
+                        self.feed_page(listing, handler, items)
+                except Exception:
+                    if not listing.optional:
+                        raise
+            self.mark_collected(key)
         
-        self.safe_call(_list, 'S3 Buckets')
+        self.safe_call(_list, collector.name)
 
-    def list_lambda_functions(self):
-        def _list():
-            lam = boto3.client('lambda', region_name=self.region)
-            funcs = lam.list_functions()
-            
-            for f in funcs['Functions']:
-                func_name = f['FunctionName']
-                runtime = f['Runtime']
-                memory = f['MemorySize']
-                last_modified = f['LastModified']
-                
-                extra = f"{runtime} | {memory}MB | Modificado: {last_modified}"
-                self.add_resource('Lambda Functions', func_name, extra, 'active')
+    def feed_page(self, listing, handler, items):
+        """Pass a page to the handler of a batch listing, or each of its items to the item handler"""
+        residual = self.scan_filter.pushdown(listing.client, listing.operation)[1] if self.scan_filter else None
+        token = _listing_conditions.set(residual)
+        try:
+            if listing.batch:
+                self.feed(handler, items)
+            else:
+                for item in items:
+                    self.feed(handler, item)
+        finally:
+            _listing_conditions.reset(token)
+
+    def resume_listing(self, key, index):
+        """(journaled pages, parameters to continue from, page checkpoint) of a collector's listing
+
+        Without a journal there is nothing to replay. The parameters are None when the journaled
+        scan had already read the whole listing.
+        """
+        if self.journal is None:
+            return [], {}, None
+        
+        scope = self.state_scope(self.COLLECTORS[key].regional)
+        pages, resume_params = self.journal.listing_pages(scope, key, index)
         
-        self.safe_call(_list, 'Lambda Functions')
+        def _checkpoint(items, next_params):
+            self.journal.record_page(scope, key, index, items, next_params)
+        return pages, resume_params, _checkpoint
+
+    def mark_collected(self, key):
+        """Record that every listing of a collector completed, so its result can be saved as state"""
+        with self._lock:
+            self._collected.add(key)
+            enriching = key in self._enriching
+        if self.journal is not None and not enriching:
+            self.checkpoint_collector(key)
+
+    def completed(self, key):
+        """Whether every listing of a collector completed in this scan"""
+        return key in self._collected
+
+    def incomplete_collectors(self):
+        """Keys of the enabled collectors that neither completed nor were restored (failed or interrupted)"""
+        return [key for _, key in self.enabled_collectors() if key not in self._collected and key not in self._restored]
+
+    def checkpoint_collector(self, key):
+        """Journal the resources of a completed collector, so a resumed scan does not list it again"""
+        with self._lock:
+            services = self.collector_records(key)
+        self.journal.record_unit(self.state_scope(self.COLLECTORS[key].regional), key, services)
+
+    def checkpoint_enriched(self, key):
+        """Journal a completed collector whose queued details have now been looked up"""
+        if self.journal is not None and key in self._collected and key in self._enriching:
+            self.checkpoint_collector(key)
+
+    def collector_resources(self, key):
+        """Service -> resources produced by one collector"""
+        position = list(self.COLLECTORS).index(key)
+        return {service: resources for service, resources in self.all_resources.items()
+                if self._service_rank[service][0] == position}
+
+    def collector_records(self, key):
+        """Service -> resource records produced by one collector"""
+        return {service: [resource.to_record() for resource in resources]
+                for service, resources in self.collector_resources(key).items()}
+
+    def list_ec2_instances(self):
+        self.collect('ec2_instances')
+
+    def list_s3_buckets(self):
+        self.collect('s3_buckets')
+
+    def list_lambda_functions(self):
+        self.collect('lambda_functions')
 
     def list_rds_instances(self):
-        def _list():
-            rds = boto3.client('rds', region_name=self.region)
-            instances = rds.describe_db_instances()
-            
-            for db in instances['DBInstances']:
-                db_id = db['DBInstanceIdentifier']
-                engine = db['Engine']
-                instance_class = db['DBInstanceClass']
-                status = db['DBInstanceStatus']
-                
-                extra = f"{engine} | {instance_class}"
-                self.add_resource('RDS Instances', db_id, extra, status)
-        
-        self.safe_call(_list, 'RDS Instances')
+        self.collect('rds_instances')
 
     def list_dynamodb_tables(self):
-        def _list():
-            dynamodb = boto3.client('dynamodb', region_name=self.region)
-            tables = dynamodb.list_tables()
-            
-            for table_name in tables['TableNames']:
-                # Get table details
-                try:
-                    table_info = dynamodb.describe_table(TableName=table_name)
-                    status = table_info['Table']['TableStatus']
-                    item_count = table_info['Table'].get('ItemCount', 0)
-                    
-                    extra = f"Items: {item_count}"
-                    self.add_resource('DynamoDB Tables', table_name, extra, status)
-                except:
-                    self.add_resource('DynamoDB Tables', table_name, '', 'unknown')
-        
-        self.safe_call(_list, 'DynamoDB Tables')
+        self.collect('dynamodb_tables')
 
     def list_api_gateway(self):
-        def _list():
-            # REST APIs (v1)
-            apigw = boto3.client('apigateway', region_name=self.region)
-            rest_apis = apigw.get_rest_apis()
-            
-            for api in rest_apis['items']:
-                api_id = api['id']
-                api_name = api['name']
-                created_date = api['createdDate'].strftime('%Y-%m-%d %H:%M')
-                
-                extra = f"REST API | Criado: {created_date}"
-                self.add_resource('API Gateway', f"{api_name} ({api_id})", extra, 'active')
-            
-            # HTTP APIs (v2)
-            try:
-                apigwv2 = boto3.client('apigatewayv2', region_name=self.region)
-                http_apis = apigwv2.get_apis()
-                
-                for api in http_apis['Items']:
-                    api_id = api['ApiId']
-                    api_name = api['Name']
-                    protocol = api['ProtocolType']
-                    created_date = api['CreatedDate'].strftime('%Y-%m-%d %H:%M')
-                    
-                    extra = f"{protocol} API | Criado: {created_date}"
-                    self.add_resource('API Gateway', f"{api_name} ({api_id})", extra, 'active')
-            except:
-                pass  # HTTP APIs might not be available in all regions
-        
-        self.safe_call(_list, 'API Gateway')
+        self.collect('api_gateway')
 
     def list_vpc_resources(self):
-        def _list():
-            ec2 = boto3.client('ec2', region_name=self.region)
-            
-            # VPCs
-            vpcs = ec2.describe_vpcs()
-            for vpc in vpcs['Vpcs']:
-                vpc_id = vpc['VpcId']
-                cidr = vpc['CidrBlock']
-                is_default = vpc['IsDefault']
-                
-                extra = f"CIDR: {cidr} | {'Padrão' if is_default else 'Customizada'}"
-                self.add_resource('VPCs', vpc_id, extra, vpc['State'])
-            
-            # Security Groups
-            sgs = ec2.describe_security_groups()
-            for sg in sgs['SecurityGroups']:
-                sg_id = sg['GroupId']
-                sg_name = sg['GroupName']
-                vpc_id = sg['VpcId']
-                
-                extra = f"{sg_name} | VPC: {vpc_id}"
-                self.add_resource('Security Groups', sg_id, extra, 'active')
-        
-        self.safe_call(_list, 'VPC Resources')
+        self.collect('vpc_resources')
 
     def list_key_pairs(self):
-        def _list():
-            ec2 = boto3.client('ec2', region_name=self.region)
-            key_pairs = ec2.describe_key_pairs()
-            
-            for kp in key_pairs['KeyPairs']:
-                key_name = kp['KeyName']
-                key_id = kp['KeyPairId']
-                key_type = kp['KeyType']
-                created = kp.get('CreateTime', '').strftime('%Y-%m-%d %H:%M') if kp.get('CreateTime') else ''
-                
-                extra = f"Tipo: {key_type} | Criado: {created}"
-                self.add_resource('Key Pairs', f"{key_name} ({key_id})", extra, 'active')
-        
-        self.safe_call(_list, 'Key Pairs')
+        self.collect('key_pairs')
 
     def list_ebs_volumes(self):
-        def _list():
-            ec2 = boto3.client('ec2', region_name=self.region)
-            volumes = ec2.describe_volumes()
-            
-            for vol in volumes['Volumes']:
-                vol_id = vol['VolumeId']
-                size = vol['Size']
-                vol_type = vol['VolumeType']
-                state = vol['State']
-                
-                # Check if attached to instance
-                attachments = vol.get('Attachments', [])
-                attached_to = attachments[0]['InstanceId'] if attachments else 'Não anexado'
-                
-                extra = f"{size}GB | {vol_type} | Anexado a: {attached_to}"
-                self.add_resource('EBS Volumes', vol_id, extra, state)
-        
-        self.safe_call(_list, 'EBS Volumes')
+        self.collect('ebs_volumes')
 
     def list_iam_resources(self):
-        def _list():
-            iam = boto3.client('iam')
-            
-            # Users
-            users = iam.list_users()
-            for user in users['Users']:
-                user_name = user['UserName']
-                created = user['CreateDate'].strftime('%Y-%m-%d %H:%M')
-                
-                extra = f"Criado: {created}"
-                self.add_resource('IAM Users', user_name, extra, 'active')
-            
-            # Roles
-            roles = iam.list_roles()
-            for role in roles['Roles']:
-                role_name = role['RoleName']
-                created = role['CreateDate'].strftime('%Y-%m-%d %H:%M')
-                
-                extra = f"Criado: {created}"
-                self.add_resource('IAM Roles', role_name, extra, 'active')
-        
-        self.safe_call(_list, 'IAM Resources')
-
-    # ========== NOVOS RECURSOS ADICIONADOS ==========
+        self.collect('iam_resources')
 
     def list_cloudformation_stacks(self):
-        def _list():
-            cf = boto3.client('cloudformation', region_name=self.region)
-            stacks = cf.describe_stacks()
-            
-            for stack in stacks['Stacks']:
-                stack_name = stack['StackName']
-                status = stack['StackStatus']
-                created = stack['CreationTime'].strftime('%Y-%m-%d %H:%M')
-                
-                # Get template description if available
-                description = stack.get('Description', 'Sem descrição')
-                
-                extra = f"Status: {status} | Criado: {created} | {description}"
-                self.add_resource('CloudFormation Stacks', stack_name, extra, status)
-        
-        self.safe_call(_list, 'CloudFormation Stacks')
+        self.collect('cloudformation_stacks')
 
     def list_sns_topics(self):
-        def _list():
-            sns = boto3.client('sns', region_name=self.region)
-            topics = sns.list_topics()
-            
-            for topic in topics['Topics']:
-                topic_arn = topic['TopicArn']
-                topic_name = topic_arn.split(':')[-1]
-                
-                # Get topic attributes
-                try:
-                    attrs = sns.get_topic_attributes(TopicArn=topic_arn)
-                    subscriptions_confirmed = attrs['Attributes'].get('SubscriptionsConfirmed', '0')
-                    subscriptions_pending = attrs['Attributes'].get('SubscriptionsPending', '0')
-                    
-                    extra = f"Confirmadas: {subscriptions_confirmed} | Pendentes: {subscriptions_pending}"
-                    self.add_resource('SNS Topics', topic_name, extra, 'active')
-                except:
-                    self.add_resource('SNS Topics', topic_name, '', 'active')
-        
-        self.safe_call(_list, 'SNS Topics')
+        self.collect('sns_topics')
 
     def list_sqs_queues(self):
-        def _list():
-            sqs = boto3.client('sqs', region_name=self.region)
-            queues = sqs.list_queues()
-            
-            if 'QueueUrls' in queues:
-                for queue_url in queues['QueueUrls']:
-                    queue_name = queue_url.split('/')[-1]
-                    
-                    # Get queue attributes
-                    try:
-                        attrs = sqs.get_queue_attributes(
-                            QueueUrl=queue_url,
-                            AttributeNames=['ApproximateNumberOfMessages', 'CreatedTimestamp']
-                        )
-                        
-                        msg_count = attrs['Attributes'].get('ApproximateNumberOfMessages', '0')
-                        created_timestamp = attrs['Attributes'].get('CreatedTimestamp', '')
-                        
-                        if created_timestamp:
-                            created = datetime.fromtimestamp(int(created_timestamp)).strftime('%Y-%m-%d %H:%M')
-                            extra = f"Mensagens: {msg_count} | Criado: {created}"
-                        else:
-                            extra = f"Mensagens: {msg_count}"
-                        
-                        self.add_resource('SQS Queues', queue_name, extra, 'active')
-                    except:
-                        self.add_resource('SQS Queues', queue_name, '', 'active')
-        
-        self.safe_call(_list, 'SQS Queues')
+        self.collect('sqs_queues')
 
     def list_cloudwatch_alarms(self):
-        def _list():
-            cw = boto3.client('cloudwatch', region_name=self.region)
-            alarms = cw.describe_alarms()
-            
-            for alarm in alarms['MetricAlarms']:
-                alarm_name = alarm['AlarmName']
-                state = alarm['StateValue']
-                metric_name = alarm['MetricName']
-                namespace = alarm['Namespace']
-                
-                extra = f"Estado: {state} | Métrica: {metric_name} | Namespace: {namespace}"
-                self.add_resource('CloudWatch Alarms', alarm_name, extra, state)
-        
-        self.safe_call(_list, 'CloudWatch Alarms')
+        self.collect('cloudwatch_alarms')
 
     def list_route53_zones(self):
-        def _list():
-            route53 = boto3.client('route53')
-            zones = route53.list_hosted_zones()
-            
-            for zone in zones['HostedZones']:
-                zone_name = zone['Name'].rstrip('.')
-                zone_id = zone['Id'].split('/')[-1]
-                is_private = zone.get('Config', {}).get('PrivateZone', False)
-                record_count = zone['ResourceRecordSetCount']
-                
-                zone_type = 'Privada' if is_private else 'Pública'
-                extra = f"Tipo: {zone_type} | Records: {record_count} | ID: {zone_id}"
-                self.add_resource('Route53 Hosted Zones', zone_name, extra, 'active')
-        
-        self.safe_call(_list, 'Route53 Hosted Zones')
+        self.collect('route53_zones')
 
     def list_elastic_load_balancers(self):
-        def _list():
-            # Classic Load Balancers
-            elb = boto3.client('elb', region_name=self.region)
-            classic_lbs = elb.describe_load_balancers()
-            
-            for lb in classic_lbs['LoadBalancerDescriptions']:
-                lb_name = lb['LoadBalancerName']
-                scheme = lb['Scheme']
-                created = lb['CreatedTime'].strftime('%Y-%m-%d %H:%M')
-                instances = len(lb['Instances'])
-                
-                extra = f"Tipo: Classic | Esquema: {scheme} | Instâncias: {instances} | Criado: {created}"
-                self.add_resource('Load Balancers', lb_name, extra, 'active')
+        self.collect('elastic_load_balancers')
+
+    def list_auto_scaling_groups(self):
+        self.collect('auto_scaling_groups')
+
+    def list_elastic_ips(self):
+        self.collect('elastic_ips')
+
+    def list_nat_gateways(self):
+        self.collect('nat_gateways')
+
+    def list_internet_gateways(self):
+        self.collect('internet_gateways')
+
+    def list_ecr_repositories(self):
+        self.collect('ecr_repositories')
+
+    def list_ecs_clusters(self):
+        self.collect('ecs_clusters')
+
+    def list_secrets_manager(self):
+        self.collect('secrets_manager')
+
+    # ========== ITEM HANDLERS (shared by every backend) ==========
+
+    def _add_ec2_reservation(self, res):
+        for inst in res['Instances']:
+            instance_id = inst['InstanceId']
+            instance_type = inst['InstanceType']
+            state = inst['State']['Name']
             
-            # Application/Network Load Balancers (ELBv2)
-            elbv2 = boto3.client('elbv2', region_name=self.region)
-            modern_lbs = elbv2.describe_load_balancers()
+            # Get tags
+            tags = {t['Key']: t['Value'] for t in inst.get('Tags', [])}
             
-            for lb in modern_lbs['LoadBalancers']:
-                lb_name = lb['LoadBalancerName']
-                lb_type = lb['Type']
-                scheme = lb['Scheme']
-                state = lb['State']['Code']
-                created = lb['CreatedTime'].strftime('%Y-%m-%d %H:%M')
-                
-                extra = f"Tipo: {lb_type.upper()} | Esquema: {scheme} | Criado: {created}"
-                self.add_resource('Load Balancers', lb_name, extra, state)
+            self.add_resource('EC2 Instances', instance_id, state, name=tags.get('Name'), type=instance_type,
+                              created=inst.get('LaunchTime') or None, tags=tags or None,
+                              vpc=inst.get('VpcId'), subnet=inst.get('SubnetId'),
+                              security_groups=[group['GroupId'] for group in inst.get('SecurityGroups', [])] or None)
+
+    def _add_s3_bucket(self, bucket):
+        bucket_name = bucket['Name']
+        
+        resource = self.add_resource('S3 Buckets', bucket_name, 'active', created=bucket['CreationDate'])
         
-        self.safe_call(_list, 'Load Balancers')
+        # Try to get bucket region
+        self.enrich('S3 Buckets', Detail('s3', 'get_bucket_location', {'Bucket': bucket_name}, regional=False,
+                                         cached=('LocationConstraint',)),
+                    self._apply_s3_location, resource)
 
-    def list_auto_scaling_groups(self):
-        def _list():
-            asg = boto3.client('autoscaling', region_name=self.region)
-            groups = asg.describe_auto_scaling_groups()
-            
-            for group in groups['AutoScalingGroups']:
-                group_name = group['AutoScalingGroupName']
-                min_size = group['MinSize']
-                max_size = group['MaxSize']
-                desired = group['DesiredCapacity']
-                current_instances = len(group['Instances'])
-                created = group['CreatedTime'].strftime('%Y-%m-%d %H:%M')
-                
-                extra = f"Min: {min_size} | Max: {max_size} | Desejado: {desired} | Atual: {current_instances} | Criado: {created}"
-                self.add_resource('Auto Scaling Groups', group_name, extra, 'active')
+    def _apply_s3_location(self, location, resource):
+        resource.update(location=location['LocationConstraint'] or 'us-east-1')
+
+    def _add_lambda_function(self, f):
+        self.add_resource('Lambda Functions', f['FunctionName'], 'active', type=f['Runtime'], size=f['MemorySize'],
+                          modified=f['LastModified'], vpc=f.get('VpcConfig', {}).get('VpcId') or None,
+                          security_groups=f.get('VpcConfig', {}).get('SecurityGroupIds') or None)
+
+    def _add_rds_instance(self, db):
+        self.add_resource('RDS Instances', db['DBInstanceIdentifier'], db['DBInstanceStatus'],
+                          type=db['DBInstanceClass'], engine=db['Engine'],
+                          vpc=db.get('DBSubnetGroup', {}).get('VpcId'),
+                          tags={t['Key']: t['Value'] for t in db.get('TagList', [])} or None,
+                          security_groups=[group['VpcSecurityGroupId'] for group in db.get('VpcSecurityGroups', [])] or None)
+
+    def _add_dynamodb_table(self, table_name):
+        resource = self.add_resource('DynamoDB Tables', table_name, 'unknown')
         
-        self.safe_call(_list, 'Auto Scaling Groups')
+        # Get table details
+        self.enrich('DynamoDB Tables', Detail('dynamodb', 'describe_table', {'TableName': table_name}),
+                    self._apply_dynamodb_table, resource)
 
-    def list_elastic_ips(self):
-        def _list():
-            ec2 = boto3.client('ec2', region_name=self.region)
-            eips = ec2.describe_addresses()
-            
-            for eip in eips['Addresses']:
-                public_ip = eip['PublicIp']
-                allocation_id = eip.get('AllocationId', 'N/A')
-                instance_id = eip.get('InstanceId', 'Não associado')
-                domain = eip.get('Domain', 'classic')
-                
-                extra = f"Domínio: {domain} | Instância: {instance_id} | Allocation ID: {allocation_id}"
-                status = 'associated' if instance_id != 'Não associado' else 'available'
-                self.add_resource('Elastic IPs', public_ip, extra, status)
+    def _apply_dynamodb_table(self, table_info, resource):
+        resource.update(status=table_info['Table']['TableStatus'], items=table_info['Table'].get('ItemCount', 0))
+
+    def _add_rest_api(self, api):
+        api_id = api['id']
+        api_name = api['name']
         
-        self.safe_call(_list, 'Elastic IPs')
+        self.add_resource('API Gateway', f"{api_name} ({api_id})", 'active', name=api_name, type='REST',
+                          created=api['createdDate'])
 
-    def list_nat_gateways(self):
-        def _list():
-            ec2 = boto3.client('ec2', region_name=self.region)
-            nat_gws = ec2.describe_nat_gateways()
-            
-            for nat in nat_gws['NatGateways']:
-                nat_id = nat['NatGatewayId']
-                state = nat['State']
-                subnet_id = nat['SubnetId']
-                vpc_id = nat['VpcId']
-                created = nat['CreateTime'].strftime('%Y-%m-%d %H:%M')
-                
-                # Get public IP if available
-                public_ip = 'N/A'
-                if 'NatGatewayAddresses' in nat and nat['NatGatewayAddresses']:
-                    public_ip = nat['NatGatewayAddresses'][0].get('PublicIp', 'N/A')
-                
-                extra = f"VPC: {vpc_id} | Subnet: {subnet_id} | IP Público: {public_ip} | Criado: {created}"
-                self.add_resource('NAT Gateways', nat_id, extra, state)
+    def _add_http_api(self, api):
+        api_id = api['ApiId']
+        api_name = api['Name']
         
-        self.safe_call(_list, 'NAT Gateways')
+        self.add_resource('API Gateway', f"{api_name} ({api_id})", 'active', name=api_name, type=api['ProtocolType'],
+                          created=api['CreatedDate'])
 
-    def list_internet_gateways(self):
-        def _list():
-            ec2 = boto3.client('ec2', region_name=self.region)
-            igws = ec2.describe_internet_gateways()
-            
-            for igw in igws['InternetGateways']:
-                igw_id = igw['InternetGatewayId']
-                
-                # Check VPC attachments
-                attachments = igw.get('Attachments', [])
-                if attachments:
-                    vpc_id = attachments[0]['VpcId']
-                    state = attachments[0]['State']
-                    extra = f"Anexado à VPC: {vpc_id}"
-                else:
-                    state = 'detached'
-                    extra = "Não anexado"
-                
-                self.add_resource('Internet Gateways', igw_id, extra, state)
+    def _add_vpc(self, vpc):
+        self.add_resource('VPCs', vpc['VpcId'], vpc['State'], cidr=vpc['CidrBlock'], default=vpc['IsDefault'])
+
+    def _add_security_group(self, sg):
+        self.add_resource('Security Groups', sg['GroupId'], 'active', name=sg['GroupName'], vpc=sg['VpcId'])
+
+    def _add_key_pair(self, kp):
+        key_name = kp['KeyName']
+        key_id = kp['KeyPairId']
         
-        self.safe_call(_list, 'Internet Gateways')
+        self.add_resource('Key Pairs', f"{key_name} ({key_id})", 'active', name=key_name, type=kp['KeyType'],
+                          created=kp.get('CreateTime') or None)
 
-    def list_ecr_repositories(self):
-        def _list():
-            ecr = boto3.client('ecr', region_name=self.region)
-            repos = ecr.describe_repositories()
-            
-            for repo in repos['repositories']:
-                repo_name = repo['repositoryName']
-                repo_uri = repo['repositoryUri']
-                created = repo['createdAt'].strftime('%Y-%m-%d %H:%M')
-                
-                # Get image count
-                try:
-                    images = ecr.describe_images(repositoryName=repo_name)
-                    image_count = len(images['imageDetails'])
-                except:
-                    image_count = 0
-                
-                extra = f"URI: {repo_uri} | Imagens: {image_count} | Criado: {created}"
-                self.add_resource('ECR Repositories', repo_name, extra, 'active')
+    def _add_ebs_volume(self, vol):
+        # Check if attached to instance
+        attachments = vol.get('Attachments', [])
+        attached_to = attachments[0]['InstanceId'] if attachments else None
         
-        self.safe_call(_list, 'ECR Repositories')
+        self.add_resource('EBS Volumes', vol['VolumeId'], vol['State'], type=vol['VolumeType'], size=vol['Size'],
+                          attachment=attached_to)
 
-    def list_ecs_clusters(self):
-        def _list():
-            ecs = boto3.client('ecs', region_name=self.region)
-            clusters = ecs.list_clusters()
-            
-            if clusters['clusterArns']:
-                cluster_details = ecs.describe_clusters(clusters=clusters['clusterArns'])
-                
-                for cluster in cluster_details['clusters']:
-                    cluster_name = cluster['clusterName']
-                    status = cluster['status']
-                    active_services = cluster['activeServicesCount']
-                    running_tasks = cluster['runningTasksCount']
-                    pending_tasks = cluster['pendingTasksCount']
-                    
-                    extra = f"Serviços: {active_services} | Tasks rodando: {running_tasks} | Tasks pendentes: {pending_tasks}"
-                    self.add_resource('ECS Clusters', cluster_name, extra, status)
+    def _add_iam_user(self, user):
+        self.add_resource('IAM Users', user['UserName'], 'active', created=user['CreateDate'])
+
+    def _add_iam_role(self, role):
+        self.add_resource('IAM Roles', role['RoleName'], 'active', created=role['CreateDate'])
+
+    def _add_cloudformation_stack(self, stack):
+        # Get template description if available
+        description = stack.get('Description', 'Sem descrição')
         
-        self.safe_call(_list, 'ECS Clusters')
+        self.add_resource('CloudFormation Stacks', stack['StackName'], stack['StackStatus'],
+                          created=stack['CreationTime'], description=description,
+                          tags={t['Key']: t['Value'] for t in stack.get('Tags', [])} or None)
 
-    def list_secrets_manager(self):
-        def _list():
-            sm = boto3.client('secretsmanager', region_name=self.region)
-            secrets = sm.list_secrets()
-            
-            for secret in secrets['SecretList']:
-                secret_name = secret['Name']
-                created = secret['CreatedDate'].strftime('%Y-%m-%d %H:%M')
-                last_accessed = secret.get('LastAccessedDate', '')
-                
-                if last_accessed:
-                    last_accessed = last_accessed.strftime('%Y-%m-%d %H:%M')
-                    extra = f"Criado: {created} | Último acesso: {last_accessed}"
-                else:
-                    extra = f"Criado: {created} | Nunca acessado"
-                
-                self.add_resource('Secrets Manager', secret_name, extra, 'active')
+    def _add_sns_topic(self, topic):
+        topic_arn = topic['TopicArn']
+        topic_name = topic_arn.split(':')[-1]
         
-        self.safe_call(_list, 'Secrets Manager')
+        resource = self.add_resource('SNS Topics', topic_name, 'active')
+        
+        # Get topic attributes
+        self.enrich('SNS Topics', Detail('sns', 'get_topic_attributes', {'TopicArn': topic_arn}),
+                    self._apply_sns_attributes, resource)
 
-    def run_all_checks(self):
-        """Execute all resource listing functions"""
+    def _apply_sns_attributes(self, attrs, resource):
+        resource.update(confirmed=attrs['Attributes'].get('SubscriptionsConfirmed', '0'),
+                        pending=attrs['Attributes'].get('SubscriptionsPending', '0'))
+
+    def _add_sqs_queue(self, queue_url):
+        queue_name = queue_url.split('/')[-1]
+        
+        resource = self.add_resource('SQS Queues', queue_name, 'active')
+        
+        # Get queue attributes
+        params = {'QueueUrl': queue_url, 'AttributeNames': ['ApproximateNumberOfMessages', 'CreatedTimestamp']}
+        self.enrich('SQS Queues', Detail('sqs', 'get_queue_attributes', params),
+                    self._apply_sqs_attributes, resource)
+
+    def _apply_sqs_attributes(self, attrs, resource):
+        msg_count = attrs['Attributes'].get('ApproximateNumberOfMessages', '0')
+        created_timestamp = attrs['Attributes'].get('CreatedTimestamp', '')
+        
+        created = datetime.fromtimestamp(int(created_timestamp)) if created_timestamp else None
+        resource.update(messages=msg_count, created=created)
+
+    def _add_cloudwatch_alarm(self, alarm):
+        self.add_resource('CloudWatch Alarms', alarm['AlarmName'], alarm['StateValue'],
+                          metric=alarm['MetricName'], namespace=alarm['Namespace'])
+
+    def _add_route53_zone(self, zone):
+        zone_name = zone['Name'].rstrip('.')
+        is_private = zone.get('Config', {}).get('PrivateZone', False)
+        
+        self.add_resource('Route53 Hosted Zones', zone_name, 'active', type='Privada' if is_private else 'Pública',
+                          records=zone['ResourceRecordSetCount'], zone_id=zone['Id'].split('/')[-1])
+
+    def _add_classic_load_balancer(self, lb):
+        self.add_resource('Load Balancers', lb['LoadBalancerName'], 'active', type='Classic', created=lb['CreatedTime'],
+                          scheme=lb['Scheme'], instances=len(lb['Instances']),
+                          instance_ids=[instance['InstanceId'] for instance in lb['Instances']] or None,
+                          vpc=lb.get('VPCId'), security_groups=lb.get('SecurityGroups') or None)
+
+    def _add_load_balancer(self, lb):
+        # Application/Network Load Balancers (ELBv2)
+        self.add_resource('Load Balancers', lb['LoadBalancerName'], lb['State']['Code'], type=lb['Type'].upper(),
+                          created=lb['CreatedTime'], scheme=lb['Scheme'], vpc=lb.get('VpcId'),
+                          security_groups=lb.get('SecurityGroups') or None)
+
+    def _add_auto_scaling_group(self, group):
+        self.add_resource('Auto Scaling Groups', group['AutoScalingGroupName'], 'active', created=group['CreatedTime'],
+                          min=group['MinSize'], max=group['MaxSize'], desired=group['DesiredCapacity'],
+                          instances=len(group['Instances']),
+                          tags={t['Key']: t['Value'] for t in group.get('Tags', [])} or None,
+                          instance_ids=[instance['InstanceId'] for instance in group['Instances']] or None)
+
+    def _add_elastic_ip(self, eip):
+        # NAT gateways and bare network interfaces hold addresses without an instance
+        association_id = eip.get('AssociationId')
+        
+        status = 'associated' if association_id or eip.get('InstanceId') else 'available'
+        self.add_resource('Elastic IPs', eip['PublicIp'], status, attachment=eip.get('InstanceId'),
+                          domain=eip.get('Domain', 'classic'), allocation_id=eip.get('AllocationId', 'N/A'),
+                          association_id=association_id)
+
+    def _add_nat_gateway(self, nat):
+        # Get public IP if available
+        public_ip = 'N/A'
+        if 'NatGatewayAddresses' in nat and nat['NatGatewayAddresses']:
+            public_ip = nat['NatGatewayAddresses'][0].get('PublicIp', 'N/A')
+        
+        self.add_resource('NAT Gateways', nat['NatGatewayId'], nat['State'], created=nat['CreateTime'],
+                          vpc=nat['VpcId'], subnet=nat['SubnetId'], public_ip=public_ip)
+
+    def _add_internet_gateway(self, igw):
+        # Check VPC attachments
+        attachments = igw.get('Attachments', [])
+        if attachments:
+            vpc_id = attachments[0]['VpcId']
+            state = attachments[0]['State']
+        else:
+            vpc_id = None
+            state = 'detached'
+        
+        self.add_resource('Internet Gateways', igw['InternetGatewayId'], state, attachment=vpc_id)
+
+    def _add_ecr_repository(self, repo):
+        repo_name = repo['repositoryName']
+        
+        resource = self.add_resource('ECR Repositories', repo_name, 'active', created=repo['createdAt'],
+                                     uri=repo['repositoryUri'])
+        
+        # Get image count
+        self.enrich('ECR Repositories', Detail('ecr', 'describe_images', {'repositoryName': repo_name}, 'imageDetails'),
+                    self._apply_ecr_images, resource)
+
+    def _apply_ecr_images(self, images, resource):
+        resource.update(images=len(images))
+
+    def _add_ecs_clusters(self, cluster_arns):
+        if not cluster_arns:
+            return
+        
+        resources = {arn: self.add_resource('ECS Clusters', arn.split('/')[-1], 'unknown') for arn in cluster_arns}
+        
+        # One DescribeClusters call per page of ARNs
+        self.enrich('ECS Clusters', Detail('ecs', 'describe_clusters', {'clusters': cluster_arns}),
+                    self._apply_ecs_clusters, resources)
+
+    def _apply_ecs_clusters(self, cluster_details, resources):
+        for cluster in cluster_details['clusters']:
+            resource = resources.get(cluster['clusterArn'])
+            if resource is None:
+                continue
+            resource.update(status=cluster['status'], services=cluster['activeServicesCount'],
+                            running_tasks=cluster['runningTasksCount'], pending_tasks=cluster['pendingTasksCount'])
+
+    def _add_secret(self, secret):
+        last_accessed = secret.get('LastAccessedDate')
+        
+        self.add_resource('Secrets Manager', secret['Name'], 'active', created=secret['CreatedDate'],
+                          last_accessed=last_accessed.isoformat() if last_accessed else None)
+
+    @contextmanager
+    def collector_scope(self, position, key):
+        """Tag resources added inside the block with the collector position and region"""
+        position_token = _collector_position.set(position)
+        region_token = _collector_region.set(self.collector_region(key))
+        key_token = _collector_key.set(key)
+        try:
+            with self.profile_scope(key):
+                yield
+        finally:
+            _collector_position.reset(position_token)
+            _collector_region.reset(region_token)
+            _collector_key.reset(key_token)
+
+    def collector_region(self, key):
+        return self.region if self.COLLECTORS[key].regional else 'global'
+
+    def profile_scope(self, key, phase='collect'):
+        """Attribute the work done inside the block to a collector (no-op without a profiler)"""
+        if self.profiler is None or key is None:
+            return nullcontext()
+        return self.profiler.track(key, self.collector_region(key), phase, self.COLLECTORS[key].name)
+
+    def _run_collector(self, position, key):
+        """Run a single collector, remembering its position for ordering, then look up its details
+        so its resources reach the sinks during the scan"""
+        with self.collector_scope(position, key):
+            if self.restore_collector(key):
+                return
+            self.collect(key)
+        self.run_enrichment(key)
+        self.checkpoint_enriched(key)
+
+    def state_scope(self, regional=True):
+        """Key of this profile or account and region (or the global services) in the incremental state"""
+        return f"{self.account or self.profile or 'default'}/{self.region if regional else 'global'}"
+
+    def restore_collector(self, key):
+        """Add the resources of a collector completed by the resumed scan, or produced last time if it is
+        inside its refresh interval"""
+        scope = self.state_scope(self.COLLECTORS[key].regional)
+        services = self.journal.completed_unit(scope, key) if self.journal is not None else None
+        # Stored incremental results are unfiltered and lack the tags filters are checked on
+        if services is None and self.state is not None and not self.scan_filter:
+            services = self.state.fresh_collector(scope, key)
+        if services is None:
+            return False
+        
+        for service, records in services.items():
+            for record in records:
+                self._add(service, Resource.from_record(service, record))
+        with self._lock:
+            self._restored.add(key)
+        if self.profiler is not None:
+            self.profiler.record('restored')
+        return True
+
+    def record_state(self):
+        """Store what each fully listed collector produced in the incremental state"""
+        if self.state is None or self.scan_filter:
+            return  # A filtered result must not be restored by later, unfiltered scans
+        
+        for _, key in self.enabled_collectors():
+            if key in self._collected:
+                self.state.record_collector(self.state_scope(self.COLLECTORS[key].regional), key,
+                                            self.collector_records(key))
+
+    def apply_scan_filter(self):
+        """Drop resources whose status, known only once their details are applied, does not match the scan filter"""
+        if not self.scan_filter:
+            return
+        
+        conditions = self.scan_filter.state_conditions
+        filtered = {service: [resource for resource in resources if self.scan_filter.matches(resource, conditions)]
+                    for service, resources in self.all_resources.items()}
+        self.all_resources = {service: resources for service, resources in filtered.items() if resources}
+
+    def _order_services(self):
+        """Restore the sequential service order regardless of completion order"""
+        self.all_resources = {
+            service: self.all_resources[service]
+            for service in sorted(self.all_resources, key=self._service_rank.get)
+        }
+
+    def enabled_collectors(self):
+        """(position, key) of the collectors this lister runs, in start order (see collectors.schedule)"""
+        positions = {key: position for position, key in enumerate(self.COLLECTORS)}
+        keys = [key for key in enabled_services(self.services)
+                if self.include_global or self.COLLECTORS[key].regional]
+        return [(positions[key], key) for key in schedule(keys)]
+
+    def scan(self):
+        """Run the enabled collectors in parallel and order the results"""
+        if self.backend == 'async':
+            asyncio.run(self.scan_async())
+            return
+        
+        with ThreadPoolExecutor(max_workers=self.enrichment_workers, thread_name_prefix='enrich') as enrichment, \
+                ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='collector') as executor:
+            self._enrichment_pool = enrichment
+            try:
+                futures = [executor.submit(self._run_collector, position, key)
+                           for position, key in self.enabled_collectors()]
+                for future in futures:
+                    future.result()
+            finally:
+                self._enrichment_pool = None
+        
+        self.apply_scan_filter()
+        self._order_services()
+        self.record_state()
+
+    async def scan_async(self, backend=None):
+        """Run the scan on the aiobotocore backend (a multi-region scan passes the backend its regions share)"""
+        if backend is None:
+            from async_backend import AsyncScanBackend
+            async with AsyncScanBackend(profile=self.profile, profiler=self.profiler) as backend:
+                await backend.scan(self)
+        else:
+            await backend.scan(self)
+        self.apply_scan_filter()
+        self._order_services()
+        self.record_state()
+
+    def print_scan_header(self):
         print("🔍 Listando recursos AWS...")
         print(f"📍 Região: {self.region}")
+        if self.scan_filter:
+            print(f"🔎 Filtro: {self.scan_filter}")
+        if self.backend == 'async':
+            print("⚙️  Backend: async (aiobotocore)")
+        else:
+            print(f"⚙️  Workers: {self.max_workers}")
         print("-" * 50)
-        
-        # Recursos originais
-        self.list_ec2_instances()
-        self.list_s3_buckets()
-        self.list_lambda_functions()
-        self.list_rds_instances()
-        self.list_dynamodb_tables()
-        self.list_api_gateway()
-        self.list_vpc_resources()
-        self.list_key_pairs()
-        self.list_ebs_volumes()
-        self.list_iam_resources()
-        
-        # Novos recursos adicionados
-        self.list_cloudformation_stacks()
-        self.list_sns_topics()
-        self.list_sqs_queues()
-        self.list_cloudwatch_alarms()
-        self.list_route53_zones()
-        self.list_elastic_load_balancers()
-        self.list_auto_scaling_groups()
-        self.list_elastic_ips()
-        self.list_nat_gateways()
-        self.list_internet_gateways()
-        self.list_ecr_repositories()
-        self.list_ecs_clusters()
-        self.list_secrets_manager()
+
+    def run_all_checks(self):
+        """Execute all resource listing functions in parallel"""
+        self.print_scan_header()
+        self.scan()
+        if self.state is not None:
+            self.state.save()
+
+    async def run_all_checks_async(self):
+        """Execute all resource listing functions as coroutines on the running event loop"""
+        self.print_scan_header()
+        await self.scan_async()
+        if self.state is not None:
+            self.state.save()
+
+    def print_api_stats(self):
+        """Print API call, retry and throttling counters of the scan"""
+        stats = self.throttle.stats
+        print(f"📡 Chamadas de API: {stats['calls']} | 🔁 Retentativas: {stats['retries']} | 🐢 Throttling: {stats['throttles']}")
+        if self.state is not None:
+            reused = self.state.stats
+            print(f"♻️  Incremental: {reused['collectors_reused']} coletores restaurados | {reused['details_reused']} detalhes reaproveitados")
 
     def print_executive_summary(self):
         """Print executive summary of resources"""
@@ -601,7 +892,9 @@ class AWSResourceLister:
         for item in summary_items:
             print(item)
         
-        print(f"\n🕒 Verificação realizada em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print()
+        self.print_api_stats()
+        print(f"🕒 Verificação realizada em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
     def print_detailed_results(self):
         """Print detailed formatted results"""
@@ -633,7 +926,9 @@ class AWSResourceLister:
                         'detached': '🔴'
                     }.get(resource['status'].lower(), '🔵')
                     
-                    print(f"  {status_emoji} {resource['id']}")
+                    location = '/'.join(filter(None, (resource.get('account'), resource.get('region'))))
+                    region_tag = f" [{location}]" if self.multi_region and location else ""
+                    print(f"  {status_emoji} {resource['id']}{region_tag}")
                     if resource['extra']:
                         print(f"     └─ {resource['extra']}")
                     if resource['status'] and resource['status'] != 'active':
@@ -646,6 +941,81 @@ class AWSResourceLister:
         self.print_executive_summary()
         self.print_detailed_results()
 
+class MultiRegionResourceLister(AWSResourceLister):
+    """Scan several regions in parallel and merge them into one region-tagged inventory"""
+
+    multi_region = True
+
+    def __init__(self, regions, max_workers=None, region_workers=None, profile=None, shallow=False,
+                 backend='threads', state=None, sinks=(), profiler=None, scan_filter=None, services=None,
+                 journal=None, clients=None, throttle=None):
+        self.regions = list(dict.fromkeys(regions))
+        self.region_workers = region_workers or len(self.regions)
+        # Regional listers share this registry: one session, one client per (region, service)
+        super().__init__(region=self.regions[0], max_workers=max_workers, profile=profile, shallow=shallow,
+                         backend=backend, state=state, sinks=sinks, profiler=profiler, scan_filter=scan_filter,
+                         services=services, journal=journal, clients=clients, throttle=throttle)
+
+    def _regional_listers(self):
+        return [
+            AWSResourceLister(region=region, max_workers=self.max_workers, include_global=(index == 0),
+                              profile=self.profile, clients=self.clients, shallow=self.shallow,
+                              enrichment_workers=self.enrichment_workers, backend=self.backend,
+                              throttle=self.throttle, state=self.state, sinks=self.sinks, profiler=self.profiler,
+                              scan_filter=self.scan_filter, services=self.services, journal=self.journal)
+            for index, region in enumerate(self.regions)
+        ]
+
+    def scan(self):
+        """Run one regional scan per region; global services are fetched only by the first one"""
+        if self.backend == 'async':
+            asyncio.run(self.scan_async())
+            return
+        
+        listers = self._regional_listers()
+        with ThreadPoolExecutor(max_workers=self.region_workers, thread_name_prefix='region') as executor:
+            futures = [executor.submit(lister.scan) for lister in listers]
+            for future in futures:
+                future.result()
+        
+        self._merge(listers)
+
+    async def scan_async(self):
+        """Run every regional scan on the same event loop, sharing one backend and its concurrency limits"""
+        from async_backend import AsyncScanBackend
+        
+        listers = self._regional_listers()
+        async with AsyncScanBackend(profile=self.profile, profiler=self.profiler) as backend:
+            await asyncio.gather(*(lister.scan_async(backend) for lister in listers))
+        self._merge(listers)
+
+    def _merge(self, listers):
+        # A collector is complete when it completed in every region that ran it
+        ran = {key for lister in listers for _, key in lister.enabled_collectors()}
+        failed = {key for lister in listers for _, key in lister.enabled_collectors() if not lister.completed(key)}
+        self._collected = ran - failed
+        unfinished = {key for lister in listers for key in lister.incomplete_collectors()}
+        self._restored = {key for lister in listers for key in lister._restored} - unfinished
+        
+        # Merge in region order, keeping the collector order of services
+        for lister in listers:
+            for service, resources in lister.all_resources.items():
+                self.all_resources.setdefault(service, []).extend(resources)
+                self._service_rank.setdefault(service, lister._service_rank[service])
+        
+        self._order_services()
+
+    def print_scan_header(self):
+        print("🔍 Listando recursos AWS...")
+        print(f"🌍 Regiões: {', '.join(self.regions)}")
+        if self.scan_filter:
+            print(f"🔎 Filtro: {self.scan_filter}")
+        if self.backend == 'async':
+            print("⚙️  Backend: async (aiobotocore)")
+        else:
+            print(f"⚙️  Workers: {self.max_workers} por região, {self.region_workers} regiões em paralelo")
+        print("-" * 50)
+
 def main():
     try:
         # You can change the region here
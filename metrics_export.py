@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+import bisect
+import os
+from config import METRICS_CONFIG
+
+try:
+    from opentelemetry import trace as otel_trace
+    from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+    from opentelemetry.sdk.metrics.view import ExplicitBucketHistogramAggregation, View
+    from opentelemetry.sdk.resources import Resource as OTelResource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+except ImportError:  # Optional dependency, only needed for --otlp-endpoint
+    MeterProvider = None
+
+# Per (collector, region) counters of the profiler exported as counters: (metric, profiler counter, help)
+COUNTER_METRICS = (
+    ('aws_inventory_api_calls_total', 'calls', 'API calls made, retries included'),
+    ('aws_inventory_api_retries_total', 'retries', 'API calls retried after a throttling or transient error'),
+    ('aws_inventory_api_throttles_total', 'throttles', 'API calls rejected by AWS throttling'),
+    ('aws_inventory_api_errors_total', 'errors', 'API calls answered with an error status'),
+    ('aws_inventory_response_bytes_total', 'bytes', 'Bytes of API responses received'),
+    ('aws_inventory_resources_discovered_total', 'resources', 'Resources discovered'),
+)
+
+LATENCY_METRIC = 'aws_inventory_api_call_duration_seconds'
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(labels):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def prometheus_text(profiler, labels=None, buckets=None):
+    """Prometheus text exposition of a profiled scan
+
+    Scan-wide gauges, per-service gauges of collector time, per-service counters of API calls,
+    retries, throttling, errors, bytes and resources, and a per-service histogram of API call
+    latency. `labels` (e.g. the AWS profile) are added to every series.
+    """
+    labels = dict(labels or {})
+    buckets = sorted(buckets or METRICS_CONFIG['latency_buckets'])
+    trace = profiler.trace()
+    rows = trace['collectors']
+    lines = []
+
+    def family(name, kind, help_text):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    def sample(name, value, **extra):
+        lines.append(f"{name}{_labels({**labels, **extra})} {_number(value)}")
+
+    family('aws_inventory_scan_duration_seconds', 'gauge', 'Wall time of the last scan')
+    sample('aws_inventory_scan_duration_seconds', trace['duration'])
+    family('aws_inventory_scan_timestamp_seconds', 'gauge', 'Unix time the last scan finished')
+    sample('aws_inventory_scan_timestamp_seconds', round(profiler.started_at.timestamp() + trace['duration'], 3))
+
+    family('aws_inventory_collector_duration_seconds', 'gauge',
+           'Time spent per service and region (listing, and summed detail lookups)')
+    for row in rows:
+        for phase in ('collect', 'enrich'):
+            sample('aws_inventory_collector_duration_seconds', row[f'{phase}_time'],
+                   service=row['service'], region=row['region'], phase=phase)
+
+    for name, counter, help_text in COUNTER_METRICS:
+        family(name, 'counter', help_text)
+        for row in rows:
+            sample(name, row[counter], service=row['service'], region=row['region'])
+
+    family(LATENCY_METRIC, 'histogram', 'Latency of API calls per service and region')
+    for row in rows:
+        latencies = profiler.latencies.get((row['collector'], row['region']), [])
+        counts = [0] * len(buckets)
+        for latency in latencies:
+            index = bisect.bisect_left(buckets, latency)
+            if index < len(buckets):
+                counts[index] += 1
+        series = {'service': row['service'], 'region': row['region']}
+        cumulative = 0
+        for bound, count in zip(buckets, counts):
+            cumulative += count
+            sample(f'{LATENCY_METRIC}_bucket', cumulative, **series, le=_number(float(bound)))
+        sample(f'{LATENCY_METRIC}_bucket', len(latencies), **series, le='+Inf')
+        sample(f'{LATENCY_METRIC}_sum', round(sum(latencies), 6), **series)
+        sample(f'{LATENCY_METRIC}_count', len(latencies), **series)
+
+    return '\n'.join(lines) + '\n'
+
+def write_prometheus_textfile(profiler, filename=None, labels=None):
+    """Write the scan metrics for the node_exporter textfile collector
+
+    The file is written next to its destination and renamed over it, so the collector never
+    reads a partial file.
+    """
+    filename = filename or METRICS_CONFIG['textfile']
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    temporary = f"{filename}.{os.getpid()}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as f:
+        f.write(prometheus_text(profiler, labels))
+    os.replace(temporary, filename)
+    print(f"✅ Métricas Prometheus exportadas para: {filename}")
+    return filename
+
+def export_otlp(profiler, endpoint=None, labels=None):
+    """Send the scan metrics and one span per collector to an OTLP/HTTP endpoint
+
+    Metrics mirror the Prometheus textfile (API call latency as a histogram, counters per
+    service and region); spans keep each collector's start and end inside the scan.
+    """
+    if MeterProvider is None:
+        raise ImportError("opentelemetry não está instalado. Instale com: "
+                          "pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http")
+
+    endpoint = (endpoint or METRICS_CONFIG['otlp_endpoint']).rstrip('/')
+    labels = dict(labels or {})
+    trace = profiler.trace()
+    resource = OTelResource.create({'service.name': METRICS_CONFIG['service_name']})
+
+    # Metrics: one collection, exported when the provider shuts down
+    reader = PeriodicExportingMetricReader(OTLPMetricExporter(endpoint=f"{endpoint}/v1/metrics"),
+                                           export_interval_millis=3600 * 1000)
+    latency_view = View(instrument_name='aws_inventory.api.call.duration',
+                        aggregation=ExplicitBucketHistogramAggregation(sorted(METRICS_CONFIG['latency_buckets'])))
+    meter_provider = MeterProvider(resource=resource, metric_readers=[reader], views=[latency_view])
+    meter = meter_provider.get_meter('aws_inventory_scanner')
+
+    meter.create_gauge('aws_inventory.scan.duration', unit='s').set(trace['duration'], labels)
+    durations = meter.create_gauge('aws_inventory.collector.duration', unit='s')
+    latency = meter.create_histogram('aws_inventory.api.call.duration', unit='s')
+    counters = {counter: meter.create_counter(_otlp_name(name), description=help_text)
+                for name, counter, help_text in COUNTER_METRICS}
+    for row in trace['collectors']:
+        attributes = {**labels, 'service': row['service'], 'region': row['region']}
+        for phase in ('collect', 'enrich'):
+            durations.set(row[f'{phase}_time'], {**attributes, 'phase': phase})
+        for counter, instrument in counters.items():
+            instrument.add(row[counter], attributes)
+        for value in profiler.latencies.get((row['collector'], row['region']), []):
+            latency.record(value, attributes)
+    meter_provider.shutdown()
+
+    # Spans: the scan and, inside it, each collector from its first to its last activity
+    tracer_provider = TracerProvider(resource=resource)
+    tracer_provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=f"{endpoint}/v1/traces")))
+    tracer = tracer_provider.get_tracer('aws_inventory_scanner')
+    start_ns = int(profiler.started_at.timestamp() * 1e9)
+
+    scan_span = tracer.start_span('aws_inventory.scan', start_time=start_ns, attributes={**labels, **trace['totals']})
+    for row in trace['collectors']:
+        span = tracer.start_span(
+            f"collect {row['service']}",
+            context=otel_trace.set_span_in_context(scan_span),
+            start_time=start_ns + int(row['started'] * 1e9),
+            attributes={**labels, 'service': row['service'], 'region': row['region'],
+                        **{counter: row[counter] for counter in ('calls', 'pages', 'bytes', 'retries', 'throttles',
+                                                                  'errors', 'resources')}},
+        )
+        span.end(end_time=start_ns + int(row['finished'] * 1e9))
+    scan_span.end(end_time=start_ns + int(trace['duration'] * 1e9))
+    tracer_provider.shutdown()
+
+    print(f"✅ Métricas e spans OTLP enviados para: {endpoint}")
+    return endpoint
+
+def _otlp_name(name):
+    """OTLP instrument name of a Prometheus counter (aws_inventory_api_calls_total -> aws_inventory.api.calls)"""
+    return 'aws_inventory.' + name[len('aws_inventory_'):-len('_total')].replace('_', '.')
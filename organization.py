@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import BotoCoreError, ClientError
+from aws_clients import ClientRegistry, assume_role_session
+from config import ORG_CONFIG
+from listar_recursos import AWSResourceLister, MultiRegionResourceLister
+from throttling import AdaptiveThrottle
+
+def list_member_accounts(session):
+    """(account id, name) of the ACTIVE accounts of the caller's AWS Organization"""
+    organizations = session.client('organizations', region_name='us-east-1')
+    return [
+        (account['Id'], account['Name'])
+        for page in organizations.get_paginator('list_accounts').paginate()
+        for account in page['Accounts']
+        if account['Status'] == 'ACTIVE'
+    ]
+
+class OrganizationResourceLister(MultiRegionResourceLister):
+    """Scan many accounts across regions and merge them into one account- and region-tagged inventory
+
+    Member accounts are read from AWS Organizations (or given explicitly) and scanned through
+    a role assumed in each of them; the caller's own account uses its own credentials. Every
+    (account, region) pair is one regional scan, run on a bounded pool. Each account has its
+    own client registry and rate limiter, since AWS throttles per account.
+    """
+
+    def __init__(self, regions, accounts=None, role_name=None, scan_workers=None, max_workers=None, profile=None,
+                 shallow=False, backend='threads', state=None, sinks=(), profiler=None, scan_filter=None,
+                 services=None, journal=None):
+        if backend != 'threads':
+            raise ValueError("O scan de organização usa apenas o backend de threads")
+        super().__init__(regions, max_workers=max_workers, profile=profile, shallow=shallow, backend=backend,
+                         state=state, sinks=sinks, profiler=profiler, scan_filter=scan_filter, services=services,
+                         journal=journal)
+        self.requested_accounts = list(accounts) if accounts else None
+        self.role_name = role_name or ORG_CONFIG['role_name']
+        self.scan_workers = scan_workers or ORG_CONFIG['scan_workers']
+        self.accounts = []
+        self.failed_accounts = {}
+
+    def discover_accounts(self):
+        """(caller account id, [(account id, name)] to scan)"""
+        session = self.clients.session(self.profile)
+        caller = session.client('sts', region_name='us-east-1').get_caller_identity()['Account']
+        if self.requested_accounts:
+            return caller, [(account_id, account_id) for account_id in dict.fromkeys(self.requested_accounts)]
+        return caller, list_member_accounts(session)
+
+    def connect(self, account_id, caller):
+        """Client registry of an account, or None when its role cannot be assumed"""
+        if account_id == caller:
+            return self.clients
+
+        session = assume_role_session(
+            self.clients.session(self.profile),
+            f"arn:aws:iam::{account_id}:role/{self.role_name}",
+            ORG_CONFIG['session_name'],
+            duration=ORG_CONFIG['session_duration'],
+            external_id=ORG_CONFIG['external_id'],
+        )
+        try:
+            # Assume the role now, so an unreachable account fails once instead of in every collector
+            session.get_credentials().get_frozen_credentials()
+        except (ClientError, BotoCoreError) as e:
+            code = e.response['Error']['Code'] if isinstance(e, ClientError) else type(e).__name__
+            self.failed_accounts[account_id] = code
+            return None
+        return ClientRegistry(max_pool_connections=self.max_workers + self.enrichment_workers, session=session)
+
+    def _account_listers(self, account_id, clients):
+        throttle = AdaptiveThrottle()
+        return [
+            AWSResourceLister(region=region, max_workers=self.max_workers, include_global=(index == 0),
+                              profile=self.profile, clients=clients, shallow=self.shallow,
+                              enrichment_workers=self.enrichment_workers, throttle=throttle, state=self.state,
+                              sinks=self.sinks, profiler=self.profiler, scan_filter=self.scan_filter,
+                              services=self.services, account=account_id, journal=self.journal)
+            for index, region in enumerate(self.regions)
+        ]
+
+    def scan(self):
+        """Assume the role of every account, then run all (account, region) scans on one bounded pool"""
+        caller, accounts = self.discover_accounts()
+        print(f"🏢 {len(accounts)} contas encontradas (role: {self.role_name})")
+
+        with ThreadPoolExecutor(max_workers=self.scan_workers, thread_name_prefix='account') as executor:
+            registries = list(executor.map(lambda account: self.connect(account[0], caller), accounts))
+
+        self.accounts = [account for account, clients in zip(accounts, registries) if clients is not None]
+        for account_id, code in self.failed_accounts.items():
+            print(f"⚠️  Não foi possível assumir {self.role_name} na conta {account_id}: {code}")
+
+        listers = [lister for (account_id, _), clients in zip(accounts, registries) if clients is not None
+                   for lister in self._account_listers(account_id, clients)]
+        with ThreadPoolExecutor(max_workers=self.scan_workers, thread_name_prefix='account') as executor:
+            futures = [executor.submit(lister.scan) for lister in listers]
+            for future in futures:
+                future.result()
+
+        self._merge(listers)
+        for throttle in {id(lister.throttle): lister.throttle for lister in listers}.values():
+            for name, count in throttle.stats.items():
+                self.throttle.stats[name] += count
+
+    def incomplete_collectors(self):
+        """Every enabled collector when an account could not be scanned, since none of them ran there"""
+        if self.failed_accounts:
+            return [key for _, key in self.enabled_collectors()]
+        return super().incomplete_collectors()
+
+    def print_scan_header(self):
+        print("🔍 Listando recursos AWS da organização...")
+        print(f"🌍 Regiões: {', '.join(self.regions)}")
+        if self.scan_filter:
+            print(f"🔎 Filtro: {self.scan_filter}")
+        print(f"⚙️  Workers: {self.max_workers} por região, {self.scan_workers} pares (conta, região) em paralelo")
+        print("-" * 50)
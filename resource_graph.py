@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+from collections import deque
+from resource_model import Resource
+
+# Links read from resource fields: service -> [(field, relation)]. The field holds the id
+# (or list of ids) of the resource depended on; edges point from the dependent resource.
+RELATIONS = {
+    'EC2 Instances': [('vpc', 'in_vpc'), ('security_groups', 'uses')],
+    'Security Groups': [('vpc', 'in_vpc')],
+    'NAT Gateways': [('vpc', 'in_vpc')],
+    'Internet Gateways': [('attachment', 'attached_to')],
+    'EBS Volumes': [('attachment', 'attached_to')],
+    'Elastic IPs': [('attachment', 'attached_to')],
+    'Load Balancers': [('vpc', 'in_vpc'), ('security_groups', 'uses'), ('instance_ids', 'targets')],
+    'Auto Scaling Groups': [('instance_ids', 'manages')],
+    'Lambda Functions': [('vpc', 'in_vpc'), ('security_groups', 'uses')],
+    'RDS Instances': [('vpc', 'in_vpc'), ('security_groups', 'uses')],
+}
+
+# Resources that are orphaned without an edge: service -> ('out' or 'in', relation, fields that also
+# mark the resource as used). 'out' needs the resource to point at something; 'in' needs something
+# pointing at it and only applies when every service with that relation in RELATIONS was scanned.
+# Orphans are "not used by the scanned resources": links from services the scanner does not list
+# (ENIs, ECS tasks, VPC endpoints, security group rules...) are unknown.
+ORPHAN_RULES = {
+    'EBS Volumes': ('out', 'attached_to', ()),
+    # An address associated with a NAT gateway or a bare network interface has no instance
+    'Elastic IPs': ('out', 'attached_to', ('association_id',)),
+    'Internet Gateways': ('out', 'attached_to', ()),
+    'Security Groups': ('in', 'uses', ()),
+}
+
+def _field(resource, field):
+    if isinstance(resource, Resource):
+        return getattr(resource, field) if field in Resource.__slots__ else resource.attr(field)
+    return resource.get(field)
+
+class ResourceGraph:
+    """Dependency graph of an inventory, built in one pass over the resources
+
+    Nodes are numbered in scan order and looked up by resource id; every edge is kept in an
+    outgoing adjacency list (what a resource depends on) and an incoming one (what depends on
+    it). Ids are resolved within the account and region of the resource first, then globally.
+    References to resources that were not scanned are kept as dangling ids. The VPC of every
+    node and the orphaned resources are computed once at build time, so "everything in VPC X"
+    and "orphans" are lookups and a blast radius only walks the resources it returns.
+    """
+
+    def __init__(self, resources=None):
+        self.nodes = []  # [(service, resource)]
+        self.outgoing = {}  # node -> [(relation, node)], for nodes with links only
+        self.incoming = {}  # node -> [(relation, node)]
+        self.dangling = {}  # node -> [(relation, id)]
+        self._by_id = {}
+        self._by_scope = {}
+        self._vpc_members = {}
+        self._orphans = []
+        self.scanned = set()  # Services the scan covered, even with no resources
+        if resources:
+            self.build(resources)
+
+    @classmethod
+    def from_scan(cls, source):
+        """Graph of a scan: a service -> resources dict or a JSON/NDJSON(.gz) export"""
+        from scan_diff import iter_scan
+
+        resources = {}
+        for service, resource in iter_scan(source):
+            resources.setdefault(service, []).append(resource)
+        return cls(resources)
+
+    def build(self, resources):
+        self.scanned.update(resources)
+        scopes = []
+        for service, items in resources.items():
+            for resource in items:
+                number = len(self.nodes)
+                self.nodes.append((service, resource))
+                resource_id = _field(resource, 'id')
+                # Plain string keys and bare node numbers keep the per-node indexes out of the garbage collector
+                scope = f"{_field(resource, 'account') or ''}\0{_field(resource, 'region') or ''}\0"
+                scopes.append(scope)
+                previous = self._by_id.get(resource_id)
+                if previous is None:
+                    self._by_id[resource_id] = number
+                elif type(previous) is int:
+                    self._by_id[resource_id] = [previous, number]
+                else:
+                    previous.append(number)
+                self._by_scope[scope + resource_id] = number
+
+        for number, (service, resource) in enumerate(self.nodes):
+            for field, relation in RELATIONS.get(service, ()):
+                targets = _field(resource, field)
+                if not targets:
+                    continue
+                for target_id in ([targets] if isinstance(targets, str) else targets):
+                    target = self._resolve(scopes[number], target_id)
+                    if target is None:
+                        self.dangling.setdefault(number, []).append((relation, target_id))
+                    else:
+                        self.outgoing.setdefault(number, []).append((relation, target))
+                        self.incoming.setdefault(target, []).append((relation, number))
+
+        self._index_vpcs()
+        self._index_orphans()
+
+    def _resolve(self, scope, target_id):
+        number = self._by_scope.get(scope + target_id)
+        if number is None:
+            number = self._by_id.get(target_id)
+            if isinstance(number, list):
+                number = number[0]
+        return number
+
+    def _index_vpcs(self):
+        """VPC id -> nodes inside it: direct members plus what is attached to them, transitively"""
+        for vpc, (service, resource) in enumerate(self.nodes):
+            if service != 'VPCs':
+                continue
+            members = self._vpc_members.setdefault(_field(resource, 'id'), [])
+            members.extend(number for number, _ in self._walk_in(vpc))
+        # VPCs that were referenced but not scanned (--services without vpc) still group their members
+        for number, references in self.dangling.items():
+            for _, target_id in references:
+                if target_id.startswith('vpc-'):
+                    members = self._vpc_members.setdefault(target_id, [])
+                    members.append(number)
+                    members.extend(member for member, _ in self._walk_in(number))
+        for vpc_id, members in self._vpc_members.items():
+            self._vpc_members[vpc_id] = list(dict.fromkeys(members))
+
+    def _index_orphans(self):
+        from scan_diff import is_text_only
+
+        scanned = self.scanned
+        # An 'in' rule needs every service that can hold the relation to have been scanned
+        rules = {service: rule for service, rule in ORPHAN_RULES.items()
+                 if rule[0] == 'out' or all(source in scanned for source, links in RELATIONS.items()
+                                            if any(relation == rule[1] for _, relation in links))}
+        for number, (service, resource) in enumerate(self.nodes):
+            rule = rules.get(service)
+            if rule is None:
+                continue
+            # Records of older exports have no attachment or VPC fields, so their links are unknown
+            if not isinstance(resource, Resource) and is_text_only(resource):
+                continue
+            direction, relation, fields = rule
+            if direction == 'out':
+                linked = any(r == relation for r, _ in self.outgoing.get(number, ())) or number in self.dangling
+            else:
+                linked = any(r == relation for r, _ in self.incoming.get(number, ()))
+            linked = linked or any(_field(resource, field) for field in fields)
+            # Default security groups are recreated with their VPC and cannot be deleted on their own
+            if not linked and not (service == 'Security Groups' and _field(resource, 'name') == 'default'):
+                self._orphans.append(number)
+
+    def _walk_in(self, start):
+        """(node, depth) of every resource depending on start, directly or transitively, breadth first"""
+        seen = {start}
+        queue = deque([(start, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            for _, dependent in self.incoming.get(node, ()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    queue.append((dependent, depth + 1))
+                    yield dependent, depth + 1
+
+    # ========== QUERIES ==========
+
+    def find(self, resource_id):
+        """Node numbers of a resource id (ids can repeat across regions and accounts)"""
+        numbers = self._by_id.get(resource_id, ())
+        return [numbers] if type(numbers) is int else list(numbers)
+
+    def in_vpc(self, vpc_id):
+        """(service, resource) of everything inside a VPC"""
+        return [self.nodes[number] for number in self._vpc_members.get(vpc_id, ())]
+
+    def orphans(self):
+        """Service -> resources no scanned resource uses (unattached volumes, free Elastic IPs, unused security groups...)"""
+        orphans = {}
+        for number in self._orphans:
+            service, resource = self.nodes[number]
+            orphans.setdefault(service, []).append(resource)
+        return orphans
+
+    def blast_radius(self, resource_id):
+        """(service, resource, depth) of everything that depends on a resource, i.e. is affected by deleting it"""
+        return [(*self.nodes[number], depth)
+                for start in self.find(resource_id) for number, depth in self._walk_in(start)]
+
+    def neighbors(self, resource_id):
+        """(direction, relation, service, resource id) of the direct links of a resource"""
+        links = []
+        for number in self.find(resource_id):
+            links += [('out', relation, *self._ref(target)) for relation, target in self.outgoing.get(number, ())]
+            links += [('out', relation, None, target_id) for relation, target_id in self.dangling.get(number, ())]
+            links += [('in', relation, *self._ref(source)) for relation, source in self.incoming.get(number, ())]
+        return links
+
+    def _ref(self, number):
+        service, resource = self.nodes[number]
+        return service, resource['id']
+
+    @property
+    def edge_count(self):
+        return sum(len(edges) for edges in self.outgoing.values())
+
+def print_graph_results(title, results):
+    """Print (service, resource[, depth]) results of a graph query grouped by service"""
+    print("\n" + "="*60)
+    print(f"🕸️  {title}")
+    print("="*60)
+    grouped = {}
+    for service, resource, *depth in results:
+        grouped.setdefault(service, []).append((resource, depth[0] if depth else None))
+    for service, items in grouped.items():
+        print(f"\n🔹 {service} ({len(items)} recursos):")
+        for resource, depth in items:
+            location = '/'.join(filter(None, (resource.get('account'), resource.get('region'))))
+            level = f" (nível {depth})" if depth is not None else ""
+            print(f"  • {resource['id']}{level} {location}")
+    print(f"\n📈 Total: {sum(len(items) for items in grouped.values())} recursos")
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+from datetime import datetime
+
+def _fmt(date):
+    return date.strftime('%Y-%m-%d %H:%M') if date else ''
+
+class Resource:
+    """One inventoried resource with typed fields
+
+    The human-readable `extra` text is rendered from the fields on demand (see RENDERERS)
+    instead of being stored, and service-specific attributes are kept as a flat
+    (key, value, key, value...) tuple rather than a per-resource dict. Item access (`resource['id']`, `resource['extra']`, `.get()`,
+    `{**resource}`) keeps working as with the former plain dicts.
+    """
+
+    __slots__ = ('service', 'id', 'status', 'region', 'name', 'type', 'size', 'created', 'attachment', 'tags', 'account',
+                 'attrs')
+
+    # Keys of the dict view (id, rendered text, status, region), as in the JSON/CSV exports
+    KEYS = ('id', 'extra', 'status', 'region')
+    # Optional typed fields, None when unknown
+    FIELDS = ('name', 'type', 'size', 'created', 'attachment', 'tags', 'account')
+
+    def __init__(self, service, resource_id, status='', region=None, name=None, type=None, size=None,
+                 created=None, attachment=None, tags=None, account=None, **attrs):
+        self.service = service
+        self.id = resource_id
+        self.status = status
+        self.region = region
+        self.name = name
+        self.type = type
+        self.size = size
+        self.created = created
+        self.attachment = attachment
+        self.tags = tags
+        self.account = account
+        self.attrs = tuple(part for key, value in attrs.items() if value is not None for part in (key, value)) or None
+
+    def update(self, **fields):
+        """Set typed fields and/or service-specific attributes"""
+        attrs = self.attr_dict()
+        for key, value in fields.items():
+            if key in self.__slots__:
+                setattr(self, key, value)
+            else:
+                attrs[key] = value
+        self.attrs = tuple(part for key, value in attrs.items() if value is not None for part in (key, value)) or None
+
+    def attr(self, key, default=None):
+        """A service-specific attribute (e.g. engine, scheme, message count)"""
+        attrs = self.attrs
+        if attrs:
+            for index in range(0, len(attrs), 2):
+                if attrs[index] == key:
+                    return attrs[index + 1]
+        return default
+
+    def attr_dict(self):
+        attrs = self.attrs or ()
+        return dict(zip(attrs[::2], attrs[1::2]))
+
+    @property
+    def extra(self):
+        renderer = RENDERERS.get(self.service)
+        return renderer(self) if renderer else self.attr('extra', '')
+
+    # ========== DICT COMPATIBILITY ==========
+
+    def __getitem__(self, key):
+        if key == 'extra':
+            return self.extra
+        if key in self.__slots__:
+            return getattr(self, key)
+        value = self.attr(key, KeyError)
+        if value is KeyError:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def keys(self):
+        return self.KEYS
+
+    def __eq__(self, other):
+        if not isinstance(other, Resource):
+            return NotImplemented
+        return self.service == other.service and self.to_record() == other.to_record()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Resource({self.service!r}, {self.id!r}, status={self.status!r}, region={self.region!r})"
+
+    # ========== SERIALIZATION ==========
+
+    def to_record(self):
+        """Plain JSON-able fields (created as ISO text), enough to rebuild the resource"""
+        record = {'id': self.id, 'status': self.status, 'region': self.region}
+        for field in self.FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                record[field] = value.isoformat() if isinstance(value, datetime) else value
+        if self.attrs:
+            record['attrs'] = self.attr_dict()
+        return record
+
+    @classmethod
+    def from_record(cls, service, record):
+        fields = {field: record[field] for field in cls.FIELDS if field in record}
+        if fields.get('created'):
+            fields['created'] = datetime.fromisoformat(fields['created'])
+        return cls(service, record['id'], record.get('status', ''), record.get('region'),
+                   **fields, **record.get('attrs', {}))
+
+    def to_dict(self):
+        """Export view: the display keys plus every known field and attribute"""
+        data = {key: self[key] for key in self.KEYS}
+        for field in self.FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value.isoformat() if isinstance(value, datetime) else value
+        data.update((key, value) for key, value in self.attr_dict().items() if key not in data)
+        return data
+
+def as_dict(resource):
+    """Export view of a Resource, or the dict itself for resources loaded from older exports"""
+    return resource.to_dict() if isinstance(resource, Resource) else dict(resource)
+
+def json_default(value):
+    """json.dump default for exports containing resources and datetimes"""
+    if isinstance(value, Resource):
+        return value.to_dict()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+# ========== DISPLAY TEXT PER SERVICE ==========
+
+def _render_s3_bucket(r):
+    location = r.attr('location')
+    return f"Criado: {_fmt(r.created)} | Região: {location}" if location else f"Criado: {_fmt(r.created)}"
+
+def _render_sqs_queue(r):
+    if r.attr('messages') is None:
+        return ''
+    if r.created:
+        return f"Mensagens: {r.attr('messages')} | Criado: {_fmt(r.created)}"
+    return f"Mensagens: {r.attr('messages')}"
+
+def _render_load_balancer(r):
+    if r.type == 'Classic':
+        return (f"Tipo: Classic | Esquema: {r.attr('scheme')} | Instâncias: {r.attr('instances')} | "
+                f"Criado: {_fmt(r.created)}")
+    return f"Tipo: {r.type} | Esquema: {r.attr('scheme')} | Criado: {_fmt(r.created)}"
+
+def _render_ecr_repository(r):
+    if r.attr('images') is None:
+        return f"URI: {r.attr('uri')} | Criado: {_fmt(r.created)}"
+    return f"URI: {r.attr('uri')} | Imagens: {r.attr('images')} | Criado: {_fmt(r.created)}"
+
+def _render_secret(r):
+    last_accessed = r.attr('last_accessed')
+    if last_accessed:
+        return f"Criado: {_fmt(r.created)} | Último acesso: {_fmt(datetime.fromisoformat(last_accessed))}"
+    return f"Criado: {_fmt(r.created)} | Nunca acessado"
+
+RENDERERS = {
+    'EC2 Instances': lambda r: f"{r.type} | {r.name if r.name is not None else 'Sem nome'} | {_fmt(r.created)}",
+    'S3 Buckets': _render_s3_bucket,
+    'Lambda Functions': lambda r: f"{r.type} | {r.size}MB | Modificado: {r.attr('modified')}",
+    'RDS Instances': lambda r: f"{r.attr('engine')} | {r.type}",
+    'DynamoDB Tables': lambda r: f"Items: {r.attr('items')}" if r.attr('items') is not None else '',
+    'API Gateway': lambda r: f"{r.type} API | Criado: {_fmt(r.created)}",
+    'VPCs': lambda r: f"CIDR: {r.attr('cidr')} | {'Padrão' if r.attr('default') else 'Customizada'}",
+    'Security Groups': lambda r: f"{r.name} | VPC: {r.attr('vpc')}",
+    'Key Pairs': lambda r: f"Tipo: {r.type} | Criado: {_fmt(r.created)}",
+    'EBS Volumes': lambda r: f"{r.size}GB | {r.type} | Anexado a: {r.attachment or 'Não anexado'}",
+    'IAM Users': lambda r: f"Criado: {_fmt(r.created)}",
+    'IAM Roles': lambda r: f"Criado: {_fmt(r.created)}",
+    'CloudFormation Stacks': lambda r: f"Status: {r.status} | Criado: {_fmt(r.created)} | {r.attr('description')}",
+    'SNS Topics': lambda r: (f"Confirmadas: {r.attr('confirmed')} | Pendentes: {r.attr('pending')}"
+                             if r.attr('confirmed') is not None else ''),
+    'SQS Queues': _render_sqs_queue,
+    'CloudWatch Alarms': lambda r: f"Estado: {r.status} | Métrica: {r.attr('metric')} | Namespace: {r.attr('namespace')}",
+    'Route53 Hosted Zones': lambda r: f"Tipo: {r.type} | Records: {r.attr('records')} | ID: {r.attr('zone_id')}",
+    'Load Balancers': _render_load_balancer,
+    'Auto Scaling Groups': lambda r: (f"Min: {r.attr('min')} | Max: {r.attr('max')} | Desejado: {r.attr('desired')} | "
+                                      f"Atual: {r.attr('instances')} | Criado: {_fmt(r.created)}"),
+    'Elastic IPs': lambda r: (f"Domínio: {r.attr('domain')} | "
+                              f"Instância: {r.attachment or ('Outro recurso' if r.attr('association_id') else 'Não associado')} | "
+                              f"Allocation ID: {r.attr('allocation_id')}"),
+    'NAT Gateways': lambda r: (f"VPC: {r.attr('vpc')} | Subnet: {r.attr('subnet')} | IP Público: {r.attr('public_ip')} | "
+                               f"Criado: {_fmt(r.created)}"),
+    'Internet Gateways': lambda r: f"Anexado à VPC: {r.attachment}" if r.attachment else "Não anexado",
+    'ECR Repositories': _render_ecr_repository,
+    'ECS Clusters': lambda r: (f"Serviços: {r.attr('services')} | Tasks rodando: {r.attr('running_tasks')} | "
+                               f"Tasks pendentes: {r.attr('pending_tasks')}" if r.attr('services') is not None else ''),
+    'Secrets Manager': _render_secret,
+}
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+import json
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+from aws_clients import ClientRegistry
+from collectors import COLLECTORS, enabled_services
+from config import DAEMON_CONFIG, SCAN_CONFIG
+from inventory import Inventory, parse_query
+from resource_graph import ResourceGraph
+from resource_model import json_default
+from scan_diff import diff_scans
+from throttling import AdaptiveThrottle
+
+class InventoryDaemon:
+    """Keep the inventory warm in memory and serve it over a local HTTP/JSON API (--daemon)
+
+    Every collector is listed again when its refresh interval (DAEMON_CONFIG) runs out; the
+    collectors due at the same time share one scan. Scans reuse the daemon's client registry
+    and rate limiter, so boto3 sessions, clients and connection pools are built once. A refresh
+    swaps in the services of the collectors it ran, rebuilds the query indexes and the relationship
+    graph, and drops the cached
+    responses; queries never wait for AWS.
+    """
+
+    def __init__(self, make_lister, services=None, max_workers=None, refresh_intervals=None):
+        # make_lister(collector keys, clients, throttle) -> lister scanning those collectors
+        self.make_lister = make_lister
+        self.services = enabled_services(services)
+        self.intervals = {**DAEMON_CONFIG['refresh_intervals'], **(refresh_intervals or {})}
+        self.clients = ClientRegistry(max_pool_connections=(max_workers or SCAN_CONFIG['max_workers'])
+                                                               + SCAN_CONFIG['enrichment_workers'])
+        self.throttle = AdaptiveThrottle()
+
+        self.resources = {}
+        self.previous = {}
+        self.owners = {}  # Collector key -> services it produced
+        self.refreshed = {}  # Collector key -> time of its last listing
+        self.generation = 0
+        self.started = datetime.now()
+        self.inventory = Inventory()
+        self.graph = ResourceGraph()
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._requested = set()
+
+    # ========== REFRESH ==========
+
+    def interval(self, key):
+        return self.intervals.get(key, DAEMON_CONFIG['refresh_interval'])
+
+    def due(self, now=None):
+        """Collectors whose refresh interval ran out (or that were never listed, or were requested)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            requested, self._requested = self._requested, set()
+        return [key for key in self.services
+                if key in requested or key not in self.refreshed or now - self.refreshed[key] >= self.interval(key)]
+
+    def refresh(self, keys):
+        """List the given collectors in one scan and swap their services into the inventory"""
+        with self._refresh_lock:
+            lister = self.make_lister(list(keys), self.clients, self.throttle)
+            lister.scan()
+            listed = time.monotonic()
+            # A collector that failed keeps serving its previous results
+            produced = {key: lister.collector_resources(key) for key in keys if lister.completed(key)}
+
+            # Refreshes are serialized, so the new inventory and its indexes are built outside the query lock
+            resources, owners = dict(self.resources), dict(self.owners)
+            for key, services in produced.items():
+                for service in owners.get(key, ()):
+                    resources.pop(service, None)
+                resources.update(services)
+                owners[key] = list(services)
+            # Keep the collector order of the scanner's output
+            order = [service for key in COLLECTORS for service in owners.get(key, ())]
+            resources = {service: resources[service] for service in order if service in resources}
+            inventory, graph = Inventory(resources), ResourceGraph(resources)
+
+            with self._lock:
+                for key in keys:
+                    self.refreshed[key] = listed
+                self.previous, self.resources, self.owners = self.resources, resources, owners
+                self.inventory, self.graph = inventory, graph
+                self.generation += 1
+                self._cache.clear()
+
+    def request_refresh(self, keys=None):
+        """Refresh collectors (all by default) on the next tick of the scheduler"""
+        with self._lock:
+            self._requested.update(keys or self.services)
+        self._wake.set()
+
+    def run_scheduler(self):
+        """Refresh due collectors until stop() is called"""
+        while not self._stop.is_set():
+            keys = self.due()
+            if keys:
+                started = time.perf_counter()
+                try:
+                    self.refresh(keys)
+                    print(f"🔄 {len(keys)} serviços atualizados em {time.perf_counter() - started:.1f}s "
+                          f"(geração {self.generation})")
+                except Exception as e:
+                    print(f"❌ Erro ao atualizar {', '.join(keys)}: {e}")
+                    # Try again on the next interval instead of on every tick
+                    with self._lock:
+                        now = time.monotonic()
+                        for key in keys:
+                            self.refreshed.setdefault(key, now)
+            self._wake.wait(DAEMON_CONFIG['tick'])
+            self._wake.clear()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    # ========== QUERIES ==========
+
+    def snapshot(self):
+        """(generation, resources) read together, so a response never mixes two refreshes"""
+        with self._lock:
+            return self.generation, self.resources
+
+    def find(self, resource_id):
+        with self._lock:
+            inventory = self.inventory
+        return inventory.get(resource_id)
+
+    def query(self, conditions):
+        """(service, resource) pairs matching every condition (see inventory.parse_query)"""
+        with self._lock:
+            inventory = self.inventory
+        return inventory.select(conditions)
+
+    def current_graph(self):
+        with self._lock:
+            return self.graph
+
+    def summary(self):
+        generation, resources = self.snapshot()
+        regions, statuses = Counter(), Counter()
+        for items in resources.values():
+            for resource in items:
+                regions[resource.region or 'global'] += 1
+                statuses[(resource.status or 'unknown').lower()] += 1
+        return {
+            'generation': generation,
+            'total': sum(len(items) for items in resources.values()),
+            'services': {service: len(items) for service, items in resources.items()},
+            'regions': dict(regions),
+            'statuses': dict(statuses),
+        }
+
+    def health(self):
+        now = time.monotonic()
+        with self._lock:
+            refreshed = dict(self.refreshed)
+        return {
+            'status': 'ok' if refreshed else 'warming',
+            'generation': self.generation,
+            'started': self.started.isoformat(),
+            'collectors': {key: {'age': round(now - refreshed[key], 1) if key in refreshed else None,
+                                 'interval': self.interval(key)}
+                           for key in self.services},
+        }
+
+    def diff(self):
+        """Changes made by the last refresh"""
+        with self._lock:
+            current, previous = self.resources, self.previous
+        return diff_scans(current, previous)
+
+    def analysis(self):
+        from utils import AWSResourceAnalyzer
+
+        _, resources = self.snapshot()
+        analyzer = AWSResourceAnalyzer(resources)
+        return {
+            'cost_resources': {service: len(items) for service, items in analyzer.analyze_costs_potential().items()},
+            'unused': analyzer.find_unused_resources(),
+        }
+
+    def cached(self, key, build):
+        """Encoded response for a request, built once per generation"""
+        with self._lock:
+            body = self._cache.get(key)
+            if body is not None:
+                self._cache.move_to_end(key)
+                return body
+            generation = self.generation
+        body = json.dumps(build(), ensure_ascii=False, default=json_default).encode('utf-8')
+        with self._lock:
+            if generation == self.generation:
+                self._cache[key] = body
+                if len(self._cache) > DAEMON_CONFIG['cache_entries']:
+                    self._cache.popitem(last=False)
+        return body
+
+    # ========== HTTP ==========
+
+    def serve(self, host=None, port=None):
+        """Run the scheduler in the background and answer HTTP requests until interrupted"""
+        host = host or DAEMON_CONFIG['host']
+        port = port or DAEMON_CONFIG['port']
+        server = ThreadingHTTPServer((host, port), _handler(self))
+        server.daemon_threads = True
+        scheduler = threading.Thread(target=self.run_scheduler, name='daemon-scheduler', daemon=True)
+        scheduler.start()
+        print(f"🛰️  API em http://{host}:{server.server_address[1]} ({len(self.services)} serviços)")
+        try:
+            server.serve_forever()
+        finally:
+            self.stop()
+            server.server_close()
+
+def _records(pairs, limit=None):
+    records = []
+    for service, resource in pairs:
+        records.append({'service': service, **resource.to_dict()})
+        if limit is not None and len(records) >= limit:
+            break
+    return records
+
+def _handler(daemon):
+    class InventoryRequestHandler(BaseHTTPRequestHandler):
+        """GET /health, /summary, /services, /resources, /resources/<id>, /diff, /analysis, /graph/...; POST /refresh"""
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            params = parse_qs(url.query)
+            path = url.path.rstrip('/') or '/'
+            try:
+                if path == '/health':
+                    return self._send(200, json.dumps(daemon.health()).encode('utf-8'))
+                if path == '/summary':
+                    return self._send(200, daemon.cached(path, daemon.summary))
+                if path == '/services':
+                    return self._send(200, daemon.cached(path, lambda: {
+                        key: {'name': COLLECTORS[key].name, 'services': daemon.owners.get(key, [])}
+                        for key in daemon.services}))
+                if path == '/diff':
+                    return self._send(200, daemon.cached(path, daemon.diff))
+                if path == '/analysis':
+                    return self._send(200, daemon.cached(path, daemon.analysis))
+                if path.startswith('/graph/'):
+                    return self._graph(path)
+                if path.startswith('/resources/'):
+                    matches = daemon.find(unquote(path[len('/resources/'):]))
+                    if not matches:
+                        return self._error(404, 'resource not found')
+                    return self._send(200, json.dumps(_records(matches), default=json_default).encode('utf-8'))
+                if path == '/resources':
+                    return self._send(200, daemon.cached(self.path, lambda: self._resources(params)))
+                return self._error(404, f"unknown endpoint {path}")
+            except ValueError as e:
+                return self._error(400, str(e))
+
+        def do_POST(self):
+            url = urlsplit(self.path)
+            if url.path.rstrip('/') != '/refresh':
+                return self._error(404, f"unknown endpoint {url.path}")
+            keys = parse_qs(url.query).get('service')
+            unknown = [key for key in keys or () if key not in daemon.services]
+            if unknown:
+                return self._error(400, f"unknown service(s): {', '.join(unknown)}")
+            daemon.request_refresh(keys)
+            return self._send(202, json.dumps({'refresh': keys or daemon.services}).encode('utf-8'))
+
+        def _resources(self, params):
+            conditions = [condition for expression in params.get('q', ()) for condition in parse_query(expression)]
+            for field in ('id', 'service', 'region', 'status', 'vpc', 'account'):
+                conditions.extend((field, None, value.split(',')) for value in params.get(field, ()))
+            for expression in params.get('tag', ()):
+                key, _, value = expression.partition('=')
+                conditions.append(('tag', key, value.split(',') if value else []))
+            limit = params.get('limit', [None])[0]
+            return _records(daemon.query(conditions), int(limit) if limit else None)
+
+        def _graph(self, path):
+            """/graph/orphans, /graph/vpc/<id>, /graph/blast-radius/<id>, /graph/neighbors/<id>"""
+            query, _, resource_id = path[len('/graph/'):].partition('/')
+            resource_id = unquote(resource_id)
+            if query == 'orphans':
+                return self._send(200, daemon.cached(path, lambda: {
+                    service: [resource.to_dict() for resource in resources]
+                    for service, resources in daemon.current_graph().orphans().items()}))
+            if query not in ('vpc', 'blast-radius', 'neighbors') or not resource_id:
+                return self._error(404, f"unknown endpoint {path}")
+
+            # The graph is read inside the build, so a response is cached with the generation it was built from
+            def build():
+                graph = daemon.current_graph()
+                if query == 'vpc':
+                    return _records(graph.in_vpc(resource_id))
+                if not graph.find(resource_id):
+                    return None
+                if query == 'blast-radius':
+                    return [{'service': service, **resource.to_dict(), 'depth': depth}
+                            for service, resource, depth in graph.blast_radius(resource_id)]
+                return [dict(zip(('direction', 'relation', 'service', 'id'), link))
+                        for link in graph.neighbors(resource_id)]
+
+            body = daemon.cached(path, build)
+            if body == b'null':
+                return self._error(404, 'resource not found')
+            return self._send(200, body)
+
+        def _error(self, code, message):
+            self._send(code, json.dumps({'error': message}).encode('utf-8'))
+
+        def _send(self, code, body):
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # One line per request would drown the refresh log
+
+    return InventoryRequestHandler
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+import gzip
+import hashlib
+import json
+from config import DIFF_CONFIG
+from resource_model import as_dict, json_default
+
+# Fields that identify a resource rather than describe it
+KEY_FIELDS = ('id', 'region', 'account')
+# The only descriptive fields of exports older than the typed resource fields
+TEXT_FIELDS = ('extra', 'status')
+
+def iter_scan(source):
+    """Yield (service, resource) from a scan: a service -> resources dict or a JSON/NDJSON(.gz) export
+
+    NDJSON exports are streamed line by line; a JSON export has to be parsed as a whole.
+    """
+    if isinstance(source, dict):
+        for service, resources in source.items():
+            for resource in resources:
+                yield service, resource
+        return
+
+    if source.endswith(('.ndjson', '.ndjson.gz', '.jsonl')) or source.endswith('.gz'):
+        opener = gzip.open if source.endswith('.gz') else open
+        with opener(source, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield record.pop('service'), record
+        return
+
+    with open(source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    yield from iter_scan(data.get('resources', {}))
+
+def resource_key(service, resource, region=None):
+    """Compact digest of (service, account, region, id), used to index scans"""
+    region = resource.get('region') or '' if region is None else region
+    return _digest(f"{service}\0{resource.get('account') or ''}\0{region}\0{resource['id']}")
+
+def is_text_only(resource):
+    """True for records with nothing but the id, region, extra text and status"""
+    return not set(as_dict(resource)) - set(TEXT_FIELDS) - set(KEY_FIELDS)
+
+def comparable_fields(resource, ignore_fields=None, text_only=None):
+    """Fields compared between scans
+
+    Resources with structured fields are compared on those, leaving out the `extra` text
+    rendered from them. Records of older exports only have `extra` and `status`, so they (and
+    the resources they are compared with, `text_only=True`) are compared on those two.
+    """
+    data = as_dict(resource)
+    if text_only is None:
+        text_only = is_text_only(data)
+    ignore = set(DIFF_CONFIG['ignore_fields'] if ignore_fields is None else ignore_fields)
+    if text_only:
+        return {field: data.get(field) for field in TEXT_FIELDS if field not in ignore}
+    ignore.update(KEY_FIELDS)
+    ignore.add('extra')
+    return {field: value for field, value in data.items() if field not in ignore}
+
+def content_hash(fields):
+    return _digest(json.dumps(fields, sort_keys=True, ensure_ascii=False, default=json_default))
+
+def _digest(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+def field_deltas(old_fields, new_fields):
+    """{field: {'old': ..., 'new': ...}} for every field that differs"""
+    deltas = {}
+    for field in sorted(set(old_fields) | set(new_fields)):
+        old = json.loads(json.dumps(old_fields.get(field), default=json_default))
+        new = json.loads(json.dumps(new_fields.get(field), default=json_default))
+        if old != new:
+            deltas[field] = {'old': old, 'new': new}
+    return deltas
+
+def diff_scans(current, previous, ignore_fields=None):
+    """Added, removed and modified resources between two scans (dicts or export file paths)
+
+    Resources are matched by (service, account, region, id) and compared through a hash of their
+    fields, computed once per resource. Only digests of the previous scan's keys and contents
+    are indexed; its full records are read again at the end for the resources that were
+    removed or modified, so both scans never have to be in memory together.
+    """
+    changes = {'added': {}, 'removed': {}, 'modified': {}}
+
+    # Pass 1: index the previous scan by key -> content hash
+    previous_index = {}
+    legacy_keys = set()
+    text_only = set()
+    for service, resource in iter_scan(previous):
+        key = resource_key(service, resource)
+        if is_text_only(resource):
+            text_only.add(key)
+        previous_index[key] = content_hash(comparable_fields(resource, ignore_fields, text_only=key in text_only))
+        if not resource.get('region'):
+            # Exports older than region tagging: match on (service, id) alone
+            legacy_keys.add(key)
+
+    # Pass 2: stream the current scan against the index
+    seen = set()
+    modified = {}
+    for service, resource in iter_scan(current):
+        key = resource_key(service, resource)
+        if key not in previous_index and legacy_keys:
+            legacy_key = resource_key(service, resource, region='')
+            key = legacy_key if legacy_key in legacy_keys else key
+        if key not in previous_index:
+            changes['added'].setdefault(service, []).append(resource)
+            continue
+
+        seen.add(key)
+        fields = comparable_fields(resource, ignore_fields, text_only=key in text_only)
+        if content_hash(fields) != previous_index[key]:
+            modified[key] = (resource, fields)
+
+    # Pass 3: fetch the previous records that were removed or changed
+    for service, resource in iter_scan(previous):
+        key = resource_key(service, resource)
+        if key not in seen:
+            changes['removed'].setdefault(service, []).append(resource)
+        elif key in modified:
+            current_resource, current_fields = modified[key]
+            previous_fields = comparable_fields(resource, ignore_fields, text_only=key in text_only)
+            deltas = field_deltas(previous_fields, current_fields)
+            changes['modified'].setdefault(service, []).append({**as_dict(current_resource), 'changes': deltas})
+
+    return changes
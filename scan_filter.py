@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+from config import FILTER_PUSHDOWN
+
+# Conditions a --filter expression can hold
+FILTER_KEYS = ('tag', 'state', 'vpc')
+
+class ScanFilter:
+    """Resource filter of a targeted scan (--filter tag:env=prod state=running vpc=vpc-123)
+
+    Conditions on different keys must all match; the values of one condition are alternatives
+    (state=running,stopped). Each listing sends the conditions its API supports as native
+    Filters (FILTER_PUSHDOWN), so AWS returns only matching resources; the other conditions are
+    checked client-side on the typed fields of the resources it returns (status, tags, vpc). A
+    resource whose listing records no tags or VPC cannot satisfy a tag or VPC condition.
+    """
+
+    def __init__(self, conditions):
+        # [(key, tag key or None, values)]
+        self.conditions = list(conditions)
+
+    @classmethod
+    def parse(cls, expressions):
+        """Build a filter from 'tag:KEY=VALUE', 'tag:KEY', 'state=VALUE' and 'vpc=VALUE' expressions"""
+        conditions = []
+        for expression in expressions:
+            name, has_value, value = expression.partition('=')
+            key, _, tag_key = name.partition(':')
+            values = [v for v in value.split(',') if v]
+            if key not in FILTER_KEYS or (key == 'tag') != bool(tag_key) or (has_value and not values):
+                raise ValueError(f"invalid filter '{expression}' (use tag:KEY=VALUE, tag:KEY, state=VALUE or vpc=VALUE)")
+            if not values and key != 'tag':
+                raise ValueError(f"filter '{expression}' needs a value")
+            conditions.append((key, tag_key or None, values))
+        return cls(conditions)
+
+    def __bool__(self):
+        return bool(self.conditions)
+
+    def __str__(self):
+        return ' '.join(f"{key}:{tag_key}" + (f"={','.join(values)}" if values else '') if tag_key
+                        else f"{key}={','.join(values)}" for key, tag_key, values in self.conditions)
+
+    def pushdown(self, service_name, operation):
+        """(native filters, conditions left to check client-side) of a listing call"""
+        names = FILTER_PUSHDOWN.get(f"{service_name}.{operation}", {})
+        api_filters, residual = [], []
+        for key, tag_key, values in self.conditions:
+            if key not in names:
+                residual.append((key, tag_key, values))
+            elif key == 'tag' and values:
+                api_filters.append({'Name': f"tag:{tag_key}", 'Values': values})
+            elif key == 'tag':
+                api_filters.append({'Name': 'tag-key', 'Values': [tag_key]})
+            else:
+                api_filters.append({'Name': names[key], 'Values': values})
+        return api_filters, residual
+
+    @property
+    def state_conditions(self):
+        """The state conditions, which every resource can be checked on once its details are known"""
+        return [condition for condition in self.conditions if condition[0] == 'state']
+
+    def matches(self, resource, conditions=None):
+        """Client-side check of conditions (all of them by default) on the typed fields of a resource"""
+        for key, tag_key, values in self.conditions if conditions is None else conditions:
+            if key == 'state':
+                if (resource.status or '').lower() not in (value.lower() for value in values):
+                    return False
+            elif key == 'vpc':
+                if resource.attr('vpc') not in values:
+                    return False
+            else:
+                tags = resource.tags or {}
+                if tag_key not in tags or (values and tags[tag_key] not in values):
+                    return False
+        return True
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+import json
+import os
+import secrets
+import threading
+from datetime import datetime
+from config import CHECKPOINT_CONFIG
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    return str(value)
+
+def _decode(obj):
+    if len(obj) == 1 and '__datetime__' in obj:
+        return datetime.fromisoformat(obj['__datetime__'])
+    return obj
+
+class ScanJournal:
+    """Append-only checkpoint journal of one scan, so an interrupted scan can be resumed (--resume)
+
+    Every line is a JSON record: the scan's CLI arguments, each page of a listing in progress
+    (raw items plus the parameters of the next page) and each completed (scope, collector) unit
+    with the resources it produced. Scopes are "<account or profile>/<region or global>".
+    A resumed scan restores the completed units, replays the journaled pages through the item
+    handlers and continues every interrupted listing from its next page.
+    """
+
+    def __init__(self, scan_id, directory=None):
+        self.scan_id = scan_id
+        self.directory = directory or CHECKPOINT_CONFIG['directory']
+        self.path = os.path.join(self.directory, f"{scan_id}.ndjson")
+        self.argv = []
+        self.units = {}
+        self.pages = {}
+        self.stats = {'units_restored': 0, 'pages_replayed': 0}
+        self._file = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, argv, directory=None):
+        """Start the journal of a new scan"""
+        scan_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}-{secrets.token_hex(2)}"
+        journal = cls(scan_id, directory)
+        os.makedirs(journal.directory, exist_ok=True)
+        journal.argv = list(argv)
+        journal._open()
+        journal._write({'type': 'scan', 'argv': journal.argv, 'started': datetime.now().isoformat()})
+        return journal
+
+    @classmethod
+    def resume(cls, scan_id, directory=None):
+        """Load the journal of an interrupted scan and keep appending to it"""
+        journal = cls(scan_id, directory)
+        end = 0
+        with open(journal.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Line cut short by the interruption
+                try:
+                    record = json.loads(line, object_hook=_decode)
+                except json.JSONDecodeError:
+                    break
+                journal._load(record)
+                end += len(line)
+        # Drop the cut-short tail, so new records start on a line of their own
+        with open(journal.path, 'r+b') as f:
+            f.truncate(end)
+        journal._open()
+        return journal
+
+    def _load(self, record):
+        if record['type'] == 'scan':
+            self.argv = record['argv']
+        elif record['type'] == 'unit':
+            self.units[(record['scope'], record['collector'])] = record['services']
+        elif record['type'] == 'page':
+            listing = self.pages.setdefault((record['scope'], record['collector'], record['listing']), [[], {}])
+            listing[0].append(record['items'])
+            listing[1] = record['next']
+
+    def _open(self):
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _write(self, record):
+        line = json.dumps(record, ensure_ascii=False, default=_encode)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    # ========== UNITS ==========
+
+    def completed_unit(self, scope, key):
+        """Services -> resource records of a collector the journaled scan completed, or None"""
+        services = self.units.get((scope, key))
+        if services is not None:
+            with self._lock:
+                self.stats['units_restored'] += 1
+        return services
+
+    def record_unit(self, scope, key, services):
+        self._write({'type': 'unit', 'scope': scope, 'collector': key, 'services': services})
+
+    # ========== PAGES ==========
+
+    def listing_pages(self, scope, key, index):
+        """(journaled pages, parameters of the next page) of a listing; next is None once the listing ended"""
+        pages, next_params = self.pages.get((scope, key, index), ([], {}))
+        with self._lock:
+            self.stats['pages_replayed'] += len(pages)
+        return pages, next_params
+
+    def record_page(self, scope, key, index, items, next_params):
+        self._write({'type': 'page', 'scope': scope, 'collector': key, 'listing': index,
+                     'items': items, 'next': next_params})
+
+    # ========== LIFECYCLE ==========
+
+    def finish(self):
+        """Close a completed scan's journal, deleting it unless CHECKPOINT_CONFIG keeps finished journals"""
+        self.close()
+        if not CHECKPOINT_CONFIG['keep_finished']:
+            os.remove(self.path)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None and not self._file.closed:
+                self._file.close()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from config import OUTPUT_CONFIG
+
+# Profile entry of the collector running in the current thread/task
+_current_entry = ContextVar('profile_entry', default=None)
+
+# Counters kept for every (collector, region)
+COUNTERS = ('calls', 'pages', 'bytes', 'retries', 'throttles', 'errors', 'resources', 'restored')
+
+def _response_size(http_response):
+    """Bytes of an HTTP response body, without forcing a read of unread bodies"""
+    content = getattr(http_response, '_content', None)
+    if isinstance(content, (bytes, bytearray)):
+        return len(content)
+    try:
+        return int(http_response.headers.get('content-length', 0))
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+class ScanProfiler:
+    """Wall time and API counters per collector and region
+
+    Collectors (and the enrichment details they queue) run inside track(), which makes their
+    entry current for the thread or task. Botocore event hooks on the scan's clients time every
+    API call and count the bytes received, the throttle reports attempts, retries and throttling,
+    and the lister counts pages and resources, all into the current entry.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self.entries = {}
+        # Latency of every API call per (collector, region), for histograms (see metrics_export)
+        self.latencies = {}
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._instrumented = set()
+
+    def entry(self, key, region, name=None):
+        with self._lock:
+            if (key, region) not in self.entries:
+                entry = {'collector': key, 'service': name or key, 'region': region,
+                         'started': None, 'finished': None, 'collect_time': 0.0, 'enrich_time': 0.0}
+                entry.update(dict.fromkeys(COUNTERS, 0))
+                entry['operations'] = {}
+                self.entries[(key, region)] = entry
+            return self.entries[(key, region)]
+
+    @contextmanager
+    def track(self, key, region, phase='collect', name=None):
+        """Attribute everything done inside the block to (key, region); phase is 'collect' or 'enrich'"""
+        entry = self.entry(key, region, name)
+        token = _current_entry.set(entry)
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            end = time.perf_counter()
+            _current_entry.reset(token)
+            with self._lock:
+                entry[f'{phase}_time'] += end - start
+                offset = start - self._started
+                entry['started'] = offset if entry['started'] is None else min(entry['started'], offset)
+                entry['finished'] = max(entry['finished'] or 0.0, end - self._started)
+
+    def record(self, name, amount=1):
+        """Add to a counter of the current collector (ignored outside of track())"""
+        entry = _current_entry.get()
+        if entry is not None:
+            with self._lock:
+                entry[name] += amount
+
+    # ========== BOTOCORE HOOKS ==========
+
+    def instrument(self, client):
+        """Register the timing hooks on a client (botocore or aiobotocore), once per client"""
+        with self._lock:
+            if id(client) in self._instrumented:
+                return
+            self._instrumented.add(id(client))
+        client.meta.events.register('before-parameter-build', self._before_call, unique_id='scan-profiler-start')
+        client.meta.events.register('after-call', self._after_call, unique_id='scan-profiler-end')
+
+    def _before_call(self, context=None, **kwargs):
+        if context is not None:
+            context['scan_profiler_start'] = time.perf_counter()
+
+    def _after_call(self, http_response=None, model=None, context=None, **kwargs):
+        entry = _current_entry.get()
+        if entry is None or model is None:
+            return
+
+        started = (context or {}).get('scan_profiler_start')
+        elapsed = time.perf_counter() - started if started is not None else 0.0
+        size = _response_size(http_response)
+        failed = getattr(http_response, 'status_code', 200) >= 300
+        with self._lock:
+            operation = entry['operations'].setdefault(model.name, {'calls': 0, 'time': 0.0, 'bytes': 0, 'errors': 0})
+            operation['calls'] += 1
+            operation['time'] += elapsed
+            operation['bytes'] += size
+            operation['errors'] += failed
+            entry['bytes'] += size
+            entry['errors'] += failed
+            self.latencies.setdefault((entry['collector'], entry['region']), []).append(elapsed)
+
+    # ========== REPORTS ==========
+
+    def rows(self):
+        """Entries, slowest first"""
+        with self._lock:
+            entries = [dict(entry, operations=dict(entry['operations'])) for entry in self.entries.values()]
+        return sorted(entries, key=lambda entry: entry['collect_time'] + entry['enrich_time'], reverse=True)
+
+    def trace(self):
+        """JSON-able trace: scan totals and every collector entry with its per-operation breakdown"""
+        rows = self.rows()
+        totals = {counter: sum(row[counter] for row in rows) for counter in COUNTERS}
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'duration': round(max((row['finished'] or 0.0 for row in rows), default=0.0), 6),
+            'totals': totals,
+            'collectors': [
+                {**row, 'collect_time': round(row['collect_time'], 6), 'enrich_time': round(row['enrich_time'], 6),
+                 'started': round(row['started'] or 0.0, 6), 'finished': round(row['finished'] or 0.0, 6),
+                 'operations': {name: {**stats, 'time': round(stats['time'], 6)}
+                                for name, stats in sorted(row['operations'].items())}}
+                for row in rows
+            ],
+        }
+
+    def write_trace(self, filename):
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.trace(), f, indent=2, ensure_ascii=False)
+        print(f"✅ Trace do scan exportado para: {filename}")
+        return filename
+
+    def print_report(self, limit=None):
+        """Print the per-collector table, slowest collectors first"""
+        limit = limit or OUTPUT_CONFIG['profile_rows']
+        rows = self.rows()
+        total_time = sum(row['collect_time'] + row['enrich_time'] for row in rows) or 1.0
+
+        print("\n" + "="*60)
+        print("⏱️  PERFIL DO SCAN")
+        print("="*60)
+        print(f"{'Coletor':<24} {'Região':<15} {'Tempo(s)':>9} {'Det.(s)':>8} {'%':>5} {'Chamadas':>8} "
+              f"{'Páginas':>7} {'KB':>8} {'Retent.':>7} {'Throttl.':>8} {'Recursos':>8}")
+        for row in rows[:limit]:
+            share = (row['collect_time'] + row['enrich_time']) / total_time * 100
+            name = row['service'] + (' ♻️' if row['restored'] else '')
+            print(f"{name[:24]:<24} {row['region'][:15]:<15} {row['collect_time']:>9.2f} {row['enrich_time']:>8.2f} "
+                  f"{share:>5.1f} {row['calls']:>8} {row['pages']:>7} {row['bytes'] / 1024:>8.1f} "
+                  f"{row['retries']:>7} {row['throttles']:>8} {row['resources']:>8}")
+        if len(rows) > limit:
+            print(f"... e mais {len(rows) - limit} coletores")
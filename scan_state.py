@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import threading
+import time
+from config import INCREMENTAL_CONFIG
+
+STATE_VERSION = 3
+
+def fingerprint(item):
+    """Stable hash of a raw listing item (or page of items)"""
+    data = json.dumps(item, sort_keys=True, default=str)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+class ScanState:
+    """State persisted between incremental scans
+
+    Keeps, per scope (profile/region), the resources each collector produced and when it
+    ran, plus the applied fields of cacheable detail lookups (Detail.cached) together with the
+    fingerprint of the listing item that triggered them. A later scan restores collectors still
+    inside their refresh interval and reuses a detail result while the item is unchanged and
+    the result is fresh.
+    """
+
+    def __init__(self, path=None, detail_ttl=None, refresh_intervals=None):
+        self.path = path or INCREMENTAL_CONFIG['state_file']
+        self.detail_ttl = INCREMENTAL_CONFIG['detail_ttl'] if detail_ttl is None else detail_ttl
+        self.refresh_intervals = refresh_intervals if refresh_intervals is not None else INCREMENTAL_CONFIG['refresh_intervals']
+        self.collectors = {}
+        self.details = {}
+        self.stats = {'collectors_reused': 0, 'details_reused': 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=None, **kwargs):
+        """Read the state file; a missing or unreadable file starts an empty state"""
+        state = cls(path, **kwargs)
+        try:
+            with open(state.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return state
+        except (OSError, json.JSONDecodeError):
+            print(f"⚠️  Estado incremental inválido, fazendo scan completo: {state.path}")
+            return state
+
+        if data.get('version') == STATE_VERSION:
+            state.collectors = data.get('collectors', {})
+            state.details = data.get('details', {})
+        return state
+
+    def save(self):
+        """Write the state, dropping detail results that are already too old to be reused"""
+        now = time.time()
+        with self._lock:
+            details = {key: entry for key, entry in self.details.items() if now - entry['fetched'] < self.detail_ttl}
+            data = {'version': STATE_VERSION, 'collectors': self.collectors, 'details': details}
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, default=str)
+        os.replace(tmp_path, self.path)
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    # ========== COLLECTORS ==========
+
+    def fresh_collector(self, scope, key):
+        """Services -> resources recorded for a collector still inside its refresh interval, or None"""
+        interval = self.refresh_intervals.get(key)
+        entry = self.collectors.get(f"{scope}/{key}")
+        if not interval or entry is None or time.time() - entry['scanned_at'] >= interval:
+            return None
+
+        self._count('collectors_reused')
+        return entry['services']
+
+    def record_collector(self, scope, key, services):
+        """Remember what a collector produced in this scan"""
+        with self._lock:
+            self.collectors[f"{scope}/{key}"] = {'scanned_at': time.time(), 'services': services}
+
+    # ========== DETAILS ==========
+
+    @staticmethod
+    def detail_key(scope, detail):
+        params = json.dumps(detail.params, sort_keys=True, default=str)
+        return f"{scope}/{detail.client}.{detail.operation}/{params}"
+
+    def cached_detail(self, scope, detail, item_fingerprint):
+        """Raw result of a detail lookup when its listing item is unchanged and the result is fresh"""
+        with self._lock:
+            entry = self.details.get(self.detail_key(scope, detail))
+        if (entry is None or entry['fingerprint'] != item_fingerprint
+                or time.time() - entry['fetched'] >= self.detail_ttl):
+            return None
+
+        self._count('details_reused')
+        return entry['result']
+
+    def record_detail(self, scope, detail, item_fingerprint, result):
+        """Store the fields of a detail result listed in detail.cached"""
+        result = json.loads(json.dumps({field: result.get(field) for field in detail.cached}, default=str))
+        entry = {'fingerprint': item_fingerprint, 'fetched': time.time(), 'result': result}
+        with self._lock:
+            self.details[self.detail_key(scope, detail)] = entry
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+import asyncio
+import random
+import threading
+import time
+from botocore.exceptions import ClientError, ConnectionClosedError, EndpointConnectionError, ReadTimeoutError
+from config import THROTTLE_CONFIG
+
+# Error codes AWS services use to signal throttling
+THROTTLE_ERROR_CODES = {
+    'Throttling',
+    'ThrottlingException',
+    'ThrottledException',
+    'RequestThrottledException',
+    'RequestThrottled',
+    'RequestLimitExceeded',
+    'TooManyRequestsException',
+    'ProvisionedThroughputExceededException',
+    'BandwidthLimitExceeded',
+    'EC2ThrottledException',
+    'PriorRequestNotComplete',
+    'SlowDown',
+}
+
+# Server-side errors worth retrying without lowering the rate
+TRANSIENT_ERROR_CODES = {
+    'InternalError',
+    'InternalFailure',
+    'InternalServerError',
+    'ServiceUnavailable',
+    'ServiceUnavailableException',
+    'RequestTimeout',
+    'RequestTimeoutException',
+}
+
+TRANSIENT_EXCEPTIONS = (ConnectionClosedError, EndpointConnectionError, ReadTimeoutError)
+
+def is_throttle_error(error):
+    return isinstance(error, ClientError) and error.response.get('Error', {}).get('Code') in THROTTLE_ERROR_CODES
+
+def is_transient_error(error):
+    if isinstance(error, TRANSIENT_EXCEPTIONS):
+        return True
+    return isinstance(error, ClientError) and error.response.get('Error', {}).get('Code') in TRANSIENT_ERROR_CODES
+
+class TokenBucket:
+    """Token bucket whose refill rate can change while in use
+
+    A bucket without a rate lets every call through and only counts them, so the rate it
+    was running at is known when the first throttling error turns the limit on.
+    """
+
+    def __init__(self, rate=None):
+        self.rate = rate
+        self.tokens = rate or 0.0
+        self.updated = time.monotonic()
+        self._window_start = self.updated
+        self._window_calls = 0
+        self._last_window_rate = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take one token and return how long the caller must wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._last_window_rate = self._window_calls / (now - self._window_start)
+                self._window_start, self._window_calls = now, 0
+            self._window_calls += 1
+            if self.rate is None:
+                return 0.0
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def observed_rate(self):
+        """Calls per second over the last full second (or so far in the current one, if more)"""
+        with self._lock:
+            return max(self._last_window_rate, float(self._window_calls))
+
+    def set_rate(self, rate):
+        with self._lock:
+            if self.rate is None:
+                self.updated = time.monotonic()
+                self.tokens = 0.0
+            self.rate = rate
+            self.tokens = min(self.tokens, rate)
+
+class AdaptiveThrottle:
+    """Per (service, region) rate limiting with throttling-aware retries
+
+    Buckets start unlimited (or at max_rate, when one is configured), so calls run as fast
+    as the scan's concurrency allows while AWS accepts them. The first throttling error
+    limits the bucket to half the rate it was running at; from then on every throttling
+    error halves the rate (multiplicative decrease) and the call is retried with exponential
+    backoff and full jitter, and each success raises the rate again by a fixed step
+    (additive increase). Parallel scans therefore settle at the throughput the account allows.
+    """
+
+    def __init__(self, max_rate=None, min_rate=None, max_attempts=None, base_delay=None, max_delay=None):
+        self.max_rate = max_rate or THROTTLE_CONFIG['max_rate']
+        self.min_rate = min_rate or THROTTLE_CONFIG['min_rate']
+        self.max_attempts = max_attempts or THROTTLE_CONFIG['max_attempts']
+        self.base_delay = base_delay or THROTTLE_CONFIG['base_delay']
+        self.max_delay = max_delay or THROTTLE_CONFIG['max_delay']
+        self.decrease_factor = THROTTLE_CONFIG['decrease_factor']
+        self.increase_step = THROTTLE_CONFIG['increase_step']
+        self.stats = {'calls': 0, 'retries': 0, 'throttles': 0}
+        # Optional callable notified with the name of every counted event (e.g. ScanProfiler.record)
+        self.listener = None
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, key):
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(self.max_rate)
+            return self._buckets[key]
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+        if self.listener is not None:
+            self.listener(name)
+
+    def _on_success(self, bucket):
+        if bucket.rate is None or (self.max_rate is not None and bucket.rate >= self.max_rate):
+            return
+        rate = bucket.rate + self.increase_step
+        bucket.set_rate(rate if self.max_rate is None else min(self.max_rate, rate))
+
+    def _on_error(self, bucket, error, attempt):
+        """Return the backoff delay before retrying, or None when the error must be raised"""
+        throttled = is_throttle_error(error)
+        if throttled:
+            self._count('throttles')
+            rate = bucket.observed_rate() if bucket.rate is None else bucket.rate
+            bucket.set_rate(max(self.min_rate, rate * self.decrease_factor))
+
+        if not (throttled or is_transient_error(error)) or attempt + 1 >= self.max_attempts:
+            return None
+
+        self._count('retries')
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def call(self, key, func):
+        """Run func() under the (service, region) rate limit, retrying throttled calls"""
+        bucket = self.bucket(key)
+        attempt = 0
+        while True:
+            wait = bucket.reserve()
+            if wait:
+                time.sleep(wait)
+
+            self._count('calls')
+            try:
+                result = func()
+            except Exception as e:
+                delay = self._on_error(bucket, e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            self._on_success(bucket)
+            return result
+
+    async def call_async(self, key, func):
+        """Async variant of call(); func() returns the awaitable to run"""
+        bucket = self.bucket(key)
+        attempt = 0
+        while True:
+            wait = bucket.reserve()
+            if wait:
+                await asyncio.sleep(wait)
+
+            self._count('calls')
+            try:
+                result = await func()
+            except Exception as e:
+                delay = self._on_error(bucket, e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            self._on_success(bucket)
+            return result
@@ -1,8 +1,53 @@
 #!/usr/bin/env python3
 import json
 import csv
+import gzip
+import io
+import threading
 from datetime import datetime
 import os
+from resource_model import Resource, as_dict, json_default
+
+class NDJSONSink:
+    """Resource sink writing one JSON object per line as resources are discovered
+
+    Lines are flushed as they are written (every `flush_every` lines when gzip-compressed,
+    each flush ending a complete deflate block) so the file can be tailed during the scan
+    and holds everything written so far if the scan dies. The sink itself keeps nothing in
+    memory, but the lister still holds every resource for the summary and the other exports.
+    Resources with detail lookups (S3, SQS, SNS, DynamoDB, ECR, ECS) are written when their
+    details arrive, which happens while the other collectors are still listing.
+    """
+
+    def __init__(self, filename, compress=None, flush_every=100):
+        self.filename = filename
+        self.compress = filename.endswith('.gz') if compress is None else compress
+        self.flush_every = 1 if not self.compress else flush_every
+        self.count = 0
+        self._lock = threading.Lock()
+        if self.compress:
+            self._file = gzip.open(filename, 'wt', encoding='utf-8')
+        else:
+            self._file = open(filename, 'w', encoding='utf-8')
+
+    def write(self, service, resource):
+        line = json.dumps({'service': service, **as_dict(resource)}, ensure_ascii=False, default=json_default)
+        with self._lock:
+            self._file.write(line + '\n')
+            self.count += 1
+            if self.count % self.flush_every == 0:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
 class AWSResourceExporter:
     def __init__(self, resources_data):
@@ -22,11 +67,39 @@ class AWSResourceExporter:
         }
         
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False, default=str)
+            json.dump(export_data, f, indent=2, ensure_ascii=False, default=json_default)
         
         print(f"✅ Dados exportados para: {filename}")
         return filename
     
+    def export_to_ndjson(self, filename=None, compress=None):
+        """Export resources as NDJSON (one resource per line, gzip-compressed for .gz names)"""
+        if not filename:
+            filename = f"aws_resources_{self.timestamp}.ndjson"
+        
+        with NDJSONSink(filename, compress=compress) as sink:
+            for service, resources in self.resources_data.items():
+                for resource in resources:
+                    sink.write(service, resource)
+        
+        print(f"✅ Dados exportados para: {filename}")
+        return filename
+    
+    def export_to_columnar(self, directory=None, file_format='parquet'):
+        """Export resources to one typed Parquet/Arrow file per service (requires pyarrow)"""
+        from columnar_export import ColumnarSink
+        
+        if not directory:
+            directory = f"aws_resources_{self.timestamp}_{file_format}"
+        
+        with ColumnarSink(directory, file_format=file_format) as sink:
+            for service, resources in self.resources_data.items():
+                for resource in resources:
+                    sink.write(service, resource)
+        
+        print(f"✅ Dados exportados para: {directory}/")
+        return directory
+    
     def export_to_csv(self, filename=None):
         """Export resources to CSV format"""
         if not filename:
@@ -52,100 +125,25 @@ class AWSResourceExporter:
         return filename
     
     def export_to_html(self, filename=None):
-        """Export resources to HTML format"""
+        """Export resources to HTML format, streaming the report to the file"""
+        from html_report import HTMLReportWriter
+        
         if not filename:
             filename = f"aws_resources_{self.timestamp}.html"
         
-        html_content = self._generate_html_report()
-        
         with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            HTMLReportWriter(self.resources_data).write(f)
         
         print(f"✅ Relatório HTML gerado: {filename}")
         return filename
     
     def _generate_html_report(self):
         """Generate HTML report content"""
-        total_resources = sum(len(resources) for resources in self.resources_data.values())
-        
-        html = f"""
-<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AWS Resources Report - {datetime.now().strftime('%Y-%m-%d %H:%M')}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
-        .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-        h1 {{ color: #232f3e; text-align: center; }}
-        h2 {{ color: #ff9900; border-bottom: 2px solid #ff9900; padding-bottom: 5px; }}
-        .summary {{ background: #e8f4fd; padding: 15px; border-radius: 5px; margin-bottom: 20px; }}
-        .resource-group {{ margin-bottom: 30px; }}
-        .resource-item {{ background: #f9f9f9; margin: 5px 0; padding: 10px; border-left: 4px solid #ff9900; }}
-        .status-active {{ border-left-color: #28a745; }}
-        .status-terminated {{ border-left-color: #dc3545; }}
-        .status-stopped {{ border-left-color: #ffc107; }}
-        .resource-id {{ font-weight: bold; color: #232f3e; }}
-        .resource-details {{ color: #666; font-size: 0.9em; margin-top: 5px; }}
-        .timestamp {{ text-align: center; color: #666; margin-top: 20px; }}
-        table {{ width: 100%; border-collapse: collapse; margin-top: 10px; }}
-        th, td {{ padding: 8px; text-align: left; border-bottom: 1px solid #ddd; }}
-        th {{ background-color: #f2f2f2; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>🔍 AWS Resources Report</h1>
+        from html_report import HTMLReportWriter
         
-        <div class="summary">
-            <h2>📊 Resumo Executivo</h2>
-            <p><strong>Total de recursos encontrados:</strong> {total_resources}</p>
-            <ul>
-"""
-        
-        # Add summary items
-        for service, resources in self.resources_data.items():
-            if resources:
-                html += f"                <li><strong>{service}:</strong> {len(resources)} recursos</li>\n"
-        
-        html += """
-            </ul>
-        </div>
-        
-        <h2>📋 Detalhamento por Serviço</h2>
-"""
-        
-        # Add detailed resources
-        for service, resources in self.resources_data.items():
-            if resources:
-                html += f"""
-        <div class="resource-group">
-            <h3>🔹 {service} ({len(resources)} recursos)</h3>
-"""
-                
-                for resource in resources:
-                    status_class = f"status-{resource['status'].lower()}" if resource['status'] else ""
-                    html += f"""
-            <div class="resource-item {status_class}">
-                <div class="resource-id">{resource['id']}</div>
-                <div class="resource-details">{resource['extra']}</div>
-                {f'<div class="resource-details"><strong>Status:</strong> {resource["status"]}</div>' if resource['status'] and resource['status'] != 'active' else ''}
-            </div>
-"""
-                
-                html += "        </div>\n"
-        
-        html += f"""
-        <div class="timestamp">
-            <p>Relatório gerado em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-        
-        return html
+        buffer = io.StringIO()
+        HTMLReportWriter(self.resources_data).write(buffer)
+        return buffer.getvalue()
 
 class AWSResourceAnalyzer:
     def __init__(self, resources_data):
@@ -170,6 +168,8 @@ class AWSResourceAnalyzer:
     
     def find_unused_resources(self):
         """Identify potentially unused resources"""
+        from scan_diff import is_text_only
+
         unused = {
             'unattached_volumes': [],
             'unassociated_eips': [],
@@ -180,7 +180,12 @@ class AWSResourceAnalyzer:
         # Find unattached EBS volumes
         if 'EBS Volumes' in self.resources_data:
             for volume in self.resources_data['EBS Volumes']:
-                if 'Não anexado' in volume['extra']:
+                if not isinstance(volume, Resource) and is_text_only(volume):
+                    # Exports older than the typed fields only have the rendered text
+                    unattached = 'Não anexado' in volume.get('extra', '')
+                else:
+                    unattached = volume.get('attachment') is None
+                if unattached:
                     unused['unattached_volumes'].append(volume)
         
         # Find unassociated Elastic IPs
@@ -252,42 +257,10 @@ def load_previous_scan(filename):
         return {}
 
 def compare_scans(current_resources, previous_resources):
-    """Compare current scan with previous scan"""
-    changes = {
-        'added': {},
-        'removed': {},
-        'modified': {}
-    }
+    """Compare current scan with previous scan (a resources dict or a JSON/NDJSON export path)"""
+    from scan_diff import diff_scans
     
-    # Find added and modified resources
-    for service, current_items in current_resources.items():
-        if service not in previous_resources:
-            changes['added'][service] = current_items
-        else:
-            previous_items = previous_resources[service]
-            current_ids = {item['id'] for item in current_items}
-            previous_ids = {item['id'] for item in previous_items}
-            
-            # Added resources in this service
-            added_ids = current_ids - previous_ids
-            if added_ids:
-                changes['added'][service] = [item for item in current_items if item['id'] in added_ids]
-    
-    # Find removed resources
-    for service, previous_items in previous_resources.items():
-        if service in current_resources:
-            current_items = current_resources[service]
-            current_ids = {item['id'] for item in current_items}
-            previous_ids = {item['id'] for item in previous_items}
-            
-            # Removed resources in this service
-            removed_ids = previous_ids - current_ids
-            if removed_ids:
-                changes['removed'][service] = [item for item in previous_items if item['id'] in removed_ids]
-        else:
-            changes['removed'][service] = previous_items
-    
-    return changes
+    return diff_scans(current_resources, previous_resources)
 
 def print_changes_report(changes):
     """Print changes between scans"""
@@ -297,6 +270,7 @@ def print_changes_report(changes):
     
     total_added = sum(len(items) for items in changes['added'].values())
     total_removed = sum(len(items) for items in changes['removed'].values())
+    total_modified = sum(len(items) for items in changes['modified'].values())
     
     print(f"\n✅ Recursos adicionados: {total_added}")
     for service, items in changes['added'].items():
@@ -316,5 +290,16 @@ def print_changes_report(changes):
             if len(items) > 3:
                 print(f"    ... e mais {len(items) - 3} recursos")
     
-    if total_added == 0 and total_removed == 0:
+    print(f"\n✏️  Recursos modificados: {total_modified}")
+    for service, items in changes['modified'].items():
+        if items:
+            print(f"  • {service}: {len(items)} recursos")
+            for item in items[:3]:  # Show first 3
+                print(f"    - {item['id']}")
+                for field, delta in item.get('changes', {}).items():
+                    print(f"        {field}: {delta['old']} → {delta['new']}")
+            if len(items) > 3:
+                print(f"    ... e mais {len(items) - 3} recursos")
+    
+    if total_added == 0 and total_removed == 0 and total_modified == 0:
         print("\n🔄 Nenhuma mudança detectada desde o último scan.")